@@ -0,0 +1,86 @@
+# benchmarks/parse_benchmark.py
+"""
+HTML解析后端基准测试
+对比完整文档树（html.parser）与只解析目标子树（strainer / lxml）的耗时，
+并校验各后端提取出的字段完全一致
+
+运行：python benchmarks/parse_benchmark.py [--rows 20] [--repeat 20]
+"""
+import argparse
+import os
+import sys
+import time
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from crawlers.parsing import make_soup, BACKENDS
+from crawlers.yangguang import _parse_school_rows
+
+def _page_noise(blocks=200):
+    """模拟页面中与数据无关的导航、脚本、页脚等内容"""
+    nav = "".join(f'<li><a href="/nav/{i}">导航{i}</a></li>' for i in range(blocks))
+    news = "".join(f'<div class="news"><h3>资讯标题{i}</h3><p>{"正文内容" * 20}</p></div>' for i in range(blocks))
+    script = "<script>var config = {" + ",".join(f"k{i}: {i}" for i in range(blocks)) + "};</script>"
+    return f"<ul class=\"nav\">{nav}</ul>{script}", f"{news}<footer>{'版权信息' * 50}</footer>"
+
+def build_scores_page(rows):
+    header, footer = _page_noise()
+    items = "".join(
+        f'<div class="score-item"><span class="school-name">院校{i}</span>'
+        f'<span class="major-name">专业{i}</span><span class="min-score">{600 + i % 100}</span>'
+        f'<span class="min-rank">{1000 + i}</span><span class="plan-count">{i % 30}</span></div>'
+        for i in range(rows)
+    )
+    return f"<html><head><title>分数线</title></head><body>{header}<div class=\"list\">{items}</div>{footer}</body></html>"
+
+def build_schools_page(rows):
+    header, footer = _page_noise()
+    trs = "".join(
+        f'<tr><td><a href="/sch/schoolInfo--schId-{i}.dhtml">院校{i}</a></td><td>北京</td>'
+        f'<td>教育部</td><td>综合</td><td>本科</td><td>4.{i % 10}</td><td></td></tr>'
+        for i in range(rows)
+    )
+    return (f"<html><body>{header}<table class=\"ch-table\"><tr><th>院校名称</th></tr>{trs}</table>"
+            f"{footer}</body></html>")
+
+def extract_scores(soup):
+    return [
+        tuple(item.select_one(selector).text.strip()
+              for selector in (".school-name", ".major-name", ".min-score", ".min-rank", ".plan-count"))
+        for item in soup.select(".score-item")
+    ]
+
+def run(page_type, html, extract, repeat):
+    results = {}
+    baseline = None
+    for backend in BACKENDS:
+        started = time.perf_counter()
+        for _ in range(repeat):
+            soup = make_soup(html, page_type, backend)
+        parse_time = (time.perf_counter() - started) / repeat
+
+        started = time.perf_counter()
+        extracted = extract(soup)
+        extract_time = time.perf_counter() - started
+
+        if baseline is None:
+            baseline = extracted
+        assert extracted == baseline, f"{backend} 提取结果与 html.parser 不一致"
+        results[backend] = (parse_time, extract_time)
+
+    base = results["html.parser"][0]
+    print(f"\n[{page_type}] 页面大小 {len(html) / 1024:.0f} KB，{len(baseline)} 行")
+    for backend, (parse_time, extract_time) in results.items():
+        print(f"  {backend:<12} 解析 {parse_time * 1000:8.2f} ms/页 (加速 {base / parse_time:5.2f}x)"
+              f"   提取 {extract_time * 1000:8.2f} ms")
+
+def main():
+    parser = argparse.ArgumentParser(description="HTML解析后端基准测试")
+    parser.add_argument("--rows", type=int, default=20, help="每页数据行数（阳光高考每页20条）")
+    parser.add_argument("--repeat", type=int, default=20, help="每个后端重复解析次数")
+    args = parser.parse_args()
+
+    run("scores", build_scores_page(args.rows), extract_scores, args.repeat)
+    run("schools", build_schools_page(args.rows), _parse_school_rows, args.repeat)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+# crawlers/archive.py
+import gzip
+import os
+import re
+import threading
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from http.client import responses as HTTP_REASONS
+from crawlers.http_cache import HttpCache
+from utils.io_tools import read_jsonl, append_jsonl
+from utils.log import log_info, log_error
+from config import ARCHIVE_DIR, ARCHIVE_SEGMENT_MAX_BYTES, REPARSE_WORKERS
+
+# 每个解析作业处理的记录数（同一段文件内连续的记录）
+REPARSE_BATCH_SIZE = 200
+
+class ResponseArchive:
+    """
+    WARC格式的原始响应归档
+    - 每次运行写入新的段文件 {时间戳}-{序号}.warc.gz，超过 ARCHIVE_SEGMENT_MAX_BYTES 时切换到下一段
+    - 每条记录单独压缩为一个gzip成员，可按偏移量直接定位读取（与常见WARC工具兼容）
+    - index.jsonl 逐行记录 URL、段文件、偏移量与长度
+    只追加写入，不修改已有内容
+    """
+
+    def __init__(self, directory=None, max_segment_bytes=None):
+        self.directory = directory or ARCHIVE_DIR
+        self.max_segment_bytes = max_segment_bytes or ARCHIVE_SEGMENT_MAX_BYTES
+        self.index_path = os.path.join(self.directory, "index.jsonl")
+        self._run_id = datetime.now().strftime("%Y%m%d-%H%M%S")
+        self._segment_no = 0
+        self._lock = threading.Lock()
+
+    def _segment_name(self):
+        return f"{self._run_id}-{self._segment_no:05d}.warc.gz"
+
+    @staticmethod
+    def _build_record(url, resp, body, date):
+        reason = resp.reason or HTTP_REASONS.get(resp.status_code, "")
+        http_headers = "".join(f"{name}: {value}\r\n" for name, value in resp.headers.items()
+                               if name.lower() not in ("content-encoding", "transfer-encoding", "content-length"))
+        block = (f"HTTP/1.1 {resp.status_code} {reason}\r\n{http_headers}"
+                 f"Content-Length: {len(body)}\r\n\r\n").encode("utf-8") + body
+        warc_headers = (
+            "WARC/1.1\r\n"
+            "WARC-Type: response\r\n"
+            f"WARC-Record-ID: <urn:uuid:{uuid.uuid4()}>\r\n"
+            f"WARC-Date: {date}\r\n"
+            f"WARC-Target-URI: {url}\r\n"
+            "Content-Type: application/http; msgtype=response\r\n"
+            f"Content-Length: {len(block)}\r\n\r\n"
+        ).encode("utf-8")
+        return gzip.compress(warc_headers + block + b"\r\n\r\n")
+
+    def record(self, resp):
+        """归档一个响应（仅文本类200响应，与HTTP缓存的可缓存条件一致）"""
+        if not HttpCache.is_cacheable(resp):
+            return
+        body = resp.content
+        date = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+        data = self._build_record(resp.url, resp, body, date)
+        with self._lock:
+            os.makedirs(self.directory, exist_ok=True)
+            path = os.path.join(self.directory, self._segment_name())
+            if os.path.exists(path) and os.path.getsize(path) + len(data) > self.max_segment_bytes:
+                self._segment_no += 1
+                path = os.path.join(self.directory, self._segment_name())
+            with open(path, 'ab') as f:
+                offset = f.tell()
+                f.write(data)
+            append_jsonl(self.index_path, {
+                "url": resp.url,
+                "segment": os.path.basename(path),
+                "offset": offset,
+                "length": len(data),
+                "date": date,
+                "encoding": resp.encoding,
+                "from_cache": bool(getattr(resp, "from_cache", False)),
+            })
+
+def read_archived(directory, entry):
+    """按索引条目读取归档记录，返回 (URL, 正文文本)"""
+    with open(os.path.join(directory, entry["segment"]), 'rb') as f:
+        f.seek(entry["offset"])
+        data = gzip.decompress(f.read(entry["length"]))
+    _, _, rest = data.partition(b"\r\n\r\n")  # WARC头
+    http_head, _, body = rest.partition(b"\r\n\r\n")  # HTTP头
+    if body.endswith(b"\r\n\r\n"):
+        body = body[:-4]
+    # 优先使用抓取时解码正文所用的编码，保证解析结果与当时一致
+    charset = re.search(rb"charset=([\w-]+)", http_head, re.IGNORECASE)
+    encoding = entry.get("encoding") or (charset.group(1).decode() if charset else "utf-8")
+    return entry["url"], body.decode(encoding, errors="replace")
+
+def _reparse_batch(directory, entries, parsers):
+    """子进程中解析一批归档记录，返回 [(序号, 页面类型, 记录列表)]"""
+    compiled = [(re.compile(pattern), page_type, parse) for pattern, page_type, parse in parsers]
+    results = []
+    for position, entry in entries:
+        for pattern, page_type, parse in compiled:
+            if not pattern.search(entry["url"]):
+                continue
+            try:
+                url, html = read_archived(directory, entry)
+                results.append((position, page_type, parse(url, html)))
+            except Exception as e:
+                log_error(f"重新解析归档页面失败 ({entry['url']}): {str(e)}")
+            break
+    return results
+
+def reparse_archive(parsers, directory=None, workers=None, since=None):
+    """
+    离线重新解析归档页面（不发起任何网络请求）
+    parsers: [(URL正则, 页面类型, parse(url, html) → 记录列表), ...]，解析函数须为模块级函数
+    同一URL只解析最新的一条归档记录；since 指定时只解析该时间（WARC-Date，ISO格式）之后的记录
+    多进程并行解析，返回 {页面类型: 记录列表}，记录按URL首次归档的顺序排列
+    """
+    directory = directory or ARCHIVE_DIR
+    index_path = os.path.join(directory, "index.jsonl")
+    latest = {}
+    order = {}
+    for entry in read_jsonl(index_path):
+        if since and entry["date"] < since:
+            continue
+        order.setdefault(entry["url"], len(order))
+        latest[entry["url"]] = entry
+    entries = sorted(((order[url], entry) for url, entry in latest.items()),
+                     key=lambda item: (item[1]["segment"], item[1]["offset"]))
+    if not entries:
+        log_info("归档中没有可解析的页面")
+        return {}
+
+    workers = workers or REPARSE_WORKERS or os.cpu_count() or 1
+    batches = [entries[i:i + REPARSE_BATCH_SIZE] for i in range(0, len(entries), REPARSE_BATCH_SIZE)]
+    log_info(f"开始离线重新解析 {len(entries)} 个归档页面（{len(batches)} 批，{workers} 个进程）")
+    started = time.monotonic()
+
+    parsed = []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(_reparse_batch, directory, batch, parsers) for batch in batches]
+        for future in futures:
+            try:
+                parsed.extend(future.result())
+            except Exception as e:
+                log_error(f"重新解析批次失败: {str(e)}")
+
+    results = {}
+    for _, page_type, records in sorted(parsed, key=lambda item: item[0]):
+        results.setdefault(page_type, []).extend(records)
+    log_info(f"离线重新解析完成，用时 {time.monotonic() - started:.1f} 秒: "
+             + ", ".join(f"{page_type} {len(records)} 条" for page_type, records in results.items()))
+    return results
+
+_archive = None
+_archive_lock = threading.Lock()
+
+def get_response_archive():
+    """获取全局共享的响应归档（本次运行写入新的段文件）"""
+    global _archive
+    with _archive_lock:
+        if _archive is None:
+            _archive = ResponseArchive()
+        return _archive
@@ -0,0 +1,155 @@
+# crawlers/dataset_mirror.py
+import hashlib
+import json
+import os
+import threading
+import uuid
+from urllib.parse import urlparse
+import pandas as pd
+from utils.log import log_info, log_error
+from config import DATASET_MIRROR_DIR, DOWNLOAD_CHUNK_SIZE, DOWNLOAD_TIMEOUT
+
+class DatasetMirror:
+    """
+    第三方数据集本地镜像
+    - 流式下载到 {URL哈希}{后缀}，记录内容SHA-256、ETag/Last-Modified及文件大小/修改时间
+    - 再次加载时发起条件请求：304或下载内容的SHA-256与记录一致时继续使用镜像
+    - 镜像文件大小或修改时间与记录不符（被改动或损坏）时重新完整下载
+    - 解析后的DataFrame按 (内容哈希, 解析参数签名) 保存为pickle，数据集未变化时直接读取，不再重新解析
+    """
+
+    def __init__(self, directory=None):
+        self.directory = directory or DATASET_MIRROR_DIR
+        self.index_path = os.path.join(self.directory, "index.json")
+        self._lock = threading.Lock()
+        self._index = self._load()
+
+    def _load(self):
+        if os.path.exists(self.index_path):
+            try:
+                with open(self.index_path, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+            except (OSError, ValueError):
+                pass
+        return {}
+
+    def _save(self):
+        tmp_path = f"{self.index_path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self._index, f, ensure_ascii=False, indent=1)
+        os.replace(tmp_path, self.index_path)
+
+    def _mirror_path(self, url):
+        suffix = os.path.splitext(urlparse(url).path)[1]
+        return os.path.join(self.directory, hashlib.sha1(url.encode("utf-8")).hexdigest() + suffix)
+
+    @staticmethod
+    def _file_state(path):
+        stat = os.stat(path)
+        return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+    def _valid_record(self, url):
+        """返回URL镜像记录，镜像文件缺失或与记录不符时返回None"""
+        with self._lock:
+            record = self._index.get(url)
+        if not record or not os.path.exists(record["path"]):
+            return None
+        if self._file_state(record["path"]) != record["state"]:
+            log_info(f"数据集镜像文件已改动，重新下载: {url}")
+            return None
+        return record
+
+    def fetch(self, fetcher, url, headers=None, timeout=None):
+        """
+        同步URL到本地镜像
+        返回 (镜像路径, 内容SHA-256, 内容是否有变化)；下载失败但已有有效镜像时使用镜像
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        record = self._valid_record(url)
+        request_headers = dict(headers or {})
+        if record:
+            if record.get("etag"):
+                request_headers["If-None-Match"] = record["etag"]
+            if record.get("last_modified"):
+                request_headers["If-Modified-Since"] = record["last_modified"]
+
+        tmp_path = os.path.join(self.directory, f".{uuid.uuid4().hex}.part")
+        try:
+            with fetcher.get(url, headers=request_headers, timeout=timeout or DOWNLOAD_TIMEOUT, stream=True) as resp:
+                if resp.status_code == 304 and record:
+                    log_info(f"数据集未变化（304），使用本地镜像: {url}")
+                    return record["path"], record["sha256"], False
+                resp.raise_for_status()
+                sha256 = hashlib.sha256()
+                with open(tmp_path, 'wb') as f:
+                    for chunk in resp.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                        if chunk:
+                            sha256.update(chunk)
+                            f.write(chunk)
+                etag = resp.headers.get("ETag")
+                last_modified = resp.headers.get("Last-Modified")
+            digest = sha256.hexdigest()
+
+            changed = not record or record["sha256"] != digest
+            path = self._mirror_path(url)
+            if changed:
+                os.replace(tmp_path, path)
+                log_info(f"数据集已更新到本地镜像: {url} ({digest[:12]})")
+            else:
+                log_info(f"数据集内容哈希未变化，使用本地镜像: {url}")
+            with self._lock:
+                previous = self._index.get(url, {})
+                self._index[url] = {
+                    "path": path,
+                    "sha256": digest,
+                    "etag": etag,
+                    "last_modified": last_modified,
+                    "state": self._file_state(path),
+                    "parsed": previous.get("parsed") if not changed else None,
+                }
+                self._save()
+            return path, digest, changed
+        except Exception as e:
+            if record:
+                log_error(f"数据集下载失败，使用本地镜像 ({url}): {str(e)}")
+                return record["path"], record["sha256"], False
+            raise
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def load_parsed(self, url, digest, signature):
+        """读取与 (内容哈希, 解析参数签名) 匹配的解析结果，不存在时返回None"""
+        with self._lock:
+            parsed = (self._index.get(url) or {}).get("parsed")
+        if not parsed or parsed["sha256"] != digest or parsed["signature"] != signature:
+            return None
+        if not os.path.exists(parsed["path"]):
+            return None
+        return pd.read_pickle(parsed["path"])
+
+    def save_parsed(self, url, digest, signature, df):
+        """保存解析结果（每个URL只保留最新一份）"""
+        path = os.path.join(self.directory, "parsed", f"{digest}-{signature}.pkl")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        df.to_pickle(path)
+        with self._lock:
+            record = self._index.get(url)
+            if record is None:
+                return
+            old = record.get("parsed")
+            if old and old["path"] != path and os.path.exists(old["path"]):
+                os.remove(old["path"])
+            record["parsed"] = {"sha256": digest, "signature": signature, "path": path}
+            self._save()
+
+_mirrors = {}
+_mirrors_lock = threading.Lock()
+
+def get_dataset_mirror(directory=None):
+    """获取目录对应的共享数据集镜像"""
+    directory = directory or DATASET_MIRROR_DIR
+    with _mirrors_lock:
+        if directory not in _mirrors:
+            _mirrors[directory] = DatasetMirror(directory)
+        return _mirrors[directory]
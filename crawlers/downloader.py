@@ -0,0 +1,125 @@
+# crawlers/downloader.py
+import hashlib
+import json
+import os
+import threading
+import time
+import uuid
+from utils.log import log_info, log_error
+from config import DOWNLOAD_DIR, DOWNLOAD_CHUNK_SIZE, DOWNLOAD_TIMEOUT, DOWNLOAD_REVALIDATE_AFTER
+
+class ContentStore:
+    """
+    按内容哈希存储的下载目录
+    文件以 {sha256}{suffix} 命名，相同内容只保存一份；
+    index.json 记录 URL → 哈希、ETag/Last-Modified 与上次校验时间：
+    校验后 revalidate_after 秒内直接使用已下载文件，超过后发起条件请求，
+    304时继续使用已有文件，同一URL重新发布的新内容会重新下载
+    """
+
+    def __init__(self, directory=None, revalidate_after=None):
+        self.directory = directory or DOWNLOAD_DIR
+        self.revalidate_after = DOWNLOAD_REVALIDATE_AFTER if revalidate_after is None else revalidate_after
+        self.index_path = os.path.join(self.directory, "index.json")
+        self._lock = threading.Lock()
+        self._index = self._load()
+
+    def _load(self):
+        if os.path.exists(self.index_path):
+            try:
+                with open(self.index_path, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+            except (OSError, ValueError):
+                pass
+        return {}
+
+    def _save(self):
+        tmp_path = f"{self.index_path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self._index, f, ensure_ascii=False, indent=1)
+        os.replace(tmp_path, self.index_path)
+
+    def path_for(self, digest, suffix):
+        return os.path.join(self.directory, f"{digest}{suffix}")
+
+    def lookup(self, url):
+        """返回URL已下载文件的记录 {"sha256", "path", ...}，未下载或文件已删除时返回None"""
+        with self._lock:
+            record = self._index.get(url)
+        if record and os.path.exists(record["path"]):
+            return record
+        return None
+
+    def _is_fresh(self, record):
+        return time.time() - record.get("checked_at", 0) < self.revalidate_after
+
+    def _record(self, url, record):
+        with self._lock:
+            self._index[url] = record
+            self._save()
+
+    def download(self, fetcher, url, suffix="", headers=None, timeout=None):
+        """
+        流式下载URL：边下载边计算SHA-256并分块写入临时文件，完成后按哈希重命名
+        已下载过的URL在校验有效期内直接返回；过期后条件请求，下载失败时继续使用已有文件
+        返回 (文件路径, 哈希, 是否为新文件)
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        cached = self.lookup(url)
+        if cached and self._is_fresh(cached):
+            log_info(f"文件已下载过，跳过: {url}")
+            return cached["path"], cached["sha256"], False
+
+        request_headers = dict(headers or {})
+        if cached:
+            if cached.get("etag"):
+                request_headers["If-None-Match"] = cached["etag"]
+            if cached.get("last_modified"):
+                request_headers["If-Modified-Since"] = cached["last_modified"]
+
+        tmp_path = os.path.join(self.directory, f".{uuid.uuid4().hex}.part")
+        sha256 = hashlib.sha256()
+        try:
+            with fetcher.get(url, headers=request_headers, timeout=timeout or DOWNLOAD_TIMEOUT, stream=True) as resp:
+                if resp.status_code == 304 and cached:
+                    log_info(f"文件未变化（304），使用已下载文件: {url}")
+                    self._record(url, dict(cached, checked_at=time.time()))
+                    return cached["path"], cached["sha256"], False
+                resp.raise_for_status()
+                with open(tmp_path, 'wb') as f:
+                    for chunk in resp.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                        if chunk:
+                            sha256.update(chunk)
+                            f.write(chunk)
+                etag = resp.headers.get("ETag")
+                last_modified = resp.headers.get("Last-Modified")
+            digest = sha256.hexdigest()
+            path = self.path_for(digest, suffix)
+            is_new = not os.path.exists(path)
+            if is_new:
+                os.replace(tmp_path, path)
+            else:
+                log_info(f"内容与已有文件相同，去重: {path}")
+        except Exception as e:
+            if cached:
+                log_error(f"重新校验下载失败，使用已下载文件 ({url}): {str(e)}")
+                return cached["path"], cached["sha256"], False
+            raise
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+        self._record(url, {"sha256": digest, "path": path, "etag": etag,
+                           "last_modified": last_modified, "checked_at": time.time()})
+        return path, digest, is_new
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+def get_content_store(directory=None):
+    """获取目录对应的共享内容存储"""
+    directory = directory or DOWNLOAD_DIR
+    with _stores_lock:
+        if directory not in _stores:
+            _stores[directory] = ContentStore(directory)
+        return _stores[directory]
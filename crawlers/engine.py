@@ -0,0 +1,44 @@
+# crawlers/engine.py
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from utils.log import log_error
+from config import CRAWL_CONCURRENCY, CRAWL_PER_HOST_CONCURRENCY
+
+async def _run_task(loop, executor, global_sem, host_sems, per_host, host, func, args):
+    """
+    在全局与单主机并发限制下执行一个爬取任务
+    先取单主机名额再取全局名额：排在繁忙主机后面等待的任务不占用全局名额，不会阻塞其他主机
+    """
+    host_sem = host_sems.setdefault(host, asyncio.Semaphore(per_host))
+    async with host_sem:
+        async with global_sem:
+            return await loop.run_in_executor(executor, lambda: func(*args))
+
+async def _run_all(tasks, concurrency, per_host):
+    loop = asyncio.get_running_loop()
+    global_sem = asyncio.Semaphore(concurrency)
+    host_sems = {}
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        coros = [
+            _run_task(loop, executor, global_sem, host_sems, per_host, host, func, args)
+            for host, func, args in tasks
+        ]
+        return await asyncio.gather(*coros, return_exceptions=True)
+
+def run_concurrent(tasks, concurrency=None, per_host=None):
+    """
+    并发执行爬取任务，一次性调度全部任务
+    tasks: [(host, func, args), ...]，同一host的任务共享单主机并发上限
+    返回与tasks顺序一致的结果列表，失败的任务结果为None
+    """
+    if not tasks:
+        return []
+    concurrency = max(1, concurrency or CRAWL_CONCURRENCY)
+    per_host = max(1, per_host or CRAWL_PER_HOST_CONCURRENCY)
+
+    results = asyncio.run(_run_all(tasks, concurrency, per_host))
+    for i, result in enumerate(results):
+        if isinstance(result, Exception):
+            log_error(f"并发任务 {tasks[i][1].__name__}{tasks[i][2]} 执行失败: {str(result)}")
+            results[i] = None
+    return results
@@ -0,0 +1,73 @@
+# crawlers/extract.py
+import soupsieve
+from utils.log import log_error
+
+def field(selector, convert=str, attr=None, default=""):
+    """
+    声明一个字段
+    selector: 相对于数据行的CSS选择器，None表示数据行元素本身
+    convert: 类型转换函数，作用于去除首尾空白后的文本（或属性值）
+    attr: 指定时取该属性值，否则取元素文本
+    default: 元素或属性不存在时的默认值
+    """
+    return (selector, convert, attr, default)
+
+class ExtractionSpec:
+    """
+    编译后的字段提取规则
+    每个选择器只编译一次，每行每个字段只查找一次节点
+    规则为None的字段不从页面提取，而是在该位置填入extract_all的extra中的同名值
+    """
+
+    def __init__(self, name, fields):
+        self.name = name
+        self.fields = []
+        for field_name, spec in fields.items():
+            if spec is None:
+                self.fields.append((field_name, None, None, None, None))
+                continue
+            if isinstance(spec, str):
+                spec = field(spec)
+            selector, convert, attr, default = spec
+            pattern = soupsieve.compile(selector) if selector else None
+            self.fields.append((field_name, pattern, convert, attr, default))
+
+    def extract(self, row, extra=None):
+        """从一行中提取全部字段"""
+        extra = extra or {}
+        record = {}
+        for field_name, pattern, convert, attr, default in self.fields:
+            if convert is None:
+                record[field_name] = extra.get(field_name, "")
+                continue
+            node = pattern.select_one(row) if pattern is not None else row
+            if node is None:
+                record[field_name] = default
+                continue
+            if attr is not None:
+                value = node.get(attr)
+                record[field_name] = convert(value.strip()) if value is not None else default
+            else:
+                record[field_name] = convert(node.get_text().strip())
+        for key, value in extra.items():
+            record.setdefault(key, value)
+        return record
+
+    def extract_all(self, rows, extra=None):
+        """
+        批量提取多行，extra中的固定字段（如年份/省份）追加到每条记录
+        单行解析失败时记录日志并跳过该行
+        """
+        records = []
+        for row in rows:
+            try:
+                record = self.extract(row, extra)
+            except Exception as e:
+                log_error(f"解析{self.name}数据时出错: {str(e)}")
+                continue
+            records.append(record)
+        return records
+
+def compile_spec(name, fields):
+    """编译页面类型的字段提取规则：{字段名: 选择器 或 field(...)}"""
+    return ExtractionSpec(name, fields)
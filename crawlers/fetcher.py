@@ -0,0 +1,176 @@
+# crawlers/fetcher.py
+import threading
+import time
+from urllib.parse import urlparse
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from utils.log import log_info
+from crawlers.rate_limiter import get_limiter
+from crawlers.http_cache import HttpCache
+from crawlers.rotation import ProxyPool, get_proxy_pool
+from crawlers.archive import get_response_archive
+from config import (
+    HEADERS,
+    FETCHER_POOL_CONNECTIONS,
+    FETCHER_POOL_MAXSIZE,
+    FETCHER_HOST_POOL_SIZES,
+    FETCHER_TIMEOUT,
+    FETCHER_RETRIES,
+    FETCHER_BACKOFF_FACTOR,
+    FETCHER_RETRY_STATUS,
+    HTTP_CACHE_ENABLED,
+    ARCHIVE_RESPONSES,
+)
+
+class Fetcher:
+    """
+    共享HTTP抓取器
+    基于requests.Session，按主机维护keep-alive连接池，握手开销每个连接只付一次
+    每次请求前从主机限速器获取令牌，并根据响应状态反馈调整速率
+    传入cache（HttpCache）时，文本响应走磁盘缓存与条件请求
+    传入proxy_pool（ProxyPool）时，每次请求按代理健康度选择代理并反馈结果
+    传入archive（ResponseArchive）时，返回给爬虫的每个文本响应（含缓存命中）都写入归档
+    """
+
+    def __init__(self, pool_connections=None, pool_maxsize=None, host_pool_sizes=None,
+                 timeout=None, retries=None, backoff_factor=None, cache=None, proxy_pool=None, archive=None):
+        self.cache = cache
+        self.archive = archive
+        self.proxy_pool = proxy_pool if proxy_pool is not None else ProxyPool([])
+        self.pool_connections = pool_connections or FETCHER_POOL_CONNECTIONS
+        self.pool_maxsize = pool_maxsize or FETCHER_POOL_MAXSIZE
+        self.timeout = timeout or FETCHER_TIMEOUT
+        self.retries = FETCHER_RETRIES if retries is None else retries
+        self.backoff_factor = FETCHER_BACKOFF_FACTOR if backoff_factor is None else backoff_factor
+
+        self.session = requests.Session()
+        self.session.headers.update(HEADERS)
+        default_adapter = self._make_adapter(self.pool_maxsize)
+        self.session.mount("http://", default_adapter)
+        self.session.mount("https://", default_adapter)
+
+        # 单独配置连接池大小的主机使用独立的adapter
+        host_pool_sizes = FETCHER_HOST_POOL_SIZES if host_pool_sizes is None else host_pool_sizes
+        for host, size in host_pool_sizes.items():
+            adapter = self._make_adapter(size)
+            self.session.mount(f"http://{host}", adapter)
+            self.session.mount(f"https://{host}", adapter)
+
+    def _make_adapter(self, pool_maxsize):
+        # 连接/读取错误交给urllib3重试；状态码重试在get中进行，以便限速器感知每次429/5xx
+        retry = Retry(
+            total=self.retries,
+            connect=self.retries,
+            read=self.retries,
+            status=0,
+            backoff_factor=self.backoff_factor,
+            allowed_methods=["GET", "HEAD"],
+        )
+        return HTTPAdapter(
+            pool_connections=self.pool_connections,
+            pool_maxsize=pool_maxsize,
+            max_retries=retry,
+        )
+
+    def get(self, url, params=None, headers=None, timeout=None, use_cache=True, **kwargs):
+        """
+        发送GET请求，复用已建立的连接，并受主机限速器约束
+        启用缓存时：TTL内直接返回缓存；过期则发起条件请求，304时返回缓存内容
+        """
+        resp = self._get(url, params, headers, timeout, use_cache, **kwargs)
+        if self.archive is not None and not kwargs.get("stream"):
+            self.archive.record(resp)
+        return resp
+
+    def _get(self, url, params=None, headers=None, timeout=None, use_cache=True, **kwargs):
+        if self.cache is None or not use_cache or kwargs.get("stream"):
+            return self._request(url, params, headers, timeout, **kwargs)
+
+        full_url = self.cache.full_url(url, params)
+        key, entry, body = self.cache.lookup(full_url)
+        if entry is not None and self.cache.is_fresh(entry):
+            return self.cache.to_response(entry, body)
+
+        if entry is not None:
+            headers = dict(headers or {})
+            headers.update(self.cache.conditional_headers(entry))
+        resp = self._request(url, params, headers, timeout, **kwargs)
+
+        if resp.status_code == 304 and entry is not None:
+            self.cache.revalidated(key, entry, resp)
+            return self.cache.to_response(entry, body)
+        if self.cache.is_cacheable(resp):
+            self.cache.store(full_url, resp)
+        return resp
+
+    def _request(self, url, params=None, headers=None, timeout=None, **kwargs):
+        """受限速器约束的实际请求，429/5xx时降速并重试"""
+        limiter = get_limiter(urlparse(url).netloc)
+        attempt = 0
+        while True:
+            limiter.acquire()
+            proxy = None if "proxies" in kwargs else self.proxy_pool.choose()
+            proxies = {"http": proxy, "https": proxy} if proxy else kwargs.get("proxies")
+            request_kwargs = {key: value for key, value in kwargs.items() if key != "proxies"}
+            started = time.monotonic()
+            try:
+                resp = self.session.get(
+                    url,
+                    params=params,
+                    headers=headers,
+                    timeout=timeout or self.timeout,
+                    proxies=proxies,
+                    **request_kwargs
+                )
+            except requests.RequestException as e:
+                self.proxy_pool.report(proxy, False)
+                limiter.on_throttle(f"请求异常 {type(e).__name__}")
+                raise
+
+            throttled = resp.status_code in FETCHER_RETRY_STATUS
+            self.proxy_pool.report(proxy, not throttled, time.monotonic() - started)
+            if not throttled:
+                limiter.on_success()
+                return resp
+
+            retry_after = _parse_retry_after(resp.headers.get("Retry-After"))
+            limiter.on_throttle(f"HTTP {resp.status_code}", retry_after)
+            if attempt >= self.retries:
+                return resp
+            time.sleep(retry_after or self.backoff_factor * (2 ** attempt))
+            attempt += 1
+
+    def close(self):
+        """关闭所有连接池"""
+        self.session.close()
+
+def _parse_retry_after(value):
+    """解析以秒为单位的Retry-After响应头"""
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        return None
+
+_fetcher = None
+_fetcher_lock = threading.Lock()
+
+def get_fetcher():
+    """获取全局共享的抓取器（线程安全的惰性初始化）"""
+    global _fetcher
+    if _fetcher is None:
+        with _fetcher_lock:
+            if _fetcher is None:
+                cache = HttpCache() if HTTP_CACHE_ENABLED else None
+                archive = get_response_archive() if ARCHIVE_RESPONSES else None
+                _fetcher = Fetcher(cache=cache, proxy_pool=get_proxy_pool(), archive=archive)
+                log_info(
+                    f"HTTP抓取器已初始化: 每主机连接数 {_fetcher.pool_maxsize}, "
+                    f"超时 {_fetcher.timeout}s, 重试 {_fetcher.retries} 次"
+                )
+                if cache is not None:
+                    log_info(
+                        f"HTTP缓存已加载: {len(cache.index)} 条记录, "
+                        f"{cache.index.total_bytes / 1024 / 1024:.1f} MB"
+                    )
+    return _fetcher
@@ -0,0 +1,129 @@
+# crawlers/http_cache.py
+import hashlib
+import os
+import re
+import time
+import requests
+from requests.structures import CaseInsensitiveDict
+from utils.io_tools import read_html, save_html
+from utils.disk_cache import DiskLRUIndex
+from config import (
+    HTTP_CACHE_DIR,
+    HTTP_CACHE_MAX_BYTES,
+    HTTP_CACHE_DEFAULT_TTL,
+    HTTP_CACHE_TTL_RULES,
+)
+
+# 仅缓存文本类响应（PDF等二进制文件不经过HTML缓存）
+CACHEABLE_CONTENT_TYPES = ("text/", "application/json", "application/xml", "application/xhtml")
+
+class HttpCache:
+    """
+    基于 read_html/save_html 的磁盘响应缓存
+    - 以完整URL（含查询参数）为键
+    - 在TTL内直接返回缓存，过期后携带 If-None-Match/If-Modified-Since 发起条件请求
+    - 总大小超出上限时按LRU淘汰
+    """
+
+    def __init__(self, cache_dir=None, max_bytes=None, default_ttl=None, ttl_rules=None):
+        self.cache_dir = cache_dir or HTTP_CACHE_DIR
+        self.default_ttl = HTTP_CACHE_DEFAULT_TTL if default_ttl is None else default_ttl
+        rules = HTTP_CACHE_TTL_RULES if ttl_rules is None else ttl_rules
+        self.ttl_rules = [(re.compile(pattern), ttl) for pattern, ttl in rules]
+        self.index = DiskLRUIndex(
+            os.path.join(self.cache_dir, "index.json"),
+            max_bytes or HTTP_CACHE_MAX_BYTES,
+            on_evict=self._delete_body,
+        )
+
+    @staticmethod
+    def full_url(url, params=None):
+        """合并查询参数得到规范化的完整URL"""
+        return requests.Request("GET", url, params=params).prepare().url
+
+    @staticmethod
+    def make_key(full_url):
+        return hashlib.sha1(full_url.encode("utf-8")).hexdigest()
+
+    def _body_path(self, key):
+        return os.path.join(self.cache_dir, key[:2], f"{key}.html")
+
+    def _delete_body(self, key, entry):
+        try:
+            os.remove(self._body_path(key))
+        except OSError:
+            pass
+
+    def ttl_for(self, full_url):
+        """按URL规则匹配TTL（秒），未命中任何规则时使用默认TTL"""
+        for pattern, ttl in self.ttl_rules:
+            if pattern.search(full_url):
+                return ttl
+        return self.default_ttl
+
+    def lookup(self, full_url):
+        """查找缓存条目，返回(键, 元数据, 正文)，未命中时元数据与正文为None"""
+        key = self.make_key(full_url)
+        entry = self.index.get(key)
+        if entry is None:
+            return key, None, None
+        body = read_html(self._body_path(key))
+        if body is None:
+            self.index.remove(key)
+            return key, None, None
+        return key, entry, body
+
+    def is_fresh(self, entry):
+        return time.time() - entry["stored_at"] < entry["ttl"]
+
+    @staticmethod
+    def conditional_headers(entry):
+        """构造条件请求头"""
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    @staticmethod
+    def is_cacheable(resp):
+        if resp.status_code != 200:
+            return False
+        content_type = resp.headers.get("Content-Type", "text/html")
+        return content_type.startswith(CACHEABLE_CONTENT_TYPES)
+
+    def store(self, full_url, resp):
+        """保存200响应的正文与校验头"""
+        key = self.make_key(full_url)
+        body = resp.text
+        save_html(body, self._body_path(key))
+        self.index.put(key, {
+            "url": full_url,
+            "etag": resp.headers.get("ETag"),
+            "last_modified": resp.headers.get("Last-Modified"),
+            "content_type": resp.headers.get("Content-Type", "text/html"),
+            "stored_at": time.time(),
+            "ttl": self.ttl_for(full_url),
+            "size": len(body.encode("utf-8")),
+        })
+
+    def revalidated(self, key, entry, resp):
+        """收到304后刷新条目的存储时间与校验头"""
+        entry = dict(entry)
+        entry["stored_at"] = time.time()
+        entry["etag"] = resp.headers.get("ETag") or entry.get("etag")
+        entry["last_modified"] = resp.headers.get("Last-Modified") or entry.get("last_modified")
+        self.index.put(key, entry)
+
+    @staticmethod
+    def to_response(entry, body):
+        """将缓存条目还原为requests.Response"""
+        resp = requests.Response()
+        resp.status_code = 200
+        resp.url = entry["url"]
+        resp._content = body.encode("utf-8")
+        resp.encoding = "utf-8"
+        resp.headers = CaseInsensitiveDict({"Content-Type": entry.get("content_type", "text/html")})
+        resp.from_cache = True
+        return resp
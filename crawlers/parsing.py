@@ -0,0 +1,34 @@
+# crawlers/parsing.py
+from bs4 import BeautifulSoup, SoupStrainer
+from config import PARSER_BACKENDS
+
+def _has_class(name):
+    """匹配包含指定class的标签（兼容多class属性）"""
+    return lambda value: bool(value) and name in value.split()
+
+# 各页面类型真正需要的子树，其余节点在解析阶段直接丢弃
+PARSE_TARGETS = {
+    "schools": SoupStrainer("table", class_=_has_class("ch-table")),
+    "majors": SoupStrainer(class_=_has_class("major-info-item")),
+    "scores": SoupStrainer(class_=_has_class("score-item")),
+}
+
+# 解析后端：(BeautifulSoup树构建器, 是否只解析目标子树)
+BACKENDS = {
+    "html.parser": ("html.parser", False),  # 完整文档树（原有方式）
+    "strainer": ("html.parser", True),  # 纯Python解析器 + SoupStrainer
+    "lxml": ("lxml", True),  # lxml C解析器 + SoupStrainer
+}
+
+def make_soup(html, page_type=None, backend=None):
+    """
+    按页面类型构建BeautifulSoup
+    backend 未指定时取 config.PARSER_BACKENDS[page_type]；
+    page_type 没有登记目标子树时始终解析完整文档
+    """
+    backend = backend or PARSER_BACKENDS.get(page_type, "html.parser")
+    if backend not in BACKENDS:
+        raise ValueError(f"未知的解析后端: {backend}")
+    features, use_strainer = BACKENDS[backend]
+    strainer = PARSE_TARGETS.get(page_type) if use_strainer else None
+    return BeautifulSoup(html, features, parse_only=strainer)
@@ -1,19 +1,198 @@
 # crawlers/provincial.py
+import re
+import threading
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 import requests
+from requests.compat import chardet
 from bs4 import BeautifulSoup
-from utils.log import log_error
+from utils.log import log_error, log_info
+from crawlers.fetcher import get_fetcher
+from crawlers.rotation import get_ua_pool
+from crawlers.parsing import make_soup
+from crawlers.dataset_mirror import get_dataset_mirror
+from data_processing.dataset_loader import read_dataset, dataset_format, dataset_signature
+from config import PROVINCIAL_WORKERS, PROVINCIAL_ADAPTER_TIMEOUT, DOWNLOAD_CHUNK_SIZE
+
+# 省级考试院URL映射（需要根据实际情况调整）
+PROVINCE_URLS = {
+    "北京": "http://www.bjeea.cn/html/gkgz/tzgg/",
+    "上海": "http://www.shmeea.edu.cn/page/24300/",
+    "广东": "http://eea.gd.gov.cn/",
+    "浙江": "http://www.zjzs.net/",
+    "江苏": "http://www.jseea.cn/",
+    "山东": "http://www.sdzk.cn/",
+    "河南": "http://www.heao.gov.cn/",
+    "四川": "http://www.sceea.cn/",
+    "湖北": "http://www.hbea.edu.cn/",
+    "湖南": "http://www.hneao.edu.cn/"
+}
+
+# 分数记录字段（与阳光高考分数线记录一致，可直接交给 merge_datasets）
+SCORE_FIELDS = ["school", "major", "min_score", "min_rank", "plan_count", "year", "province"]
+
+# 各省表格的常见表头 → 分数记录字段
+COLUMN_ALIASES = {
+    "院校名称": "school", "院校": "school", "学校名称": "school", "学校": "school",
+    "专业名称": "major", "专业": "major",
+    "最低分": "min_score", "最低分数": "min_score", "投档线": "min_score", "分数线": "min_score",
+    "最低位次": "min_rank", "位次": "min_rank", "最低排名": "min_rank",
+    "计划数": "plan_count", "招生计划": "plan_count", "计划人数": "plan_count",
+    "年份": "year",
+}
+
+class ProvinceAdapter(ABC):
+    """
+    省级考试院页面适配器
+    fetch 请求页面，parse 把页面解析为分数记录（字段见 SCORE_FIELDS）；
+    子类实现 parse（页面结构特殊时也可重写 fetch）后用 register_adapter 登记
+    """
+
+    def __init__(self, province, url, timeout=None):
+        self.province = province
+        self.url = url
+        self.timeout = timeout or PROVINCIAL_ADAPTER_TIMEOUT
+
+    def fetch(self):
+        """
+        请求页面，整个请求（含读取响应体）不超过 timeout 秒
+        每次socket读写不超过 timeout，分块读取时再检查总时限，超时抛出 TimeoutError，线程随之返回
+        """
+        deadline = time.monotonic() + self.timeout
+        headers = {"User-Agent": get_ua_pool().random()}
+        with get_fetcher().get(self.url, headers=headers, timeout=self.timeout, stream=True) as resp:
+            resp.raise_for_status()
+            body = bytearray()
+            for chunk in resp.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                if time.monotonic() > deadline:
+                    raise TimeoutError(f"读取页面超过 {self.timeout} 秒: {self.url}")
+                body.extend(chunk)
+            encoding = resp.encoding or chardet.detect(bytes(body))["encoding"] or "utf-8"
+        return bytes(body).decode(encoding, errors="replace")
+
+    @abstractmethod
+    def parse(self, html):
+        """把页面解析为分数记录列表"""
+
+    def crawl(self):
+        """爬取并返回分数记录，省份缺省时填入适配器所属省份"""
+        records = []
+        for record in self.parse(self.fetch()):
+            record = {field: record.get(field, "") for field in SCORE_FIELDS}
+            record["province"] = record["province"] or self.province
+            records.append(record)
+        return records
+
+class TableScoreAdapter(ProvinceAdapter):
+    """
+    通用表格适配器：按表头识别院校/专业/分数/位次/计划列
+    表格中没有年份列时从页面标题中的"20xx年"读取
+    """
+
+    def parse(self, html):
+        soup = make_soup(html)
+        title = soup.title.get_text() if soup.title else ""
+        match = re.search(r"(20\d{2})\s*年", title)
+        page_year = int(match.group(1)) if match else ""
+
+        records = []
+        for table in soup.find_all("table"):
+            rows = table.find_all("tr")
+            if not rows:
+                continue
+            header = [COLUMN_ALIASES.get(cell.get_text().strip()) for cell in rows[0].find_all(["th", "td"])]
+            if "school" not in header:
+                continue
+            for row in rows[1:]:
+                cells = [cell.get_text().strip() for cell in row.find_all("td")]
+                record = {field: cells[i] for i, field in enumerate(header) if field and i < len(cells)}
+                if not record.get("school"):
+                    continue
+                record.setdefault("year", page_year)
+                records.append(record)
+        return records
+
+# 省份 → 适配器
+PROVINCE_ADAPTERS = {}
+
+def register_adapter(adapter):
+    """登记（或替换）省份的适配器"""
+    PROVINCE_ADAPTERS[adapter.province] = adapter
+    return adapter
+
+for _province, _url in PROVINCE_URLS.items():
+    register_adapter(TableScoreAdapter(_province, _url))
+
+def crawl_provinces(provinces, workers=None, adapters=None):
+    """
+    并发运行各省适配器，返回全部分数记录（按provinces顺序）
+    - 每个适配器在线程池中独立运行，出错只影响该省
+    - 适配器从开始运行起超过其 timeout 仍未完成时放弃等待，不阻塞其他省份
+      （fetch 自身也受 timeout 约束，超时的线程随后会自行返回，不会阻塞解释器退出）
+    """
+    adapters = PROVINCE_ADAPTERS if adapters is None else adapters
+    selected = [adapters[province] for province in provinces if province in adapters]
+    if not selected:
+        return []
+    workers = workers or PROVINCIAL_WORKERS
+    log_info(f"开始并发爬取 {len(selected)} 个省级考试院（{workers} 个线程）")
+
+    started = {}
+    lock = threading.Lock()
+
+    def run(adapter):
+        with lock:
+            started[adapter.province] = time.monotonic()
+        return adapter.crawl()
+
+    results = {}
+    executor = ThreadPoolExecutor(max_workers=workers)
+    try:
+        futures = {executor.submit(run, adapter): adapter for adapter in selected}
+        pending = set(futures)
+        while pending:
+            with lock:
+                deadlines = [started[futures[f].province] + futures[f].timeout
+                             for f in pending if futures[f].province in started]
+            wait_for = max(0.0, min(deadlines) - time.monotonic()) if deadlines else None
+            done, pending = wait(pending, timeout=wait_for, return_when=FIRST_COMPLETED)
+            for future in done:
+                adapter = futures[future]
+                try:
+                    results[adapter.province] = future.result()
+                except Exception as e:
+                    log_error(f"省级数据爬取失败 ({adapter.province} {adapter.url}): {str(e)}")
+            now = time.monotonic()
+            with lock:
+                expired = {f for f in pending
+                           if futures[f].province in started
+                           and now - started[futures[f].province] >= futures[f].timeout}
+            for future in expired:
+                adapter = futures[future]
+                log_error(f"省级数据爬取超时 ({adapter.province}，超过 {adapter.timeout} 秒)")
+            pending -= expired
+    finally:
+        # 超时的适配器线程无法强制终止，不再等待其结束（其请求在 fetch 的时限内返回）
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    records = []
+    for adapter in selected:
+        records.extend(results.get(adapter.province, []))
+    log_info(f"省级考试院数据爬取完成: 成功 {len(results)} 个省份，共 {len(records)} 条记录")
+    return records
 
 def crawl_provincial_scores(province_url):
     """
     按省份爬取控制线/位次表
-    适配不同省份页面结构（需定制解析器）
+    使用该URL所属省份登记的适配器，未登记的URL按通用表格解析
     示例：北京教育考试院 http://www.bjeea.cn/html/gkgz/tzgg/
     """
     print(f"开始爬取省级考试院数据: {province_url}")
     try:
-        # 实际请求逻辑，需要为每个省份定制
-        # ...
-        pass
+        adapter = next((adapter for adapter in PROVINCE_ADAPTERS.values() if adapter.url == province_url),
+                       None) or TableScoreAdapter("", province_url)
+        return adapter.crawl()
     except Exception as e:
         log_error(f"省级数据爬取失败 ({province_url}): {str(e)}")
         return None
@@ -21,15 +200,24 @@ def crawl_provincial_scores(province_url):
 def load_github_dataset(url):
     """
     复用GitHub开源数据集（CSV/JSON格式）
-    直接下载并转换字段名匹配主数据集
+    同步到本地镜像后分块读取，字段名经 FIELD_MAPPING 映射为主数据集字段；
+    数据集内容未变化时直接返回缓存的解析结果
+    返回DataFrame，失败时返回None
     """
     print(f"从GitHub加载数据集: {url}")
     try:
-        # 例如使用pandas读取
-        # import pandas as pd
-        # df = pd.read_csv(url)
-        # return df
-        pass
+        mirror = get_dataset_mirror()
+        headers = {"User-Agent": get_ua_pool().random()}
+        path, digest, _ = mirror.fetch(get_fetcher(), url, headers=headers)
+        fmt = dataset_format(path)
+        signature = dataset_signature(fmt)
+        df = mirror.load_parsed(url, digest, signature)
+        if df is not None:
+            log_info(f"数据集未变化，使用已解析的缓存: {url}")
+            return df
+        df = read_dataset(path, fmt)
+        mirror.save_parsed(url, digest, signature, df)
+        return df
     except Exception as e:
         log_error(f"GitHub数据集加载失败 ({url}): {str(e)}")
-        return None 
\ No newline at end of file
+        return None
@@ -0,0 +1,92 @@
+# crawlers/rate_limiter.py
+import threading
+import time
+from utils.log import log_info
+from config import (
+    RATE_LIMIT_INITIAL,
+    RATE_LIMIT_MIN,
+    RATE_LIMIT_MAX,
+    RATE_LIMIT_BURST,
+    RATE_LIMIT_INCREASE,
+    RATE_LIMIT_DECREASE,
+    RATE_LIMIT_LOG_EVERY,
+    RATE_LIMIT_HOSTS,
+)
+
+class AdaptiveRateLimiter:
+    """
+    单主机自适应令牌桶限速器
+    请求成功时速率加性增加，遇到429/5xx或网络错误时速率乘性下降（AIMD）
+    """
+
+    def __init__(self, host, initial=None, min_rate=None, max_rate=None, burst=None,
+                 increase=None, decrease=None):
+        self.host = host
+        self.min_rate = min_rate or RATE_LIMIT_MIN
+        self.max_rate = max_rate or RATE_LIMIT_MAX
+        self.burst = burst or RATE_LIMIT_BURST
+        self.increase = RATE_LIMIT_INCREASE if increase is None else increase
+        self.decrease = decrease or RATE_LIMIT_DECREASE
+        self._rate = min(self.max_rate, max(self.min_rate, initial or RATE_LIMIT_INITIAL))
+        self._tokens = float(self.burst)
+        self._last_refill = time.monotonic()
+        self._paused_until = 0.0
+        self._successes = 0
+        self._lock = threading.Lock()
+
+    @property
+    def rate(self):
+        """当前速率（请求/秒）"""
+        return self._rate
+
+    def _refill(self, now):
+        elapsed = now - self._last_refill
+        self._tokens = min(self.burst, self._tokens + elapsed * self._rate)
+        self._last_refill = now
+
+    def acquire(self):
+        """阻塞直到获得一个令牌"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if now < self._paused_until:
+                    wait = self._paused_until - now
+                elif self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                else:
+                    wait = (1 - self._tokens) / self._rate
+            time.sleep(wait)
+
+    def on_success(self):
+        """请求成功：加性提速"""
+        with self._lock:
+            self._rate = min(self.max_rate, self._rate + self.increase)
+            self._successes += 1
+            should_log = self._successes % RATE_LIMIT_LOG_EVERY == 0
+        if should_log:
+            log_info(f"[限速] {self.host} 当前速率 {self._rate:.2f} 次/秒")
+
+    def on_throttle(self, reason="", retry_after=None):
+        """被限流或请求出错：乘性降速，必要时按Retry-After暂停"""
+        with self._lock:
+            old_rate = self._rate
+            self._rate = max(self.min_rate, self._rate * self.decrease)
+            self._tokens = min(self._tokens, 0.0)
+            if retry_after:
+                self._paused_until = max(self._paused_until, time.monotonic() + retry_after)
+        log_info(f"[限速] {self.host} {reason} 速率 {old_rate:.2f} → {self._rate:.2f} 次/秒")
+
+_limiters = {}
+_limiters_lock = threading.Lock()
+
+def get_limiter(host):
+    """获取主机对应的共享限速器"""
+    with _limiters_lock:
+        limiter = _limiters.get(host)
+        if limiter is None:
+            limiter = AdaptiveRateLimiter(host, **RATE_LIMIT_HOSTS.get(host, {}))
+            _limiters[host] = limiter
+            log_info(f"[限速] {host} 初始速率 {limiter.rate:.2f} 次/秒")
+        return limiter
@@ -0,0 +1,130 @@
+# crawlers/rotation.py
+import random
+import threading
+import time
+from fake_useragent import UserAgent
+from utils.log import log_info
+from config import (
+    PROXY_POOL,
+    USER_AGENTS,
+    PROXY_EWMA_ALPHA,
+    PROXY_MAX_FAILURE_RATE,
+    PROXY_COOLDOWN,
+)
+
+class UserAgentPool:
+    """User-Agent池：只在初始化时加载一次fake_useragent数据，之后每次取用无需磁盘/网络访问"""
+
+    def __init__(self, fallback=None):
+        self.fallback = list(fallback or USER_AGENTS)
+        try:
+            self._ua = UserAgent()
+        except Exception:
+            self._ua = None
+            log_info("fake_useragent 加载失败，使用内置User-Agent列表")
+
+    def random(self):
+        if self._ua is not None:
+            try:
+                return self._ua.random
+            except Exception:
+                pass
+        return random.choice(self.fallback)
+
+class ProxyStats:
+    """单个代理的健康状况：延迟与失败率的指数滑动平均"""
+
+    def __init__(self, proxy):
+        self.proxy = proxy
+        self.latency = 1.0
+        self.failure_rate = 0.0
+        self.requests = 0
+        self.cooldown_until = 0.0
+
+    @property
+    def weight(self):
+        """健康度越高、延迟越低，被选中的概率越大"""
+        return (1.0 - self.failure_rate) ** 2 / max(self.latency, 0.05)
+
+class ProxyPool:
+    """
+    代理轮换池
+    按健康度加权随机选择代理；失败率过高的代理进入冷却，冷却结束后重新参与轮换
+    """
+
+    def __init__(self, proxies=None, alpha=None, max_failure_rate=None, cooldown=None):
+        proxies = PROXY_POOL if proxies is None else proxies
+        self.alpha = alpha or PROXY_EWMA_ALPHA
+        self.max_failure_rate = max_failure_rate or PROXY_MAX_FAILURE_RATE
+        self.cooldown = PROXY_COOLDOWN if cooldown is None else cooldown
+        self._stats = {proxy: ProxyStats(proxy) for proxy in proxies}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._stats)
+
+    def choose(self):
+        """选择一个代理，代理池为空时返回None（直连）"""
+        with self._lock:
+            if not self._stats:
+                return None
+            now = time.monotonic()
+            candidates = [stats for stats in self._stats.values() if stats.cooldown_until <= now]
+            if not candidates:
+                # 全部在冷却中时选择最早结束冷却的代理
+                return min(self._stats.values(), key=lambda stats: stats.cooldown_until).proxy
+            weights = [stats.weight for stats in candidates]
+            if not any(weights):
+                return random.choice(candidates).proxy
+            return random.choices(candidates, weights=weights)[0].proxy
+
+    def report(self, proxy, success, latency=None):
+        """反馈一次请求结果，更新代理的延迟与失败率"""
+        with self._lock:
+            stats = self._stats.get(proxy)
+            if stats is None:
+                return
+            stats.requests += 1
+            stats.failure_rate += self.alpha * ((0.0 if success else 1.0) - stats.failure_rate)
+            if success and latency is not None:
+                stats.latency += self.alpha * (latency - stats.latency)
+            if stats.failure_rate > self.max_failure_rate:
+                stats.cooldown_until = time.monotonic() + self.cooldown
+                stats.failure_rate = self.max_failure_rate  # 冷却结束后以临界失败率重新试用
+                log_info(f"[代理池] {proxy} 失败率过高，冷却 {self.cooldown} 秒")
+
+    def summary(self):
+        """各代理当前健康状况"""
+        with self._lock:
+            return {
+                proxy: {
+                    "latency": round(stats.latency, 3),
+                    "failure_rate": round(stats.failure_rate, 3),
+                    "requests": stats.requests,
+                }
+                for proxy, stats in self._stats.items()
+            }
+
+_ua_pool = None
+_proxy_pool = None
+_rotation_lock = threading.Lock()
+
+def get_ua_pool():
+    """获取全局User-Agent池"""
+    global _ua_pool
+    if _ua_pool is None:
+        with _rotation_lock:
+            if _ua_pool is None:
+                _ua_pool = UserAgentPool()
+    return _ua_pool
+
+def get_proxy_pool():
+    """获取全局代理池（基于 config.PROXY_POOL）"""
+    global _proxy_pool
+    if _proxy_pool is None:
+        with _rotation_lock:
+            if _proxy_pool is None:
+                _proxy_pool = ProxyPool()
+                if len(_proxy_pool):
+                    log_info(f"[代理池] 已加载 {len(_proxy_pool)} 个代理")
+    return _proxy_pool
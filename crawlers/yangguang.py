@@ -1,184 +1,520 @@
 # crawlers/yangguang.py
-import requests
-from bs4 import BeautifulSoup
-import time
-import random
-from fake_useragent import UserAgent
+import os
+import re
+import threading
+from urllib.parse import parse_qs, urljoin, urlparse
 from utils.log import log_error, log_info
-from config import YANGGUANG_BASE_URL, HEADERS, PROXY_POOL
+from crawlers.engine import run_concurrent
+from crawlers.fetcher import get_fetcher
+from crawlers.downloader import get_content_store
+from crawlers.rotation import get_ua_pool
+from crawlers.parsing import make_soup
+from crawlers.extract import compile_spec, field
+from crawlers.archive import reparse_archive
+from utils.checkpoint import CheckpointStore
+from utils.io_tools import read_jsonl, append_jsonl
+from utils.seen_set import SeenSet
+from utils.retry import retry_call, get_dead_letter_queue
+from data_processing.converter import pdf_to_text, EXTRACTOR_VERSION
+from data_processing.text_cache import get_pdf_text_cache
+from data_processing.pdf_batch import batch_pdf_to_text
+from config import (
+    YANGGUANG_BASE_URL,
+    PARALLEL_SCHOOL_PAGES,
+    SCHOOL_PAGE_CONCURRENCY,
+    RESUME_CRAWL,
+    PARSER_BACKENDS,
+    ADMISSION_RULES_WORKERS,
+    ADMISSION_RULES_STREAM_PATH,
+    MAJOR_CONCURRENCY,
+    MAJOR_DETAILS,
+    SCHOOL_DETAIL_CONCURRENCY,
+    SCHOOL_DETAILS_PATH,
+    SCHOOL_DETAIL_SEEN_PATH,
+)
 
 def get_random_ua():
-    """随机生成User-Agent"""
-    try:
-        ua = UserAgent()
-        return ua.random
-    except:
-        return HEADERS['User-Agent']
+    """随机生成User-Agent（User-Agent池只加载一次）"""
+    return get_ua_pool().random()
+
+SCHOOL_PAGE_SIZE = 20
+MAX_CONSECUTIVE_PAGE_FAILURES = 3  # 逐页爬取时连续失败多少页后停止
+
+# 各页面类型的字段提取规则（页面改版时只需调整选择器）
+SCHOOL_SPEC = compile_spec("院校", {
+    "院校名称": ":scope > td:nth-of-type(1) a",
+    "详情页": field(":scope > td:nth-of-type(1) a", attr="href",
+                    convert=lambda href: "https://gaokao.chsi.com.cn" + href),
+    "所在地": ":scope > td:nth-of-type(2)",
+    "主管部门": ":scope > td:nth-of-type(3)",
+    "院校类型": ":scope > td:nth-of-type(4)",
+    "学历层次": ":scope > td:nth-of-type(5)",
+    "满意度": ":scope > td:nth-of-type(6)",
+})
+
+SCHOOL_DETAIL_SPEC = compile_spec("院校详情", {
+    "院校简介": ".sch-intro",
+    "通讯地址": ".sch-address",
+    "官方网址": field(".sch-website a", attr="href"),
+    "招生电话": ".sch-phone",
+})
+
+# 省份代码映射（需要根据实际情况调整）
+PROVINCE_CODES = {
+    "北京": "11", "上海": "31", "广东": "44", "浙江": "33",
+    "江苏": "32", "山东": "37", "河南": "41", "四川": "51",
+    "湖北": "42", "湖南": "43"
+}
+
+# 专业分类代码
+MAJOR_CATEGORIES = {
+    "gx": "工学",
+    "ls": "理学",
+    "wy": "文学",
+    "kj": "经济学",
+    "yy": "医学",
+    "qt": "其他"
+}
+
+MAJOR_SPEC = compile_spec("专业", {
+    "name": ".major-name",
+    "code": field(None, attr="id"),
+    "category": None,  # 由所在分类页填入
+    "intro": ".major-desc",
+    "career": ".major-career",
+})
+
+# 专业详情页链接（仅供详情页阶段使用，不写入专业记录）
+MAJOR_LINK_SPEC = compile_spec("专业详情页链接", {
+    "detail_url": field("a[href]", attr="href", default=None,
+                        convert=lambda href: urljoin(f"{YANGGUANG_BASE_URL}/zyk/", href)),
+})
+
+MAJOR_DETAIL_SPEC = compile_spec("专业详情", {
+    "intro": ".major-desc",
+    "career": ".major-career",
+})
+
+# 详情页URL中的院校ID：/sch/schoolInfo--schId-123.dhtml 或 ...?schoolid=123
+SCHOOL_ID_PATTERN = re.compile(r"(?:schId-|[?&]schoolid=)(\d+)", re.IGNORECASE)
 
-def crawl_schools():
+SCORE_SPEC = compile_spec("分数线", {
+    "school": ".school-name",
+    "major": ".major-name",
+    "min_score": ".min-score",
+    "min_rank": ".min-rank",
+    "plan_count": ".plan-count",
+})
+
+def _parse_school_rows(soup):
+    """
+    解析院校库列表页中的院校行
+    页面中没有院校表格时返回None
+    """
+    table = soup.find("table", class_="ch-table")
+    if not table:
+        return None
+    rows = [row for row in table.find_all("tr")[1:] if len(row.find_all("td")) >= 7]  # 跳过表头
+    return SCHOOL_SPEC.extract_all(rows)
+
+def _parse_school_total(soup):
+    """
+    从院校库首页读取结果总数
+    优先匹配"共 N 条/所"文字，其次根据分页链接中最大的start参数推算
+    """
+    match = re.search(r"共\s*([\d,]+)\s*(?:条|所)", soup.get_text())
+    if match:
+        return int(match.group(1).replace(",", ""))
+    starts = [
+        int(m.group(1))
+        for a in soup.find_all("a", href=True)
+        for m in [re.search(r"[?&]start=(\d+)", a["href"])]
+        if m
+    ]
+    if starts:
+        return max(starts) + SCHOOL_PAGE_SIZE
+    return None
+
+def _fetch_school_page(start, full_page=False):
+    """
+    爬取院校库单页，返回(BeautifulSoup, 院校列表)
+    full_page=True 时解析完整文档（用于读取结果总数），否则只解析院校表格
+    """
+    base_url = f"{YANGGUANG_BASE_URL}/sch/search.do"
+    params = {"searchType": 1, "start": start}
+    headers = {"User-Agent": get_random_ua()}
+    resp = get_fetcher().get(base_url, params=params, headers=headers)
+    resp.raise_for_status()
+    if full_page:
+        soup = make_soup(resp.text, backend=PARSER_BACKENDS["schools"])
+    else:
+        soup = make_soup(resp.text, "schools")
+    return soup, _parse_school_rows(soup)
+
+def _fetch_school_page_with_retry(start, full_page=False):
+    """带指数退避重试的院校库分页爬取"""
+    return retry_call(_fetch_school_page, start, full_page, description=f"第 {start//20+1} 页院校数据")
+
+def _dedupe_schools(schools):
+    """按详情页URL（无URL时按院校名称）去重，保持原有顺序"""
+    seen = set()
+    unique = []
+    for school in schools:
+        key = school["详情页"] or school["院校名称"]
+        if key in seen:
+            continue
+        seen.add(key)
+        unique.append(school)
+    return unique
+
+def crawl_schools(parallel=None, concurrency=None, resume=None):
     """
     院校库爬取：院校名称、详情页URL、所在地、主管部门、院校类型、学历层次、满意度
     分页爬取 https://gaokao.chsi.com.cn/sch/search.do?searchType=1&start=0
+    parallel=True 时先从首页读取结果总数，再并发爬取其余所有分页
+    resume=True 时跳过上次中断前已完成的分页（记录于断点文件）
     """
+    if parallel is None:
+        parallel = PARALLEL_SCHOOL_PAGES
+    if resume is None:
+        resume = RESUME_CRAWL
+    checkpoint = CheckpointStore("schools", resume=resume)
+
+    if parallel:
+        schools = _crawl_schools_parallel(checkpoint, concurrency)
+        if schools is not None:
+            return schools
+        log_info("未能读取院校总数，回退为逐页爬取")
+
     log_info("开始爬取阳光高考院校库...")
-    base_url = f"{YANGGUANG_BASE_URL}/sch/search.do"
     schools = []
     start = 0
+    completed = False
+    failed_pages = 0
+    consecutive_failures = 0
     while True:
-        params = {"searchType": 1, "start": start}
-        headers = {"User-Agent": get_random_ua()}
         try:
-            log_info(f"正在爬取第 {start//20+1} 页院校数据...")
-            resp = requests.get(base_url, params=params, headers=headers, timeout=10)
-            resp.raise_for_status()
-            soup = BeautifulSoup(resp.text, "html.parser")
-            table = soup.find("table", class_="ch-table")
-            if not table:
+            unit = f"start={start}"
+            if checkpoint.is_done(unit):
+                rows = checkpoint.get(unit)
+            else:
+                log_info(f"正在爬取第 {start//20+1} 页院校数据...")
+                _, rows = _fetch_school_page_with_retry(start)
+                get_dead_letter_queue().resolve("school_page", {"start": start})
+            if rows is None:
                 log_info(f"第 {start//20+1} 页未找到院校数据，可能已到达最后一页")
+                completed = True
                 break
-            rows = table.find_all("tr")[1:]  # 跳过表头
             if not rows:
                 log_info(f"第 {start//20+1} 页无数据，结束爬取")
+                completed = True
                 break
-            for row in rows:
-                cols = row.find_all("td")
-                if len(cols) < 7:
-                    continue
-                name_tag = cols[0].find("a")
-                school_name = name_tag.text.strip() if name_tag else ""
-                detail_url = f"https://gaokao.chsi.com.cn" + name_tag["href"] if name_tag else ""
-                location = cols[1].text.strip()
-                department = cols[2].text.strip()
-                school_type = cols[3].text.strip()
-                level = cols[4].text.strip()
-                satisfaction = cols[5].text.strip()
-                schools.append({
-                    "院校名称": school_name,
-                    "详情页": detail_url,
-                    "所在地": location,
-                    "主管部门": department,
-                    "院校类型": school_type,
-                    "学历层次": level,
-                    "满意度": satisfaction
-                })
-            start += 20
-            time.sleep(random.uniform(1, 2))
+            if not checkpoint.is_done(unit):
+                checkpoint.mark_done(unit, rows)
+            schools.extend(rows)
+            consecutive_failures = 0
         except Exception as e:
             log_error(f"爬取第 {start//20+1} 页院校数据时出错: {str(e)}")
-            break
+            get_dead_letter_queue().push("school_page", {"start": start}, e)
+            failed_pages += 1
+            consecutive_failures += 1
+            if consecutive_failures >= MAX_CONSECUTIVE_PAGE_FAILURES:
+                log_error(f"连续 {consecutive_failures} 页爬取失败，停止爬取院校库")
+                break
+        start += SCHOOL_PAGE_SIZE
+    if completed and not failed_pages:
+        checkpoint.clear()
+    schools = _dedupe_schools(schools)
     log_info(f"院校库爬取完成，共获取 {len(schools)} 所院校信息")
     return schools
 
-def crawl_majors():
+def _crawl_schools_parallel(checkpoint, concurrency=None):
+    """
+    并发分页爬取院校库
+    首页无法解析出结果总数时返回None，由调用方回退到逐页爬取
+    """
+    log_info("开始并发爬取阳光高考院校库...")
+    if checkpoint.is_done("total") and checkpoint.is_done("start=0"):
+        total = checkpoint.get("total")
+        first_rows = checkpoint.get("start=0")
+    else:
+        try:
+            first_soup, first_rows = _fetch_school_page_with_retry(0, full_page=True)
+        except Exception as e:
+            log_error(f"爬取院校库首页时出错: {str(e)}")
+            return None
+        if not first_rows:
+            log_info("院校库首页无数据")
+            return []
+        total = _parse_school_total(first_soup)
+        if total is None:
+            return None
+        checkpoint.mark_done("start=0", first_rows)
+        checkpoint.mark_done("total", total)
+
+    def crawl_page(start):
+        try:
+            _, rows = _fetch_school_page_with_retry(start)
+        except Exception as e:
+            get_dead_letter_queue().push("school_page", {"start": start}, e)
+            raise
+        get_dead_letter_queue().resolve("school_page", {"start": start})
+        checkpoint.mark_done(f"start={start}", rows or [])
+        return rows or []
+
+    offsets = list(range(SCHOOL_PAGE_SIZE, total, SCHOOL_PAGE_SIZE))
+    pending = [start for start in offsets if not checkpoint.is_done(f"start={start}")]
+    log_info(f"院校总数 {total}，共 {len(offsets) + 1} 页，待爬取 {len(pending)} 页")
+    # 所有分页都在同一主机上，单主机上限与总并发一致，否则 concurrency 会被单主机默认上限截断
+    concurrency = concurrency or SCHOOL_PAGE_CONCURRENCY
+    host = urlparse(YANGGUANG_BASE_URL).netloc
+    tasks = [(host, crawl_page, (start,)) for start in pending]
+    run_concurrent(tasks, concurrency, concurrency)
+
+    schools = list(first_rows)
+    failed = 0
+    for start in offsets:
+        rows = checkpoint.get(f"start={start}")
+        if rows is None:
+            log_error(f"第 {start//20+1} 页院校数据爬取失败")
+            failed += 1
+            continue
+        schools.extend(rows)
+
+    if not failed:
+        checkpoint.clear()
+    schools = _dedupe_schools(schools)
+    log_info(f"院校库并发爬取完成，共获取 {len(schools)} 所院校信息")
+    return schools
+
+def crawl_school_details(schools, concurrency=None, resume=None):
+    """
+    院校详情页爬取：并发访问院校记录中的详情页URL，把详情字段合并进院校记录
+    - 已抓取的URL记录在持久化的SeenSet中，跨分页重复的URL与此前运行已抓取过的URL都不会再次请求
+    - 每抓取一个详情页立即把解析结果追加写入 SCHOOL_DETAILS_PATH，后续运行从中读取已抓取院校的详情
+    - resume=False 时清空已抓取记录，全部重新抓取
+    返回合并了详情字段的院校记录（新列表）
+    """
+    if resume is None:
+        resume = RESUME_CRAWL
+    concurrency = concurrency or SCHOOL_DETAIL_CONCURRENCY
+    seen = SeenSet(SCHOOL_DETAIL_SEEN_PATH)
+    if not resume:
+        seen.clear()
+        if os.path.exists(SCHOOL_DETAILS_PATH):
+            os.remove(SCHOOL_DETAILS_PATH)
+    details = {record["url"]: record["detail"] for record in read_jsonl(SCHOOL_DETAILS_PATH)}
+    write_lock = threading.Lock()
+
+    def crawl_unit(url):
+        try:
+            detail = retry_call(_fetch_school_detail, url, description=f"院校详情页 {url}")
+        except Exception as e:
+            get_dead_letter_queue().push("school_detail", {"url": url}, e)
+            raise
+        get_dead_letter_queue().resolve("school_detail", {"url": url})
+        _record_school_detail(url, detail, seen, write_lock)
+        details[url] = detail
+        return detail
+
+    urls = list(dict.fromkeys(school["详情页"] for school in schools if school.get("详情页")))
+    pending = [url for url in urls if url not in seen]
+    log_info(f"开始并发爬取院校详情页，共 {len(urls)} 个URL，已抓取过 {len(urls) - len(pending)} 个，"
+             f"待爬取 {len(pending)} 个")
+    host = urlparse(YANGGUANG_BASE_URL).netloc
+    run_concurrent([(host, crawl_unit, (url,)) for url in pending], concurrency, concurrency)
+
+    enriched = [dict(school, **details.get(school.get("详情页"), {})) for school in schools]
+    missing = sum(1 for url in urls if url not in details)
+    log_info(f"院校详情页爬取完成，{len(urls) - missing} 所院校已合并详情，缺失 {missing} 所")
+    return enriched
+
+def _fetch_school_detail(url):
+    """爬取并解析单个院校详情页，请求失败时抛出异常"""
+    headers = {"User-Agent": get_random_ua()}
+    resp = get_fetcher().get(url, headers=headers)
+    resp.raise_for_status()
+    return SCHOOL_DETAIL_SPEC.extract(make_soup(resp.text, "school_detail"))
+
+def _record_school_detail(url, detail, seen, lock):
+    """先落盘详情再标记URL已抓取（两步之间中断时只会导致重新抓取）"""
+    with lock:
+        append_jsonl(SCHOOL_DETAILS_PATH, {"url": url, "detail": detail})
+    seen.add(url)
+
+def crawl_majors(details=None, concurrency=None):
     """
     专业库爬取：专业名称/代码/类别/简介/就业方向
-    遍历专业分类页 https://gaokao.chsi.com.cn/zyk/
+    并发爬取各专业分类页 https://gaokao.chsi.com.cn/zyk/?zyfx={分类代码}
+    details=True 时再并发爬取每个专业的详情页，用完整的简介与就业方向替换列表页摘要
+    （同一专业代码只请求一次详情页）
     """
+    if details is None:
+        details = MAJOR_DETAILS
+    concurrency = concurrency or MAJOR_CONCURRENCY
     log_info("开始爬取阳光高考专业库...")
-    url = f"{YANGGUANG_BASE_URL}/zyk/"
-    majors = []
-    
-    # 专业分类代码
-    categories = {
-        "gx": "工学",
-        "ls": "理学", 
-        "wy": "文学",
-        "kj": "经济学",
-        "yy": "医学",
-        "qt": "其他"
-    }
-    
-    try:
-        for category_code, category_name in categories.items():
-            log_info(f"正在爬取 {category_name} 类专业...")
-            category_url = f"{url}?zyfx={category_code}"
-            headers = {"User-Agent": get_random_ua()}
-            
-            resp = requests.get(category_url, headers=headers, timeout=10)
-            resp.raise_for_status()
-            
-            soup = BeautifulSoup(resp.text, "html.parser")
-            major_items = soup.select(".major-info-item")
-            
-            for item in major_items:
-                try:
-                    major = {
-                        "name": item.select_one(".major-name").text.strip() if item.select_one(".major-name") else "",
-                        "code": item.get("id", ""),
-                        "category": category_name,
-                        "intro": item.select_one(".major-desc").text.strip() if item.select_one(".major-desc") else "",
-                        "career": item.select_one(".major-career").text.strip() if item.select_one(".major-career") else ""
-                    }
-                    majors.append(major)
-                except Exception as e:
-                    log_error(f"解析专业数据时出错: {str(e)}")
-                    continue
-            
-            time.sleep(random.randint(3, 5))
-            
-        log_info(f"专业库爬取完成，共获取 {len(majors)} 个专业信息")
-        return majors
-        
-    except Exception as e:
-        log_error(f"爬取专业库时发生错误: {str(e)}")
+
+    host = urlparse(YANGGUANG_BASE_URL).netloc
+    tasks = [(host, _fetch_major_category, (category_code, category_name))
+             for category_code, category_name in MAJOR_CATEGORIES.items()]
+    results = run_concurrent(tasks, concurrency, concurrency)
+    if all(rows is None for rows in results):
+        log_error("爬取专业库时发生错误: 所有专业分类页均爬取失败")
         return []
 
+    majors = []
+    detail_urls = []
+    for rows in results:
+        if rows is not None:
+            majors.extend(major for major, _ in rows)
+            detail_urls.extend(url for _, url in rows)
+    if details:
+        _fill_major_details(majors, detail_urls, concurrency)
+
+    log_info(f"专业库爬取完成，共获取 {len(majors)} 个专业信息")
+    return majors
+
+def _fetch_major_category(category_code, category_name):
+    """爬取单个专业分类页，返回 [(专业信息, 详情页URL)]，请求失败时抛出异常"""
+    log_info(f"正在爬取 {category_name} 类专业...")
+    category_url = f"{YANGGUANG_BASE_URL}/zyk/?zyfx={category_code}"
+    headers = {"User-Agent": get_random_ua()}
+
+    resp = get_fetcher().get(category_url, headers=headers)
+    resp.raise_for_status()
+
+    soup = make_soup(resp.text, "majors")
+    rows = []
+    for item in soup.select(".major-info-item"):
+        try:
+            major = MAJOR_SPEC.extract(item, {"category": category_name})
+        except Exception as e:
+            log_error(f"解析专业数据时出错: {str(e)}")
+            continue
+        rows.append((major, MAJOR_LINK_SPEC.extract(item)["detail_url"]))
+    return rows
+
+def _fetch_major_detail(url):
+    """爬取专业详情页，返回 {"intro", "career"}"""
+    headers = {"User-Agent": get_random_ua()}
+    resp = get_fetcher().get(url, headers=headers)
+    resp.raise_for_status()
+    return MAJOR_DETAIL_SPEC.extract(make_soup(resp.text, "major_detail"))
+
+def _fill_major_details(majors, detail_urls, concurrency):
+    """
+    并发爬取专业详情页并就地更新专业记录
+    按专业代码去重（无代码时按详情页URL），详情页爬取失败或字段为空时保留列表页内容
+    """
+    unique = {}
+    for major, url in zip(majors, detail_urls):
+        if url:
+            unique.setdefault(major["code"] or url, url)
+    keys = list(unique)
+    log_info(f"开始并发爬取专业详情页，共 {len(keys)} 个专业")
+    host = urlparse(YANGGUANG_BASE_URL).netloc
+    results = run_concurrent([(host, _fetch_major_detail, (unique[key],)) for key in keys], concurrency, concurrency)
+    detail_by_key = dict(zip(keys, results))
+
+    for major, url in zip(majors, detail_urls):
+        detail = detail_by_key.get(major["code"] or url) if url else None
+        if not detail:
+            continue
+        for key, value in detail.items():
+            if value:
+                major[key] = value
+    failed = sum(1 for detail in results if detail is None)
+    log_info(f"专业详情页爬取完成，失败 {failed} 个")
+
 def crawl_scores(year, province):
     """
     历年分数线：院校/专业/分数/位次/招生计划
     动态构建查询URL：https://gaokao.chsi.com.cn/lqfs/search.do?&year={year}&ssdm={province_code}
     处理AJAX请求（可能需要Selenium模拟点击）
     """
-    log_info(f"开始爬取 {year} 年 {province} 的历年分数线...")
-    
     try:
-        # 省份代码映射（需要根据实际情况调整）
-        province_codes = {
-            "北京": "11", "上海": "31", "广东": "44", "浙江": "33",
-            "江苏": "32", "山东": "37", "河南": "41", "四川": "51",
-            "湖北": "42", "湖南": "43"
-        }
-        
-        province_code = province_codes.get(province, province)
-        url = f"{YANGGUANG_BASE_URL}/lqfs/search.do"
-        params = {
-            "year": year,
-            "ssdm": province_code
-        }
-        headers = {"User-Agent": get_random_ua()}
-        
-        resp = requests.get(url, params=params, headers=headers, timeout=10)
-        resp.raise_for_status()
-        
-        # 解析分数线数据
-        scores = []
-        soup = BeautifulSoup(resp.text, "html.parser")
-        
-        # 根据实际页面结构解析数据
-        score_items = soup.select(".score-item")  # 需要根据实际CSS选择器调整
-        
-        for item in score_items:
-            try:
-                score_data = {
-                    "school": item.select_one(".school-name").text.strip() if item.select_one(".school-name") else "",
-                    "major": item.select_one(".major-name").text.strip() if item.select_one(".major-name") else "",
-                    "min_score": item.select_one(".min-score").text.strip() if item.select_one(".min-score") else "",
-                    "min_rank": item.select_one(".min-rank").text.strip() if item.select_one(".min-rank") else "",
-                    "plan_count": item.select_one(".plan-count").text.strip() if item.select_one(".plan-count") else "",
-                    "year": year,
-                    "province": province
-                }
-                scores.append(score_data)
-            except Exception as e:
-                log_error(f"解析分数线数据时出错: {str(e)}")
-                continue
-        
-        log_info(f"{year}年{province}分数线爬取完成，共获取 {len(scores)} 条记录")
-        return scores
-        
+        scores = _fetch_scores_with_retry(year, province)
     except Exception as e:
         log_error(f"{province}-{year} 分数线爬取失败: {str(e)}")
+        get_dead_letter_queue().push("scores", {"year": year, "province": province}, e)
         return []
+    get_dead_letter_queue().resolve("scores", {"year": year, "province": province})
+    return scores
+
+def _fetch_scores_with_retry(year, province):
+    """带指数退避重试的单个年份/省份分数线爬取"""
+    return retry_call(_fetch_scores, year, province, description=f"{year}年{province}分数线")
+
+def _fetch_scores(year, province):
+    """爬取单个年份/省份的分数线，请求失败时抛出异常"""
+    log_info(f"开始爬取 {year} 年 {province} 的历年分数线...")
+
+    province_code = PROVINCE_CODES.get(province, province)
+    url = f"{YANGGUANG_BASE_URL}/lqfs/search.do"
+    params = {
+        "year": year,
+        "ssdm": province_code
+    }
+    headers = {"User-Agent": get_random_ua()}
+
+    resp = get_fetcher().get(url, params=params, headers=headers)
+    resp.raise_for_status()
+
+    scores = _parse_scores_html(resp.text, year, province)
+
+    log_info(f"{year}年{province}分数线爬取完成，共获取 {len(scores)} 条记录")
+    return scores
+
+def _parse_scores_html(html, year, province):
+    """解析分数线页面"""
+    soup = make_soup(html, "scores")
+
+    # 根据实际页面结构解析数据
+    score_items = soup.select(".score-item")  # 需要根据实际CSS选择器调整
+
+    return SCORE_SPEC.extract_all(score_items, {"year": year, "province": province})
+
+def crawl_scores_grid(years, provinces, concurrency=None, per_host=None, resume=None):
+    """
+    并发爬取 年份×省份 全部分数线
+    一次性调度所有 (year, province) 任务，受全局与单主机并发上限约束
+    返回结果与逐个调用 crawl_scores 的顺序一致
+    resume=True 时跳过断点文件中已完成的 (year, province) 任务
+    """
+    if resume is None:
+        resume = RESUME_CRAWL
+    checkpoint = CheckpointStore("scores", resume=resume)
+
+    def crawl_unit(year, province):
+        try:
+            scores = _fetch_scores_with_retry(year, province)
+        except Exception as e:
+            get_dead_letter_queue().push("scores", {"year": year, "province": province}, e)
+            raise
+        get_dead_letter_queue().resolve("scores", {"year": year, "province": province})
+        checkpoint.mark_done(f"{year}|{province}", scores)
+        return scores
+
+    host = urlparse(YANGGUANG_BASE_URL).netloc
+    units = [(year, province) for year in years for province in provinces]
+    tasks = [(host, crawl_unit, unit) for unit in units if not checkpoint.is_done(f"{unit[0]}|{unit[1]}")]
+    log_info(f"开始并发爬取分数线，共 {len(units)} 个年份/省份任务，待爬取 {len(tasks)} 个")
+    run_concurrent(tasks, concurrency, per_host)
+
+    scores = []
+    failed = 0
+    for year, province in units:
+        result = checkpoint.get(f"{year}|{province}")
+        if result is None:
+            failed += 1
+            continue
+        scores.extend(result)
+
+    if not failed:
+        checkpoint.clear()
+
+    log_info(f"分数线并发爬取完成，共获取 {len(scores)} 条记录")
+    return scores
 
 def crawl_admission_rules(school_id):
     """
@@ -187,43 +523,162 @@ def crawl_admission_rules(school_id):
     处理PDF文本（pdfminer / PyPDF2）
     """
     log_info(f"开始爬取院校ID {school_id} 的招生章程...")
-    
+
     try:
-        url = f"{YANGGUANG_BASE_URL}/zsgs/zhangcheng/list.do"
-        params = {"schoolid": school_id}
-        headers = {"User-Agent": get_random_ua()}
-        
-        resp = requests.get(url, params=params, headers=headers, timeout=10)
-        resp.raise_for_status()
-        
-        # 检查是否为PDF内容
-        if resp.text.startswith("<PDF>"):
-            pdf_url = resp.text.split(">")[1].split("<")[0]
-            pdf_path = download_pdf(pdf_url)
-            rules = pdf_to_text(pdf_path)
-        else:
-            rules = parse_html_rules(resp.text)
-        
+        rules = retry_call(_fetch_admission_rules, school_id, description=f"院校ID {school_id} 招生章程")
+        get_dead_letter_queue().resolve("admission_rules", {"school_id": school_id})
         log_info(f"院校ID {school_id} 招生章程爬取完成")
         return rules
-        
+
     except Exception as e:
         log_error(f"爬取院校ID {school_id} 招生章程时出错: {str(e)}")
+        get_dead_letter_queue().push("admission_rules", {"school_id": school_id}, e)
         return {}
 
+def _fetch_admission_rules(school_id):
+    """爬取单个院校的招生章程，请求失败时抛出异常"""
+    kind, value = _fetch_admission_source(school_id)
+    return pdf_to_text(value) if kind == "pdf" else value
+
+def _fetch_admission_source(school_id):
+    """
+    爬取单个院校的招生章程页面，请求失败时抛出异常
+    PDF章程返回 ("pdf", 本地文件路径)，HTML章程返回 ("html", 规则字典)
+    """
+    url = f"{YANGGUANG_BASE_URL}/zsgs/zhangcheng/list.do"
+    params = {"schoolid": school_id}
+    headers = {"User-Agent": get_random_ua()}
+
+    resp = get_fetcher().get(url, params=params, headers=headers)
+    resp.raise_for_status()
+
+    # 检查是否为PDF内容
+    if resp.text.startswith("<PDF>"):
+        pdf_url = resp.text.split(">")[1].split("<")[0]
+        pdf_path = download_pdf(pdf_url)
+        if pdf_path is None:
+            raise RuntimeError(f"招生章程PDF下载失败: {pdf_url}")
+        return "pdf", pdf_path
+    return "html", parse_html_rules(resp.text)
+
+def crawl_admission_rules_batch(school_ids, workers=None):
+    """
+    批量爬取招生章程
+    先逐个获取章程页面并下载PDF，再把PDF交给进程池并行提取（已提取过的PDF命中提取缓存）
+    返回 [{"school_id": ..., "rules": ...}]，规则为空的院校不包含在内
+    """
+    log_info(f"开始批量爬取 {len(school_ids)} 所院校的招生章程...")
+    sources = {}
+    for school_id in school_ids:
+        try:
+            sources[school_id] = retry_call(_fetch_admission_source, school_id,
+                                            description=f"院校ID {school_id} 招生章程")
+            get_dead_letter_queue().resolve("admission_rules", {"school_id": school_id})
+        except Exception as e:
+            log_error(f"爬取院校ID {school_id} 招生章程时出错: {str(e)}")
+            get_dead_letter_queue().push("admission_rules", {"school_id": school_id}, e)
+
+    extracted = batch_pdf_to_text([value for kind, value in sources.values() if kind == "pdf"], workers)
+
+    results = []
+    for school_id in school_ids:
+        if school_id not in sources:
+            continue
+        kind, value = sources[school_id]
+        if kind == "pdf":
+            rules = extracted.get(value, {})
+        else:
+            rules = value
+        if rules:
+            results.append({"school_id": school_id, "rules": rules})
+
+    log_info(f"招生章程批量爬取完成，共获取 {len(results)} 所院校的章程规则")
+    return results
+
+def school_ids_from_schools(schools):
+    """从院校库记录的详情页URL中解析院校ID，按出现顺序去重"""
+    school_ids = []
+    for school in schools:
+        match = SCHOOL_ID_PATTERN.search(school.get("详情页") or "")
+        if match:
+            school_ids.append(int(match.group(1)))
+    return list(dict.fromkeys(school_ids))
+
+def crawl_admission_rules_concurrent(school_ids, output_path=None, workers=None, resume=None):
+    """
+    并发爬取全部院校的招生章程
+    - 最多 workers 所院校同时获取章程页面/下载PDF（线程只做网络请求）；HTML章程的规则立即追加写入 output_path（JSONL）
+    - 下载到的PDF统一交给 batch_pdf_to_text 多进程提取，提取完成后再追加写入
+    - 进度记录在断点文件 admission_rules 中：resume=True 时跳过已完成的院校，全部成功后清除断点，
+      下次运行重新爬取全部院校（章程可能更新）；output_path 只作为输出，新一轮爬取开始时重写
+    - 失败的院校（含PDF提取超时或出错的院校）写入死信队列，不写入输出文件（下次续爬时重新爬取）
+    返回 [{"school_id": ..., "rules": ...}]（按school_ids顺序，含此前已完成的结果），规则为空的院校不包含在内
+    """
+    if resume is None:
+        resume = RESUME_CRAWL
+    output_path = output_path or ADMISSION_RULES_STREAM_PATH
+    workers = workers or ADMISSION_RULES_WORKERS
+    checkpoint = CheckpointStore("admission_rules", resume=resume)
+    if not len(checkpoint) and os.path.exists(output_path):
+        os.remove(output_path)
+    write_lock = threading.Lock()
+
+    def record(school_id, rules):
+        with write_lock:
+            append_jsonl(output_path, {"school_id": school_id, "rules": rules})
+            checkpoint.mark_done(school_id, rules)
+
+    pdf_sources = {}
+
+    def crawl_unit(school_id):
+        try:
+            kind, value = retry_call(_fetch_admission_source, school_id, description=f"院校ID {school_id} 招生章程")
+        except Exception as e:
+            get_dead_letter_queue().push("admission_rules", {"school_id": school_id}, e)
+            raise
+        if kind == "pdf":
+            pdf_sources[school_id] = value  # 提取成功后才移出死信队列
+        else:
+            get_dead_letter_queue().resolve("admission_rules", {"school_id": school_id})
+            record(school_id, value)
+
+    host = urlparse(YANGGUANG_BASE_URL).netloc
+    tasks = [(host, crawl_unit, (school_id,)) for school_id in school_ids if not checkpoint.is_done(school_id)]
+    log_info(f"开始并发爬取招生章程，共 {len(school_ids)} 所院校，待爬取 {len(tasks)} 所（{workers} 个并发）")
+    run_concurrent(tasks, workers, workers)
+
+    # PDF提取是CPU密集型任务，交给进程池
+    extracted = batch_pdf_to_text(list(pdf_sources.values()))
+    for school_id, pdf_path in pdf_sources.items():
+        rules = extracted.get(pdf_path, {})
+        if not rules:
+            # 提取超时或出错（结果为{}）：不标记完成，写入死信队列，下次续爬时重新爬取
+            get_dead_letter_queue().push("admission_rules", {"school_id": school_id},
+                                         f"PDF提取超时或出错: {pdf_path}")
+            continue
+        get_dead_letter_queue().resolve("admission_rules", {"school_id": school_id})
+        record(school_id, rules)
+
+    results = [{"school_id": school_id, "rules": checkpoint.get(school_id)}
+               for school_id in school_ids if checkpoint.get(school_id)]
+    failed = sum(1 for school_id in school_ids if not checkpoint.is_done(school_id))
+    if not failed:
+        checkpoint.clear()
+    log_info(f"招生章程并发爬取完成，共获取 {len(results)} 所院校的章程规则，失败 {failed} 所")
+    return results
+
 def download_pdf(url):
-    """下载PDF文件"""
+    """
+    流式下载PDF文件，按内容SHA-256命名（downloads/{hash}.pdf）
+    已下载过的URL或内容相同的文件不会重复保存；下载时算出的哈希登记到PDF提取缓存，提取时不再重新计算
+    """
     try:
         headers = {"User-Agent": get_random_ua()}
-        resp = requests.get(url, headers=headers, timeout=30)
-        resp.raise_for_status()
-        
-        # 保存PDF文件
-        filename = f"downloads/admission_rules_{int(time.time())}.pdf"
-        with open(filename, 'wb') as f:
-            f.write(resp.content)
-        
-        return filename
+        path, digest, _ = get_content_store().download(get_fetcher(), url, suffix=".pdf", headers=headers)
+        cache = get_pdf_text_cache(EXTRACTOR_VERSION)
+        if cache:
+            cache.remember_hash(path, digest)
+        return path
     except Exception as e:
         log_error(f"下载PDF文件失败: {str(e)}")
         return None
@@ -231,7 +686,7 @@ def download_pdf(url):
 def parse_html_rules(html_content):
     """解析HTML格式的招生章程"""
     try:
-        soup = BeautifulSoup(html_content, "html.parser")
+        soup = make_soup(html_content, "rules")
         rules = {
             "body_check": "",
             "subject_scores": "",
@@ -244,4 +699,61 @@ def parse_html_rules(html_content):
         return rules
     except Exception as e:
         log_error(f"解析HTML招生章程时出错: {str(e)}")
-        return {} 
\ No newline at end of file
+        return {}
+
+def _replay_school_page(payload):
+    """重放院校库分页：结果写入断点记录，下次续爬时直接使用"""
+    _, rows = _fetch_school_page(payload["start"])
+    if rows:
+        CheckpointStore("schools").mark_done(f"start={payload['start']}", rows)
+
+def _replay_school_detail(payload):
+    """重放院校详情页：结果写入详情文件并标记已抓取，下次运行时直接合并"""
+    detail = _fetch_school_detail(payload["url"])
+    _record_school_detail(payload["url"], detail, SeenSet(SCHOOL_DETAIL_SEEN_PATH), threading.Lock())
+
+def _replay_scores(payload):
+    """重放年份/省份分数线：结果写入断点记录，下次续爬时直接使用"""
+    scores = _fetch_scores(payload["year"], payload["province"])
+    CheckpointStore("scores").mark_done(f"{payload['year']}|{payload['province']}", scores)
+
+# 死信队列重放处理函数（招生章程的重放结果由main写回原始数据）
+REPLAY_HANDLERS = {
+    "school_page": _replay_school_page,
+    "school_detail": _replay_school_detail,
+    "scores": _replay_scores,
+    "admission_rules": lambda payload: _fetch_admission_rules(payload["school_id"]),
+}
+
+def _reparse_school_page(url, html):
+    return _parse_school_rows(make_soup(html, "schools")) or []
+
+def _reparse_scores(url, html):
+    query = parse_qs(urlparse(url).query)
+    code = query["ssdm"][0]
+    province = next((name for name, province_code in PROVINCE_CODES.items() if province_code == code), code)
+    return _parse_scores_html(html, int(query["year"][0]), province)
+
+def _reparse_major_category(url, html):
+    category_code = parse_qs(urlparse(url).query)["zyfx"][0]
+    soup = make_soup(html, "majors")
+    return MAJOR_SPEC.extract_all(soup.select(".major-info-item"),
+                                  {"category": MAJOR_CATEGORIES.get(category_code, category_code)})
+
+# 离线重新解析归档页面时使用的解析函数：(URL正则, 页面类型, parse(url, html))
+ARCHIVE_PARSERS = [
+    (r"/sch/search\.do\?", "schools", _reparse_school_page),
+    (r"/lqfs/search\.do\?", "scores", _reparse_scores),
+    (r"/zyk/\?zyfx=", "majors", _reparse_major_category),
+]
+
+def reparse_archived_pages(directory=None, workers=None, since=None):
+    """
+    用当前的解析规则离线重新解析归档的院校库/分数线/专业库页面（不访问网络）
+    返回 {"schools": [...], "scores": [...], "majors": [...]}，院校按详情页URL去重
+    """
+    results = reparse_archive(ARCHIVE_PARSERS, directory, workers, since)
+    results["schools"] = _dedupe_schools(results.get("schools", []))
+    results.setdefault("scores", [])
+    results.setdefault("majors", [])
+    return results
@@ -1,35 +1,102 @@
 # data_processing/cleaner.py
+import numpy as np
 import pandas as pd
 import re
 from utils.log import log_info, log_error, log_missing_data
+from data_processing.name_normalizer import get_name_cache, normalize_column, is_normalized, mark_normalized
+from data_processing.numeric_parser import parse_numeric_strings, status_labels, STATUS_LABELS
+from config import NUMERIC_FIELDS, NA_PLACEHOLDER
+
+# 取值重复度高的文本列，在清洗流程中以共享字典的分类类型保存
+CATEGORICAL_COLUMNS = ["school", "major", "province", "data_source"]
+
+def to_shared_categoricals(frames, columns=None):
+    """
+    把多个DataFrame中的院校/专业/省份/数据源列转换为分类类型，同名列共享同一份分类字典
+    （各表取值的并集），concat后仍为分类类型，不会退化为逐行保存字符串的object列
+    就地修改并返回传入的DataFrame列表（None原样保留）
+    """
+    columns = columns or CATEGORICAL_COLUMNS
+    frames = list(frames)
+    for col in columns:
+        present = [df for df in frames if df is not None and col in df.columns]
+        if not present:
+            continue
+        values = []
+        for df in present:
+            series = df[col]
+            values.append(series.cat.categories if isinstance(series.dtype, pd.CategoricalDtype)
+                          else series.dropna().unique())
+        categories = pd.unique(np.concatenate([np.asarray(value, dtype=object) for value in values]))
+        dtype = pd.CategoricalDtype(categories)
+        for df in present:
+            df[col] = df[col].astype(dtype)
+    return frames
+
+def decode_categoricals(df):
+    """输出前把分类列还原为普通字符串列"""
+    columns = [col for col in df.columns if isinstance(df[col].dtype, pd.CategoricalDtype)]
+    if not columns:
+        return df
+    return df.astype({col: object for col in columns})
+
+# 数值列的解析状态（typed 模式下写入 {列名}_status 列），取值见 numeric_parser.STATUS_LABELS
+NUMERIC_STATUS = pd.CategoricalDtype(STATUS_LABELS)
+
+def parse_numeric_column(series, dtype="Int32"):
+    """
+    把爬取到的数值字符串列解析为可空整数类型
+    返回 (数值Series, 解析状态Series)，无法解析的值为缺失，并在状态列中区分 missing/invalid
+    """
+    values, status = parse_numeric_strings(series, dtype)
+    return values, status_labels(status)
+
+def fill_na_for_output(df, na_rep=NA_PLACEHOLDER):
+    """输出前把缺失值填充为占位符（分类列同时还原为普通字符串）"""
+    df = decode_categoricals(df)
+    return df.astype(object).where(df.notna(), na_rep)
+
+def _replace_values(series, mapping):
+    """
+    按映射替换取值；分类列只替换分类字典，不逐行处理
+    新字典由原字典逐项映射得到，共享同一字典的各表替换后仍共享同一字典
+    """
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        categories = series.cat.categories
+        renamed = pd.Index([mapping.get(value, value) for value in categories], dtype=object)
+        if renamed.is_unique:
+            return series.cat.rename_categories(renamed)
+        # 多个取值映射为同一取值（如"北京市"与"北京"同时存在）：按合并后的字典重新编码
+        dtype = pd.CategoricalDtype(renamed.unique())
+        recode = np.append(dtype.categories.get_indexer(renamed), -1)
+        codes = recode[series.cat.codes.to_numpy()]  # 缺失值的编码-1取到末尾的-1
+        return pd.Series(pd.Categorical.from_codes(codes, dtype=dtype), index=series.index, name=series.name)
+    return series.replace(mapping)
 
 def standardize_names(data, field):
     """
     统一院校/专业名称（去除括号备注/缩写）
     例：北京大学(医学部) → 北京大学
+    DataFrame只对列中的不同取值做标准化并映射回各行，结果在持久化缓存中跨运行复用；
+    已标准化的列记录在 df.attrs 中，重复调用时直接跳过
     """
     log_info(f"开始标准化字段: {field}")
     
     try:
         if isinstance(data, pd.DataFrame):
-            # 去除括号内容
-            data[field] = data[field].astype(str).str.replace(r"\([^)]*\)", "", regex=True)
-            # 去除多余空格
-            data[field] = data[field].str.strip()
-            # 统一常见缩写
-            name_mapping = {
-                "北大": "北京大学",
-                "清华": "清华大学",
-                "复旦": "复旦大学",
-                "上交": "上海交通大学",
-                "浙大": "浙江大学",
-                "南大": "南京大学",
-                "中大": "中山大学",
-                "华科": "华中科技大学",
-                "武大": "武汉大学",
-                "川大": "四川大学"
-            }
-            data[field] = data[field].replace(name_mapping)
+            if is_normalized(data, field):
+                log_info(f"字段 {field} 已标准化，跳过")
+                return data
+            cache = get_name_cache()
+            if isinstance(data[field].dtype, pd.CategoricalDtype):
+                # 分类列标准化分类字典本身，保持与其他表共享的字典
+                categories = list(data[field].cat.categories)
+                mapping = dict(zip(categories, cache.normalize([str(value) for value in categories])))
+                data[field] = _replace_values(data[field], mapping)
+            else:
+                data[field] = normalize_column(data[field], cache)
+            cache.save()
+            mark_normalized(data, field)
             
         elif isinstance(data, list):
             for item in data:
@@ -48,12 +115,32 @@ def handle_missing_values(df, strategy="mark_na"):
     缺失值处理：
     - 连续缺失：线性插值
     - 单点缺失：标记N/A并记录来源
+    - typed：NUMERIC_FIELDS 中的数值列解析为可空整数，缺失来源记录在 {列名}_status 列，
+      不填充任何占位符（"N/A"只在写出文件时填充）
     """
     log_info(f"开始处理缺失值，策略: {strategy}")
     
     try:
-        if strategy == "mark_na":
-            # 标记缺失值
+        if strategy == "typed":
+            for col, dtype in NUMERIC_FIELDS.items():
+                if col in df.columns:
+                    df[col], df[f"{col}_status"] = parse_numeric_column(df[col], dtype)
+                    invalid_count = (df[f"{col}_status"] == "invalid").sum()
+                    if invalid_count > 0:
+                        log_missing_data(f"列 {col} 有 {invalid_count} 个无法解析的数值")
+            missing_count = df.isnull().sum().sum()
+            if missing_count > 0:
+                log_missing_data(f"共有 {missing_count} 个缺失值（保留为缺失，输出时标记）")
+                
+        elif strategy == "mark_na":
+            # 标记缺失值（可空整数等扩展类型无法直接填入字符串，先转为object；
+            # 分类列一律加入"N/A"分类，不论本表有无缺失，各表的分类字典保持一致）
+            df = df.astype({col: object for col in df.columns
+                            if isinstance(df[col].dtype, pd.api.extensions.ExtensionDtype)
+                            and pd.api.types.is_numeric_dtype(df[col])})
+            for col in df.columns:
+                if isinstance(df[col].dtype, pd.CategoricalDtype) and "N/A" not in df[col].cat.categories:
+                    df[col] = df[col].cat.add_categories("N/A")
             df = df.fillna("N/A")
             missing_count = df.isnull().sum().sum()
             if missing_count > 0:
@@ -114,6 +201,10 @@ def merge_datasets(yangguang_df, provincial_df, third_party_df=None):
         if third_party_df is not None:
             third_party_df['data_source'] = '第三方数据'
         
+        # 文本列统一为共享字典的分类类型（清洗流程中已转换的列只补上各表差异与数据源列），
+        # 合并、去重与后续统计都基于分类编码
+        to_shared_categoricals([yangguang_df, provincial_df, third_party_df])
+        
         # 合并数据集
         merged_df = pd.concat([yangguang_df, provincial_df], ignore_index=True)
         if third_party_df is not None:
@@ -160,13 +251,16 @@ def validate_data(df):
             if missing_count > 0:
                 validation_results["missing_values"][col] = missing_count
         
-        # 验证分数范围
+        # 验证分数范围（"N/A"等占位符按缺失处理，可空整数列直接比较）
         if "min_score" in df.columns:
-            invalid_scores = df[
-                (df["min_score"] != "N/A") & 
-                ((df["min_score"] < 0) | (df["min_score"] > 750))
-            ]
-            validation_results["invalid_scores"] = len(invalid_scores)
+            scores, _ = parse_numeric_strings(df["min_score"].replace(NA_PLACEHOLDER, None), "Int32")
+            validation_results["invalid_scores"] = int(((scores < 0) | (scores > 750)).fillna(False).sum())
+        
+        # 无法解析的数值（typed 模式的解析状态列）
+        for col in NUMERIC_FIELDS:
+            if f"{col}_status" in df.columns:
+                validation_results.setdefault("unparsed_values", {})[col] = int(
+                    (df[f"{col}_status"] == "invalid").sum())
         
         # 验证年份范围
         if "year" in df.columns:
@@ -207,7 +301,7 @@ def clean_province_names(df):
     
     try:
         if "province" in df.columns:
-            df["province"] = df["province"].replace(province_mapping)
+            df["province"] = _replace_values(df["province"], province_mapping)
         log_info("省份名称清理完成")
         return df
     except Exception as e:
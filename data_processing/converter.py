@@ -1,12 +1,23 @@
 # data_processing/converter.py
 import json
 import csv
+import re
+from bisect import bisect_right
+from itertools import repeat
 import pandas as pd
 from pdfplumber import open as load_pdf
 from utils.log import log_info, log_error
 from utils.io_tools import ensure_dir
+from data_processing.text_cache import get_pdf_text_cache
+from data_processing.cleaner import decode_categoricals, fill_na_for_output
+from data_processing.numeric_parser import parse_numeric_strings
+from config import NA_PLACEHOLDER, STANDARD_CHUNK_SIZE
 # from pdfminer.high_level import extract_text
 
+# PDF提取逻辑版本：修改 extract_pdf_text / extract_rules / RULE_CATEGORIES 后递增，
+# 旧版本的提取缓存会在下次使用时全部失效
+EXTRACTOR_VERSION = 1
+
 def pdf_to_text(pdf_path):
     """
     招生章程PDF → 结构化文本
@@ -15,45 +26,15 @@ def pdf_to_text(pdf_path):
     log_info(f"转换PDF文件: {pdf_path}")
     
     try:
-        rules = {
-            "body_check": "",
-            "subject_scores": "",
-            "bonus_policies": "",
-            "admission_rules": "",
-            "special_requirements": ""
-        }
-        
-        with load_pdf(pdf_path) as pdf:
-            full_text = ""
-            for page in pdf.pages:
-                text = page.extract_text()
-                if text:
-                    full_text += text + "\n"
-            
-            # 提取关键信息（使用关键词匹配）
-            if "体检" in full_text or "身体" in full_text:
-                # 提取体检要求
-                body_section = extract_section(full_text, ["体检", "身体", "健康"])
-                rules["body_check"] = body_section
-            
-            if "单科" in full_text or "科目" in full_text:
-                # 提取单科成绩要求
-                subject_section = extract_section(full_text, ["单科", "科目", "数学", "英语"])
-                rules["subject_scores"] = subject_section
-            
-            if "加分" in full_text or "政策" in full_text:
-                # 提取加分政策
-                bonus_section = extract_section(full_text, ["加分", "政策", "优惠"])
-                rules["bonus_policies"] = bonus_section
-            
-            # 提取录取规则
-            admission_section = extract_section(full_text, ["录取", "招生", "投档"])
-            rules["admission_rules"] = admission_section
-            
-            # 提取特殊要求
-            special_section = extract_section(full_text, ["特殊", "要求", "限制"])
-            rules["special_requirements"] = special_section
-        
+        cache = get_pdf_text_cache(EXTRACTOR_VERSION)
+        cached = cache.get(pdf_path) if cache else None
+        if cached is not None:
+            log_info(f"PDF提取结果命中缓存: {pdf_path}")
+            return cached["rules"]
+        full_text = extract_pdf_text(pdf_path)
+        rules = extract_rules(full_text)
+        if cache:
+            cache.put(pdf_path, full_text, rules)
         log_info(f"PDF转换完成，提取了 {len([v for v in rules.values() if v])} 个关键信息段")
         return rules
         
@@ -61,37 +42,122 @@ def pdf_to_text(pdf_path):
         log_error(f"PDF转换失败: {e}")
         return {}
 
-def extract_section(text, keywords, context_lines=3):
+def extract_pdf_text(pdf_path, page_range=None):
     """
-    根据关键词提取相关段落
+    提取PDF全文，page_range=(start, end) 时只提取该范围内的页
     """
+    with load_pdf(pdf_path) as pdf:
+        pages = pdf.pages if page_range is None else pdf.pages[page_range[0]:page_range[1]]
+        full_text = ""
+        for page in pages:
+            text = page.extract_text()
+            if text:
+                full_text += text + "\n"
+    return full_text
+
+def count_pdf_pages(pdf_path):
+    """PDF总页数"""
+    with load_pdf(pdf_path) as pdf:
+        return len(pdf.pages)
+
+# 规则字段 → (触发关键词, 提取关键词)
+# 全文出现任一触发关键词时才提取该字段；触发关键词为None表示总是提取
+RULE_CATEGORIES = {
+    "body_check": (("体检", "身体"), ("体检", "身体", "健康")),  # 体检要求
+    "subject_scores": (("单科", "科目"), ("单科", "科目", "数学", "英语")),  # 单科成绩要求
+    "bonus_policies": (("加分", "政策"), ("加分", "政策", "优惠")),  # 加分政策
+    "admission_rules": (None, ("录取", "招生", "投档")),  # 录取规则
+    "special_requirements": (None, ("特殊", "要求", "限制")),  # 特殊要求
+}
+
+def _compile_keywords(keywords):
+    """
+    编译多关键词匹配，返回 (正则, {关键词: 作为其前缀的全部关键词})
+    前瞻断言的分组交替在每个起始位置只报告一个命中（最长的关键词），
+    起始位置相同、更短的关键词（如"政策性"中的"政策"）由前缀表补上
+    """
+    keywords = sorted(set(keywords), key=len, reverse=True)
+    alternation = "|".join(re.escape(keyword) for keyword in keywords)
+    prefixes = {keyword: [other for other in keywords if keyword.startswith(other)] for keyword in keywords}
+    return re.compile(f"(?=({alternation}))"), prefixes
+
+_RULE_KEYWORDS = {keyword for _, keywords in RULE_CATEGORIES.values() for keyword in keywords}
+_RULE_MATCHER = _compile_keywords(_RULE_KEYWORDS)
+
+def _scan_keyword_lines(text, matcher):
+    """
+    单次扫描全文，返回 (按行切分的文本, {关键词: 命中行号集合})
+    每个起始位置的命中连同作为其前缀的关键词一起记录，结果与逐个关键词 `keyword in line` 判断一致
+    """
+    pattern, prefixes = matcher
     lines = text.split('\n')
-    relevant_lines = []
-    
-    for i, line in enumerate(lines):
-        if any(keyword in line for keyword in keywords):
-            # 提取关键词行及其前后几行
-            start = max(0, i - context_lines)
-            end = min(len(lines), i + context_lines + 1)
-            relevant_lines.extend(lines[start:end])
-    
-    return '\n'.join(relevant_lines) if relevant_lines else ""
+    line_starts = [0]
+    for line in lines[:-1]:
+        line_starts.append(line_starts[-1] + len(line) + 1)
 
-def save_structured_data(data, path, format="json"):
+    hits = {}
+    for match in pattern.finditer(text):
+        line_no = bisect_right(line_starts, match.start()) - 1
+        for keyword in prefixes[match.group(1)]:
+            hits.setdefault(keyword, set()).add(line_no)
+    return lines, hits
+
+def _merge_context(lines, line_numbers, context_lines):
+    """把命中行扩展为上下文区间并合并重叠/相邻区间，每行最多输出一次"""
+    merged = []
+    for line_no in sorted(line_numbers):
+        start = max(0, line_no - context_lines)
+        end = min(len(lines), line_no + context_lines + 1)
+        if merged and start <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return '\n'.join(line for start, end in merged for line in lines[start:end])
+
+def extract_rules(full_text, context_lines=3):
+    """
+    从章程全文中按关键词提取规则字段
+    全文只扫描一次，命中行同时分配给所有相关字段，并合并重叠的上下文区间
+    """
+    lines, hits = _scan_keyword_lines(full_text, _RULE_MATCHER)
+
+    rules = {}
+    for category, (triggers, keywords) in RULE_CATEGORIES.items():
+        if triggers is not None and not any(trigger in hits for trigger in triggers):
+            rules[category] = ""
+            continue
+        line_numbers = set()
+        for keyword in keywords:
+            line_numbers |= hits.get(keyword, set())
+        rules[category] = _merge_context(lines, line_numbers, context_lines)
+    return rules
+
+def extract_section(text, keywords, context_lines=3):
+    """
+    根据关键词提取相关段落（重叠的上下文只输出一次）
+    """
+    lines, hits = _scan_keyword_lines(text, _compile_keywords(keywords))
+    line_numbers = set().union(*hits.values()) if hits else set()
+    return _merge_context(lines, line_numbers, context_lines)
+
+def save_structured_data(data, path, format="json", na_rep=None):
     """
     统一输出格式（JSON/CSV）
+    分类列在此处还原为普通字符串写出；指定 na_rep 时缺失值写为该占位符
     """
     log_info(f"以 {format} 格式保存结构化数据到 {path}")
     
     try:
         ensure_dir(path)
+        if isinstance(data, pd.DataFrame):
+            data = fill_na_for_output(data, na_rep) if na_rep is not None else decode_categoricals(data)
         
         if format == "json":
             with open(path, 'w', encoding='utf-8') as f:
                 if isinstance(data, pd.DataFrame):
                     data.to_json(f, orient='records', indent=4, force_ascii=False)
                 else:
-                    json.dump(data, f, ensure_ascii=False, indent=4)
+                    json.dump(data, f, ensure_ascii=False, indent=4, default=_json_default)
                     
         elif format == "csv":
             if isinstance(data, pd.DataFrame):
@@ -121,6 +187,11 @@ def save_structured_data(data, path, format="json"):
     except Exception as e:
         log_error(f"保存数据时出错: {e}")
 
+def _json_default(value):
+    if hasattr(value, "item"):
+        return value.item()
+    return str(value)
+
 def generate_data_report(data, output_path="reports/data_quality_report.json"):
     """
     生成数据质量报告
@@ -153,12 +224,16 @@ def generate_data_report(data, output_path="reports/data_quality_report.json"):
             if len(numeric_columns) > 0:
                 report["numeric_stats"] = data[numeric_columns].describe().to_dict()
             
-            # 分类型数据的统计信息
-            categorical_columns = data.select_dtypes(include=['object']).columns
+            # 分类型数据的统计信息（分类列直接按编码计数，只保留实际出现的取值）
+            # （pandas 3 的 str 类型不能写进 select_dtypes，另按 is_string_dtype 补上字符串列）
+            selected = set(data.select_dtypes(include=['object', 'category']).columns)
+            categorical_columns = [col for col in data.columns
+                                   if col in selected or pd.api.types.is_string_dtype(data[col])]
             if len(categorical_columns) > 0:
                 report["categorical_stats"] = {}
                 for col in categorical_columns:
-                    report["categorical_stats"][col] = data[col].value_counts().to_dict()
+                    counts = data[col].value_counts()
+                    report["categorical_stats"][col] = counts[counts > 0].to_dict()
             
         else:
             report = {
@@ -167,9 +242,9 @@ def generate_data_report(data, output_path="reports/data_quality_report.json"):
                 "message": "非DataFrame数据，无法生成详细报告"
             }
         
-        # 保存报告
+        # 保存报告（dtype、numpy标量等无法直接序列化的值按字符串/数值写出）
         with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(report, f, ensure_ascii=False, indent=4)
+            json.dump(report, f, ensure_ascii=False, indent=4, default=_json_default)
         
         log_info(f"数据质量报告已生成: {output_path}")
         return report
@@ -178,31 +253,43 @@ def generate_data_report(data, output_path="reports/data_quality_report.json"):
         log_error(f"生成数据质量报告时出错: {e}")
         return {}
 
+# 标准输出格式的字段及字段缺失时的默认值（列表默认值每条记录单独创建）
+STANDARD_FIELDS = {
+    "school": "",
+    "major": "",
+    "province": "",
+    "year": "",
+    "min_score": "",
+    "min_rank": "",
+    "plan_count": "",
+    "employment": "",
+    "missing_years": [],
+    "data_source": [],
+}
+
+def _standard_records(data):
+    """按列取出各字段的值（缺失列填充默认值）后整体组装为字典列表"""
+    rows = len(data)
+    columns = []
+    for field, default in STANDARD_FIELDS.items():
+        if field in data.columns:
+            columns.append(data[field].tolist())
+        elif isinstance(default, list):
+            columns.append([[] for _ in range(rows)])
+        else:
+            columns.append([default] * rows)
+    return list(map(dict, map(zip, repeat(list(STANDARD_FIELDS), rows), zip(*columns))))
+
 def convert_to_standard_format(data):
     """
     转换为标准输出格式
+    按列批量转换，不逐行构造Series
     """
     log_info("转换为标准输出格式...")
     
     try:
         if isinstance(data, pd.DataFrame):
-            # 转换为字典列表格式
-            standard_data = []
-            for _, row in data.iterrows():
-                record = {
-                    "school": row.get("school", ""),
-                    "major": row.get("major", ""),
-                    "province": row.get("province", ""),
-                    "year": row.get("year", ""),
-                    "min_score": row.get("min_score", ""),
-                    "min_rank": row.get("min_rank", ""),
-                    "plan_count": row.get("plan_count", ""),
-                    "employment": row.get("employment", ""),
-                    "missing_years": row.get("missing_years", []),
-                    "data_source": row.get("data_source", [])
-                }
-                standard_data.append(record)
-            return standard_data
+            return _standard_records(data)
         else:
             return data
             
@@ -210,6 +297,14 @@ def convert_to_standard_format(data):
         log_error(f"转换标准格式时出错: {e}")
         return data
 
+def iter_standard_records(data, chunksize=None):
+    """
+    分块转换为标准输出格式，每次产出一块记录列表（供流式写出等场景使用）
+    """
+    chunksize = chunksize or STANDARD_CHUNK_SIZE
+    for start in range(0, len(data), chunksize):
+        yield _standard_records(data.iloc[start:start + chunksize])
+
 def create_summary_statistics(data):
     """
     创建数据摘要统计
@@ -233,7 +328,7 @@ def create_summary_statistics(data):
         
         # 分数统计
         if "min_score" in data.columns:
-            numeric_scores = pd.to_numeric(data["min_score"], errors='coerce')
+            numeric_scores, _ = parse_numeric_strings(data["min_score"].replace(NA_PLACEHOLDER, None), "Int32")
             summary["score_statistics"] = {
                 "mean": numeric_scores.mean(),
                 "median": numeric_scores.median(),
@@ -0,0 +1,78 @@
+# data_processing/dataset_loader.py
+import hashlib
+import json
+import os
+import pandas as pd
+from utils.log import log_info
+from data_processing.numeric_parser import parse_numeric_strings
+from config import FIELD_MAPPING, DATASET_DTYPES, DATASET_CHUNK_SIZE
+
+# 数值列解析规则的版本：规则变化后已缓存的解析结果随之失效
+NUMERIC_PARSER_VERSION = 2
+
+def dataset_signature(fmt, field_mapping=None, dtypes=None):
+    """解析参数签名：字段映射或dtype配置变化后，已缓存的解析结果随之失效"""
+    params = {
+        "format": fmt,
+        "field_mapping": field_mapping or FIELD_MAPPING,
+        "dtypes": dtypes or DATASET_DTYPES,
+        "numeric_parser": NUMERIC_PARSER_VERSION,
+    }
+    return hashlib.sha1(json.dumps(params, sort_keys=True, ensure_ascii=False).encode("utf-8")).hexdigest()[:16]
+
+def dataset_format(path):
+    """根据扩展名判断数据集格式：csv / json / jsonl"""
+    suffix = os.path.splitext(path)[1].lower()
+    if suffix in (".jsonl", ".ndjson"):
+        return "jsonl"
+    if suffix == ".json":
+        return "json"
+    return "csv"
+
+def _normalize_chunk(chunk, field_mapping, dtypes):
+    """按字段映射重命名、只保留需要的字段，并转换为显式dtype"""
+    chunk = chunk.rename(columns=field_mapping)
+    chunk = chunk[[column for column in chunk.columns if column in dtypes]]
+    for column in chunk.columns:
+        dtype = dtypes[column]
+        if dtype == "str":
+            chunk[column] = chunk[column].astype("str").where(chunk[column].notna())
+        elif pd.api.types.is_integer_dtype(pd.api.types.pandas_dtype(dtype)):
+            # 非整数、超出类型范围或无法解析的值为缺失，不会因为个别单元格使整块转换失败
+            chunk[column], _ = parse_numeric_strings(chunk[column], dtype)
+        else:
+            chunk[column] = pd.to_numeric(chunk[column], errors="coerce").astype(dtype)
+    return chunk
+
+def read_dataset(path, fmt=None, chunksize=None, field_mapping=None, dtypes=None):
+    """
+    分块读取第三方数据集
+    - CSV按 chunksize 行分块读取，只读取映射后属于 DATASET_DTYPES 的列，所有列先按字符串读入，
+      避免逐列推断类型产生object列
+    - 每块按 FIELD_MAPPING 重命名并转换为 DATASET_DTYPES 中的显式类型（无法解析的数值为缺失值）
+    返回DataFrame
+    """
+    fmt = fmt or dataset_format(path)
+    chunksize = chunksize or DATASET_CHUNK_SIZE
+    field_mapping = field_mapping or FIELD_MAPPING
+    dtypes = dtypes or DATASET_DTYPES
+
+    if fmt == "csv":
+        reader = pd.read_csv(
+            path,
+            usecols=lambda column: field_mapping.get(column, column) in dtypes,
+            dtype="str",
+            chunksize=chunksize,
+        )
+    elif fmt == "jsonl":
+        reader = pd.read_json(path, lines=True, dtype=False, chunksize=chunksize)
+    else:
+        reader = [pd.read_json(path, dtype=False)]
+
+    chunks = [_normalize_chunk(chunk, field_mapping, dtypes) for chunk in reader]
+    if not chunks:
+        return pd.DataFrame(columns=list(dtypes))
+    df = pd.concat(chunks, ignore_index=True)
+    log_info(f"数据集读取完成: {path}，{len(df)} 行，{len(chunks)} 块，"
+             f"内存 {df.memory_usage(deep=True).sum() / 1024 / 1024:.1f} MB")
+    return df
@@ -0,0 +1,132 @@
+# data_processing/name_normalizer.py
+import hashlib
+import json
+import os
+import threading
+import numpy as np
+import pandas as pd
+from utils.io_tools import ensure_dir
+from config import NAME_CACHE_PATH, NAME_CACHE_MAX_ENTRIES
+
+# 括号备注，例：北京大学(医学部) → 北京大学
+BRACKET_PATTERN = r"\([^)]*\)"
+
+# 常见缩写 → 全称
+NAME_ABBREVIATIONS = {
+    "北大": "北京大学",
+    "清华": "清华大学",
+    "复旦": "复旦大学",
+    "上交": "上海交通大学",
+    "浙大": "浙江大学",
+    "南大": "南京大学",
+    "中大": "中山大学",
+    "华科": "华中科技大学",
+    "武大": "武汉大学",
+    "川大": "四川大学"
+}
+
+# DataFrame.attrs 中记录已标准化列名的键
+NORMALIZED_ATTR = "normalized_columns"
+
+def _rules_version():
+    """标准化规则的版本号：规则变化后持久化缓存自动失效"""
+    rules = json.dumps([BRACKET_PATTERN, NAME_ABBREVIATIONS], sort_keys=True, ensure_ascii=False)
+    return hashlib.sha1(rules.encode("utf-8")).hexdigest()[:12]
+
+def _normalize_values(values):
+    """对一组（去重后的）名称执行标准化：去除括号备注、首尾空白，再展开缩写"""
+    series = pd.Series(values, dtype=object).astype(str)
+    series = series.str.replace(BRACKET_PATTERN, "", regex=True).str.strip()
+    return series.replace(NAME_ABBREVIATIONS).tolist()
+
+class NameNormalizationCache:
+    """
+    名称标准化结果的持久化缓存（JSON文件，原始名称 → 标准名称）
+    院校/专业名称的不同取值只有数千个，跨运行复用后大多数名称无需再次计算；
+    条目数超过 max_entries 时按最近使用顺序淘汰（字典按使用顺序排列，最久未使用的在前）
+    """
+
+    def __init__(self, path=None, max_entries=None):
+        self.path = path or NAME_CACHE_PATH
+        self.max_entries = max_entries or NAME_CACHE_MAX_ENTRIES
+        self.version = _rules_version()
+        self._lock = threading.Lock()
+        self._names = self._load()
+        self._dirty = self._evict()
+
+    def _load(self):
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if data.get("version") == self.version:
+                    return data.get("names", {})
+            except (OSError, ValueError):
+                pass
+        return {}
+
+    def _evict(self):
+        """淘汰最久未使用的条目直到不超过上限，返回是否有淘汰"""
+        excess = len(self._names) - self.max_entries
+        for key in list(self._names)[:max(excess, 0)]:
+            del self._names[key]
+        return excess > 0
+
+    def __len__(self):
+        return len(self._names)
+
+    def normalize(self, raw_values):
+        """标准化一组原始名称（字符串），只计算缓存中没有的名称"""
+        with self._lock:
+            unique = list(dict.fromkeys(raw_values))
+            missing = [value for value in unique if value not in self._names]
+            if missing:
+                self._names.update(zip(missing, _normalize_values(missing)))
+                self._dirty = True
+            # 本次用到的名称移到字典末尾（最近使用）
+            for value in unique:
+                self._names[value] = self._names.pop(value)
+            normalized = [self._names[value] for value in raw_values]
+            self._dirty = self._evict() or self._dirty
+            return normalized
+
+    def save(self):
+        """写回磁盘（先写临时文件再替换）"""
+        with self._lock:
+            if not self._dirty:
+                return
+            ensure_dir(self.path)
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({"version": self.version, "names": self._names}, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+            self._dirty = False
+
+def normalize_column(series, cache):
+    """
+    只对列中的不同取值做标准化，再通过factorize编码映射回每一行
+    缺失值保持缺失；分类列返回分类类型，其余返回 str 类型的Series
+    """
+    codes, uniques = pd.factorize(series)
+    normalized = np.array(cache.normalize([str(value) for value in uniques]) + [np.nan], dtype=object)
+    # codes中的-1（缺失值）恰好取到末尾追加的NaN
+    dtype = "category" if isinstance(series.dtype, pd.CategoricalDtype) else "str"
+    return pd.Series(normalized[codes], index=series.index, dtype=dtype)
+
+def is_normalized(df, field):
+    return field in df.attrs.get(NORMALIZED_ATTR, [])
+
+def mark_normalized(df, field):
+    """在DataFrame.attrs中标记该列已标准化（此后对该列的修改需调用方自行清除标记）"""
+    df.attrs[NORMALIZED_ATTR] = sorted(set(df.attrs.get(NORMALIZED_ATTR, [])) | {field})
+
+_cache = None
+_cache_lock = threading.Lock()
+
+def get_name_cache():
+    """获取共享的名称标准化缓存"""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = NameNormalizationCache()
+        return _cache
@@ -0,0 +1,122 @@
+# data_processing/numeric_parser.py
+import re
+import numpy as np
+import pandas as pd
+
+# 每行的解析状态码（int8）
+PARSE_OK = 0  # 纯数字
+PARSE_CLEANED = 1  # 去除单位/千分位/全角字符后解析成功，例：680分、1,234、６８０
+PARSE_MULTIPLE = 2  # 含多个数值，取第一个，例：680/675
+PARSE_MISSING = 3  # 原始数据缺失或为占位符，例：—、N/A
+PARSE_INVALID = 4  # 有原始值但无法解析（或超出目标类型范围）
+STATUS_LABELS = ["ok", "cleaned", "multiple", "missing", "invalid"]  # 按状态码顺序
+
+# 视为缺失的原始取值（另外任意长度的连接号/破折号也视为缺失）
+NA_TOKENS = ["", "N/A", "NA", "n/a", "无", "暂无", "null", "None", "nan"]
+DASH_PATTERN = re.compile(r"^[-—–－―]+$")
+# 数字后可能出现的单位，以及千分位分隔符与空白
+NOISE_PATTERN = re.compile(r"[,，\s]|分|名|人|位")
+NUMBER_PATTERN = re.compile(r"^([0-9]+)(?:\.0+)?((?:[/／、~～][0-9]+(?:\.0+)?)*)$")
+PLAIN_PATTERN = re.compile(r"^[0-9]+$")
+# 纯数字快速路径的最大位数（18位以内的十进制数不会溢出int64）
+MAX_DIGITS = 18
+FULLWIDTH_TABLE = str.maketrans("０１２３４５６７８９．／", "0123456789./")
+
+def parse_numeric_strings(series, dtype="Int32"):
+    """
+    把爬取到的数值字符串列解析为可空整数类型
+    支持 "680"、"680分"、"1,234"、"680/675"（取第一个值）、"—"/"N/A"（缺失）等格式
+    返回 (数值Series, 状态码Series[int8])，状态码含义见 PARSE_* 常量
+
+    分数、位次等列的取值大量重复：先用factorize取不同取值，每个取值只解析一次再按编码映射回各行；
+    不同取值中的纯数字用numpy整体计算，只有带单位、分隔符等的少数取值才走正则
+    """
+    dtype = pd.api.types.pandas_dtype(dtype)
+    if pd.api.types.is_numeric_dtype(series.dtype):
+        return _parse_numbers(series, dtype)
+
+    codes, uniques = pd.factorize(series)
+    numbers, status = _parse_uniques(np.asarray(uniques, dtype=object), np.iinfo(dtype.numpy_dtype))
+    # codes中的-1（缺失值）恰好取到末尾追加的缺失项
+    numbers = np.append(numbers, np.nan)[codes]
+    status = np.append(status, np.int8(PARSE_MISSING))[codes]
+    values = pd.Series(numbers, index=series.index).astype(dtype)
+    return values, pd.Series(status, index=series.index)
+
+def _plain_digits(values):
+    """
+    按定长Unicode数组（每个字符一个uint32，末尾以0填充）整体判断纯数字并计算数值
+    只有不超过 MAX_DIGITS 个字符的ASCII取值进入数组，避免个别超长取值使整个数组按其长度分配内存；
+    其余取值不可能是int64范围内的纯数字，直接判为否
+    返回 (是否纯数字, int64数值)
+    """
+    text = np.array([str(v) for v in values], dtype=object)
+    plain = np.zeros(len(text), dtype=bool)
+    value = np.zeros(len(text), dtype=np.int64)
+    short = np.fromiter((len(t) <= MAX_DIGITS and t.isascii() for t in text), dtype=bool, count=len(text))
+    if not short.any():
+        return plain, value
+
+    chars = text[short].astype(f"U{MAX_DIGITS}")
+    grid = chars.view(np.uint32).reshape(len(chars), -1)
+    digits = grid - 48
+    is_digit = digits < 10
+    plain[short] = (is_digit | (grid == 0)).all(axis=1) & is_digit[:, 0]
+    number = np.zeros(len(chars), dtype=np.int64)
+    for column in range(grid.shape[1]):
+        number = np.where(is_digit[:, column], number * 10 + digits[:, column], number)
+    value[short] = number
+    return plain, value
+
+def _parse_uniques(uniques, info):
+    """解析去重后的取值，返回 (float64数值，无法解析为NaN, 状态码)"""
+    numbers = np.full(len(uniques), np.nan)
+    status = np.full(len(uniques), PARSE_INVALID, dtype=np.int8)
+    if not len(uniques):
+        return numbers, status
+
+    # 1. 纯数字
+    plain, value = _plain_digits(uniques)
+    numbers[plain] = value[plain]
+    status[plain] = PARSE_OK
+
+    # 2. 去除空白、单位、千分位并转换全角字符后为纯数字
+    rest = np.flatnonzero(~plain)
+    if len(rest):
+        text = pd.Series(uniques[rest], dtype="str").str.strip()
+        cleaned = text.str.translate(FULLWIDTH_TABLE).str.replace(NOISE_PATTERN, "", regex=True)
+        plain, value = _plain_digits(cleaned.to_numpy(dtype=object))
+        numbers[rest[plain]] = value[plain]
+        status[rest[plain]] = np.where((text == cleaned).to_numpy()[plain], PARSE_OK, PARSE_CLEANED)
+        rest, text, cleaned = rest[~plain], text[~plain], cleaned[~plain]
+
+    # 3. 其余取值：缺失占位符、多个数值、带小数位的整数
+    if len(rest):
+        missing = (text.isin(NA_TOKENS) | text.str.match(DASH_PATTERN).astype(bool)).to_numpy()
+        parts = cleaned.str.extract(NUMBER_PATTERN)
+        parsed = pd.to_numeric(parts[0], errors="coerce").to_numpy(dtype=float, na_value=np.nan)
+        matched = ~missing & ~np.isnan(parsed)
+        multiple = matched & parts[1].fillna("").ne("").to_numpy()
+        numbers[rest[matched]] = parsed[matched]
+        status[rest[matched]] = np.where(multiple[matched], PARSE_MULTIPLE, PARSE_CLEANED)
+        status[rest[missing]] = PARSE_MISSING
+
+    # 超出目标整数类型范围的数值视为无法解析
+    out_of_range = (numbers < info.min) | (numbers > info.max)
+    numbers[out_of_range] = np.nan
+    status[out_of_range] = PARSE_INVALID
+    return numbers, status
+
+def _parse_numbers(series, dtype):
+    """已经是数值类型的列：非整数或超出范围的值视为无法解析"""
+    info = np.iinfo(dtype.numpy_dtype)
+    numbers = series.astype("Float64")
+    missing = numbers.isna()
+    invalid = (~missing & ((numbers % 1 != 0) | (numbers < info.min) | (numbers > info.max))).fillna(False)
+    values = numbers.where(~invalid).astype(dtype)
+    status = np.select([missing, invalid], [PARSE_MISSING, PARSE_INVALID], PARSE_OK).astype(np.int8)
+    return values, pd.Series(status, index=series.index)
+
+def status_labels(status):
+    """把状态码转换为分类类型的标签（ok/cleaned/multiple/missing/invalid）"""
+    return pd.Series(pd.Categorical.from_codes(status, STATUS_LABELS), index=status.index)
@@ -0,0 +1,156 @@
+# data_processing/pdf_batch.py
+import math
+import os
+import signal
+from concurrent.futures import ProcessPoolExecutor, wait
+from utils.log import log_info, log_error
+from data_processing.converter import extract_pdf_text, extract_rules, count_pdf_pages, EXTRACTOR_VERSION
+from data_processing.text_cache import get_pdf_text_cache
+from config import PDF_WORKERS, PDF_TIMEOUT, PDF_PAGES_PER_CHUNK
+
+class _ExtractionTimeout(Exception):
+    pass
+
+def _raise_timeout(signum, frame):
+    raise _ExtractionTimeout()
+
+def _with_timeout(timeout, func, *args):
+    """
+    子进程中执行 func(*args)
+    支持SIGALRM的平台上在进程内强制超时，超时的作业不会占住工作进程
+    """
+    use_alarm = hasattr(signal, "SIGALRM") and timeout
+    if use_alarm:
+        signal.signal(signal.SIGALRM, _raise_timeout)
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        return func(*args)
+    except _ExtractionTimeout:
+        raise TimeoutError(f"提取超过 {timeout} 秒")
+    finally:
+        if use_alarm:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+
+def _open_job(pdf_path, pages_per_chunk):
+    """
+    每个PDF的首个作业：在子进程中读取页数（读页数本身也可能卡住，因此同样受超时限制）
+    页数不超过 pages_per_chunk 时直接提取全文，返回 (全文, None)；否则返回 (None, 页数)，由主进程拆分页段
+    """
+    if pages_per_chunk:
+        page_count = count_pdf_pages(pdf_path)
+        if page_count > pages_per_chunk:
+            return None, page_count
+    return extract_pdf_text(pdf_path), None
+
+def _first_job(pdf_path, pages_per_chunk, timeout):
+    return _with_timeout(timeout, _open_job, pdf_path, pages_per_chunk)
+
+def _extract_job(pdf_path, page_range, timeout):
+    """子进程中提取PDF一个页段的文本"""
+    return _with_timeout(timeout, extract_pdf_text, pdf_path, page_range)
+
+def _page_ranges(page_count, pages_per_chunk):
+    """把总页数拆分为 [(起始页, 结束页), ...]"""
+    return [(start, min(start + pages_per_chunk, page_count)) for start in range(0, page_count, pages_per_chunk)]
+
+def _describe(job):
+    path, page_range = job
+    return f"{path} {page_range}" if isinstance(page_range, tuple) else path
+
+def _run_jobs(executor, jobs, func, workers, timeout):
+    """
+    把作业提交到进程池并等待，返回 ({作业: 结果}, 失败的作业集合, 是否有作业超时未返回)
+    子进程内的超时之外再加一层整体兜底（不支持SIGALRM的平台依赖这一层）
+    """
+    futures = {executor.submit(func, *job, timeout): job for job in jobs}
+    overall_timeout = timeout * math.ceil(len(jobs) / workers) + timeout
+    done, not_done = wait(futures, timeout=overall_timeout)
+    results, failed = {}, set()
+    for future in not_done:
+        log_error(f"PDF提取超时 ({_describe(futures[future])})")
+        failed.add(futures[future])
+    for future in done:
+        try:
+            results[futures[future]] = future.result()
+        except Exception as e:
+            log_error(f"PDF提取失败 ({_describe(futures[future])}): {e}")
+            failed.add(futures[future])
+    return results, failed, bool(not_done)
+
+def _shutdown(executor, terminate):
+    """关闭进程池；有作业超时未返回时先终止所有工作进程，避免卡住的进程阻塞解释器退出"""
+    if terminate:
+        for process in list((executor._processes or {}).values()):
+            process.terminate()
+    executor.shutdown(wait=True, cancel_futures=True)
+
+def batch_pdf_to_text(pdf_paths, workers=None, timeout=None, pages_per_chunk=None):
+    """
+    多进程批量提取招生章程PDF
+    - 每个PDF先作为一个作业分配到进程池（读取页数也在子进程中进行）；
+      页数超过 pages_per_chunk 的PDF再按页段拆分为多个作业
+    - 每个作业受 timeout 限制，超时或出错的PDF结果为 {}（成功的结果总含全部规则字段），不影响其余文件；
+      超时未返回的工作进程会被终止
+    - 提取缓存中已有的PDF（相同内容、相同提取逻辑版本）直接返回缓存结果
+    返回 {pdf_path: rules}，rules 与 pdf_to_text 的返回格式相同
+    """
+    pdf_paths = [path for path in dict.fromkeys(pdf_paths) if path]
+    if not pdf_paths:
+        return {}
+    workers = workers or PDF_WORKERS or os.cpu_count() or 1
+    timeout = timeout or PDF_TIMEOUT
+    pages_per_chunk = PDF_PAGES_PER_CHUNK if pages_per_chunk is None else pages_per_chunk
+
+    results = {}
+    cache = get_pdf_text_cache(EXTRACTOR_VERSION)
+    if cache:
+        for pdf_path in pdf_paths:
+            cached = cache.get(pdf_path)
+            if cached is not None:
+                results[pdf_path] = cached["rules"]
+        pdf_paths = [path for path in pdf_paths if path not in results]
+        if results:
+            log_info(f"{len(results)} 个PDF命中提取缓存")
+    if not pdf_paths:
+        return results
+
+    log_info(f"开始批量提取 {len(pdf_paths)} 个PDF（{workers} 个进程）")
+    texts = {}
+    failed = set()
+    hung = False
+    executor = ProcessPoolExecutor(max_workers=workers)
+    try:
+        opened, failed_jobs, hung = _run_jobs(
+            executor, [(path, pages_per_chunk) for path in pdf_paths], _first_job, workers, timeout)
+        failed.update(path for path, _ in failed_jobs)
+        chunk_jobs = []
+        for (path, _), (text, page_count) in opened.items():
+            if page_count is None:
+                texts[path] = [text]
+            else:
+                chunk_jobs.extend((path, page_range) for page_range in _page_ranges(page_count, pages_per_chunk))
+        if chunk_jobs and not hung:
+            log_info(f"{len({path for path, _ in chunk_jobs})} 个大文件拆分为 {len(chunk_jobs)} 个页段作业")
+            chunks, failed_jobs, hung = _run_jobs(executor, chunk_jobs, _extract_job, workers, timeout)
+            failed.update(path for path, _ in failed_jobs)
+            for path, page_range in chunk_jobs:
+                if (path, page_range) in chunks:
+                    texts.setdefault(path, []).append(chunks[(path, page_range)])
+        elif chunk_jobs:
+            # 进程池中有卡住的进程，不再继续提交页段作业
+            failed.update(path for path, _ in chunk_jobs)
+    finally:
+        _shutdown(executor, terminate=hung)
+
+    for pdf_path in pdf_paths:
+        if pdf_path in failed or pdf_path not in texts:
+            results[pdf_path] = {}
+            failed.add(pdf_path)
+            continue
+        full_text = "".join(texts[pdf_path])
+        results[pdf_path] = extract_rules(full_text)
+        if cache:
+            cache.put(pdf_path, full_text, results[pdf_path])
+
+    log_info(f"批量PDF提取完成: 成功 {len(pdf_paths) - len(failed)} 个，失败 {len(failed)} 个")
+    return results
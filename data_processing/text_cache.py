@@ -0,0 +1,101 @@
+# data_processing/text_cache.py
+import json
+import os
+import threading
+from utils.disk_cache import DiskLRUIndex
+from utils.io_tools import ensure_dir, file_sha256
+from utils.log import log_info
+from config import PDF_TEXT_CACHE_ENABLED, PDF_TEXT_CACHE_DIR, PDF_TEXT_CACHE_MAX_BYTES
+
+class PdfTextCache:
+    """
+    PDF提取结果缓存
+    以 (PDF内容SHA-256, 提取逻辑版本) 为键保存全文与规则字典；
+    提取逻辑版本变化后旧条目全部失效，总大小超出上限时按LRU淘汰
+    """
+
+    def __init__(self, version, cache_dir=None, max_bytes=None):
+        self.version = str(version)
+        self.cache_dir = cache_dir or PDF_TEXT_CACHE_DIR
+        self.index = DiskLRUIndex(
+            os.path.join(self.cache_dir, "index.json"),
+            max_bytes or PDF_TEXT_CACHE_MAX_BYTES,
+            on_evict=self._delete_entry,
+        )
+        self._hashes = {}
+        self._lock = threading.Lock()
+        self._invalidate_old_versions()
+
+    def _entry_path(self, key):
+        return os.path.join(self.cache_dir, key[:2], f"{key}.json")
+
+    def _delete_entry(self, key, entry):
+        try:
+            os.remove(self._entry_path(key))
+        except OSError:
+            pass
+
+    def _invalidate_old_versions(self):
+        stale = [key for key in self.index.keys() if not key.endswith(f"-v{self.version}")]
+        for key in stale:
+            self._delete_entry(key, self.index.remove(key))
+        if stale:
+            self.index.flush()
+            log_info(f"提取逻辑版本变为 {self.version}，清除了 {len(stale)} 条旧的PDF提取缓存")
+
+    def pdf_hash(self, pdf_path):
+        """PDF内容哈希（按路径+修改时间+大小记忆，避免重复读文件）"""
+        stat = os.stat(pdf_path)
+        signature = (os.path.abspath(pdf_path), stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            digest = self._hashes.get(signature)
+        if digest is None:
+            digest = file_sha256(pdf_path)
+            with self._lock:
+                self._hashes[signature] = digest
+        return digest
+
+    def remember_hash(self, pdf_path, digest):
+        """登记已知的PDF内容哈希（例如下载时已计算过），之后不再重新读文件计算"""
+        stat = os.stat(pdf_path)
+        with self._lock:
+            self._hashes[(os.path.abspath(pdf_path), stat.st_mtime_ns, stat.st_size)] = digest
+
+    def _key(self, pdf_path):
+        return f"{self.pdf_hash(pdf_path)}-v{self.version}"
+
+    def get(self, pdf_path):
+        """返回缓存的 {"text": 全文, "rules": 规则}，未命中时返回None"""
+        key = self._key(pdf_path)
+        if self.index.get(key) is None:
+            return None
+        try:
+            with open(self._entry_path(key), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            self.index.remove(key)
+            return None
+
+    def put(self, pdf_path, text, rules):
+        """保存一个PDF的提取结果"""
+        key = self._key(pdf_path)
+        payload = json.dumps({"text": text, "rules": rules}, ensure_ascii=False)
+        path = self._entry_path(key)
+        ensure_dir(path)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(payload)
+        self.index.put(key, {"size": len(payload.encode("utf-8"))})
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+def get_pdf_text_cache(version, cache_dir=None):
+    """获取共享的PDF提取结果缓存，未启用缓存时返回None"""
+    if not PDF_TEXT_CACHE_ENABLED:
+        return None
+    cache_dir = cache_dir or PDF_TEXT_CACHE_DIR
+    with _caches_lock:
+        cache = _caches.get(cache_dir)
+        if cache is None or cache.version != str(version):
+            cache = _caches[cache_dir] = PdfTextCache(version, cache_dir)
+        return cache
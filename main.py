@@ -1,14 +1,27 @@
 # main.py
 import config
 from utils.log import setup_logger, log_info, log_error
-from crawlers.yangguang import crawl_schools, crawl_majors, crawl_scores, crawl_admission_rules
-from crawlers.provincial import crawl_provincial_scores, load_github_dataset
+from utils.retry import get_dead_letter_queue
+from crawlers.yangguang import (
+    crawl_schools,
+    crawl_school_details,
+    crawl_majors,
+    crawl_scores,
+    crawl_scores_grid,
+    crawl_admission_rules_batch,
+    crawl_admission_rules_concurrent,
+    school_ids_from_schools,
+    reparse_archived_pages,
+    REPLAY_HANDLERS,
+)
+from crawlers.provincial import crawl_provinces, load_github_dataset
 from data_processing.cleaner import (
     standardize_names, 
     handle_missing_values, 
     merge_datasets, 
     validate_data,
-    clean_province_names
+    clean_province_names,
+    to_shared_categoricals
 )
 from data_processing.converter import (
     save_structured_data, 
@@ -17,10 +30,14 @@ from data_processing.converter import (
     create_summary_statistics
 )
 import pandas as pd
+import json
 import os
 
-def crawl_yangguang(years, provinces):
-    """主函数：爬取阳光高考平台数据"""
+def crawl_yangguang(years, provinces, resume=None):
+    """
+    主函数：爬取阳光高考平台数据
+    resume=True 时院校库与分数线从上次中断处继续（默认取 config.RESUME_CRAWL）
+    """
     log_info("启动阳光高考平台数据爬取...")
     
     all_data = {
@@ -33,7 +50,10 @@ def crawl_yangguang(years, provinces):
     try:
         # 爬取院校库
         log_info("开始爬取院校库...")
-        schools = crawl_schools()
+        schools = crawl_schools(resume=resume)
+        if config.SCHOOL_DETAILS:
+            log_info("开始爬取院校详情页...")
+            schools = crawl_school_details(schools, resume=resume)
         all_data["schools"] = schools
         
         # 爬取专业库
@@ -43,21 +63,22 @@ def crawl_yangguang(years, provinces):
         
         # 爬取历年分数线
         log_info("开始爬取历年分数线...")
-        for year in years:
-            for province in provinces:
-                scores = crawl_scores(year, province)
-                all_data["scores"].extend(scores)
+        if config.ASYNC_CRAWL:
+            all_data["scores"] = crawl_scores_grid(years, provinces, resume=resume)
+        else:
+            for year in years:
+                for province in provinces:
+                    scores = crawl_scores(year, province)
+                    all_data["scores"].extend(scores)
         
-        # 爬取部分院校的招生章程（示例：前10所院校）
+        # 爬取招生章程：默认覆盖院校库中的全部院校，否则只爬取示例院校
         log_info("开始爬取招生章程...")
-        school_ids = [1, 2, 3, 4, 5, 6, 7, 8, 9, 10]  # 示例院校ID
-        for school_id in school_ids:
-            rules = crawl_admission_rules(school_id)
-            if rules:
-                all_data["admission_rules"].append({
-                    "school_id": school_id,
-                    "rules": rules
-                })
+        if config.ADMISSION_RULES_FROM_SCHOOLS:
+            school_ids = school_ids_from_schools(schools)
+            all_data["admission_rules"] = crawl_admission_rules_concurrent(school_ids, resume=resume)
+        else:
+            school_ids = [1, 2, 3, 4, 5, 6, 7, 8, 9, 10]  # 示例院校ID
+            all_data["admission_rules"] = crawl_admission_rules_batch(school_ids)
         
         log_info("阳光高考平台数据爬取完成。")
         return all_data
@@ -67,32 +88,13 @@ def crawl_yangguang(years, provinces):
         return all_data
 
 def crawl_provincial(provinces):
-    """主函数：爬取省级考试院数据"""
+    """主函数：爬取省级考试院数据（各省适配器并发运行，见 crawlers.provincial.PROVINCE_ADAPTERS）"""
     log_info("启动省级考试院数据爬取...")
     
     provincial_data = []
     
     try:
-        # 省级考试院URL映射（需要根据实际情况调整）
-        province_urls = {
-            "北京": "http://www.bjeea.cn/html/gkgz/tzgg/",
-            "上海": "http://www.shmeea.edu.cn/page/24300/",
-            "广东": "http://eea.gd.gov.cn/",
-            "浙江": "http://www.zjzs.net/",
-            "江苏": "http://www.jseea.cn/",
-            "山东": "http://www.sdzk.cn/",
-            "河南": "http://www.heao.gov.cn/",
-            "四川": "http://www.sceea.cn/",
-            "湖北": "http://www.hbea.edu.cn/",
-            "湖南": "http://www.hneao.edu.cn/"
-        }
-        
-        for province in provinces:
-            if province in province_urls:
-                data = crawl_provincial_scores(province_urls[province])
-                if data:
-                    provincial_data.extend(data)
-        
+        provincial_data = crawl_provinces(provinces)
         log_info("省级考试院数据爬取完成。")
         return provincial_data
         
@@ -114,7 +116,7 @@ def load_third_party_data():
         third_party_data = []
         for url in github_urls:
             data = load_github_dataset(url)
-            if data:
+            if data is not None and not data.empty:
                 third_party_data.append(data)
         
         log_info("第三方数据集加载完成。")
@@ -138,24 +140,28 @@ def clean_and_merge(yangguang_data, provincial_data, third_party_data):
         if third_party_data:
             third_party_df = pd.concat([pd.DataFrame(data) for data in third_party_data], ignore_index=True)
         
+        # 院校/专业/省份列在清洗前一次性转换为共享字典的分类类型，
+        # 之后的清洗只处理分类字典，各表合并时无需逐行比较字符串
+        to_shared_categoricals([yangguang_scores_df, provincial_df, third_party_df])
+        
         # 数据清洗
         if not yangguang_scores_df.empty:
             yangguang_scores_df = clean_province_names(yangguang_scores_df)
             yangguang_scores_df = standardize_names(yangguang_scores_df, "school")
             yangguang_scores_df = standardize_names(yangguang_scores_df, "major")
-            yangguang_scores_df = handle_missing_values(yangguang_scores_df, strategy="mark_na")
+            yangguang_scores_df = handle_missing_values(yangguang_scores_df, strategy=config.MISSING_STRATEGY)
         
         if not provincial_df.empty:
             provincial_df = clean_province_names(provincial_df)
             provincial_df = standardize_names(provincial_df, "school")
             provincial_df = standardize_names(provincial_df, "major")
-            provincial_df = handle_missing_values(provincial_df, strategy="mark_na")
+            provincial_df = handle_missing_values(provincial_df, strategy=config.MISSING_STRATEGY)
         
         if third_party_df is not None and not third_party_df.empty:
             third_party_df = clean_province_names(third_party_df)
             third_party_df = standardize_names(third_party_df, "school")
             third_party_df = standardize_names(third_party_df, "major")
-            third_party_df = handle_missing_values(third_party_df, strategy="mark_na")
+            third_party_df = handle_missing_values(third_party_df, strategy=config.MISSING_STRATEGY)
         
         # 合并数据集
         cleaned_data = merge_datasets(yangguang_scores_df, provincial_df, third_party_df)
@@ -171,7 +177,7 @@ def clean_and_merge(yangguang_data, provincial_data, third_party_data):
         log_error(f"数据清洗与合并失败: {str(e)}")
         return pd.DataFrame()
 
-def pipeline():
+def pipeline(resume=None):
     """数据处理主流程"""
     # 初始化日志
     setup_logger()
@@ -182,7 +188,7 @@ def pipeline():
     try:
         # 阶段1：爬取原始数据
         log_info("【阶段1】开始爬取原始数据...")
-        yangguang_data = crawl_yangguang(config.YEARS, config.PROVINCES)
+        yangguang_data = crawl_yangguang(config.YEARS, config.PROVINCES, resume=resume)
         provincial_data = crawl_provincial(config.PROVINCES)
         third_party_data = load_third_party_data()
         log_info("【阶段1】原始数据爬取完成。")
@@ -203,11 +209,11 @@ def pipeline():
         if not cleaned_data.empty:
             # 保存为JSON格式
             json_output_path = f"{config.FINAL_DATA_PATH}/gaokao_data.json"
-            save_structured_data(cleaned_data, json_output_path, format="json")
+            save_structured_data(cleaned_data, json_output_path, format="json", na_rep=config.NA_PLACEHOLDER)
             
             # 保存为CSV格式
             csv_output_path = f"{config.FINAL_DATA_PATH}/gaokao_data.csv"
-            save_structured_data(cleaned_data, csv_output_path, format="csv")
+            save_structured_data(cleaned_data, csv_output_path, format="csv", na_rep=config.NA_PLACEHOLDER)
             
             # 生成数据质量报告
             report_path = f"{config.FINAL_DATA_PATH}/data_quality_report.json"
@@ -243,5 +249,65 @@ def pipeline():
         log_error(f"数据处理流程执行失败: {str(e)}")
         raise
 
+def replay_dead_letters():
+    """
+    重放死信队列中的失败单元
+    院校库分页与分数线写入断点记录（下次运行 pipeline 时续爬使用），
+    招生章程直接合并进原始数据文件
+    """
+    setup_logger()
+    log_info("开始重放死信队列...")
+
+    replayed_rules = []
+
+    def replay_admission_rules(payload):
+        rules = REPLAY_HANDLERS["admission_rules"](payload)
+        if rules:
+            replayed_rules.append({"school_id": payload["school_id"], "rules": rules})
+
+    handlers = dict(REPLAY_HANDLERS, admission_rules=replay_admission_rules)
+    succeeded, failed = get_dead_letter_queue().replay(handlers)
+
+    if replayed_rules:
+        rules_path = f"{config.RAW_DATA_PATH}/admission_rules.json"
+        existing = []
+        if os.path.exists(rules_path):
+            with open(rules_path, 'r', encoding='utf-8') as f:
+                existing = json.load(f)
+        replayed_ids = {item["school_id"] for item in replayed_rules}
+        merged = [item for item in existing if item.get("school_id") not in replayed_ids] + replayed_rules
+        save_structured_data(merged, rules_path, format="json")
+
+    return succeeded, failed
+
+def reparse_archive_offline(since=None):
+    """
+    离线模式：用当前解析规则重新解析归档页面（需事先以 config.ARCHIVE_RESPONSES=True 运行过爬取）
+    结果覆盖写入原始数据目录，不发起网络请求
+    """
+    setup_logger()
+    log_info("开始离线重新解析归档页面...")
+
+    results = reparse_archived_pages(since=since)
+    for page_type in ("schools", "majors", "scores"):
+        if results[page_type]:
+            output_path = f"{config.RAW_DATA_PATH}/{page_type}.json"
+            save_structured_data(results[page_type], output_path, format="json")
+    return results
+
 if __name__ == '__main__':
-    pipeline() 
\ No newline at end of file
+    import argparse
+
+    parser = argparse.ArgumentParser(description="高考数据采集与清洗系统")
+    parser.add_argument("--no-resume", action="store_true", help="忽略断点记录，从头开始爬取")
+    parser.add_argument("--replay-dead-letters", action="store_true", help="重放死信队列中失败的爬取单元")
+    parser.add_argument("--reparse-archive", action="store_true", help="离线重新解析归档页面，不访问网络")
+    parser.add_argument("--since", help="与 --reparse-archive 一起使用，只解析该时间之后归档的页面（如 2024-06-01）")
+    args = parser.parse_args()
+
+    if args.replay_dead_letters:
+        replay_dead_letters()
+    elif args.reparse_archive:
+        reparse_archive_offline(since=args.since)
+    else:
+        pipeline(resume=False if args.no_resume else None) 
\ No newline at end of file
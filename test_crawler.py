@@ -1,6 +1,7 @@
 # test_crawler.py
 import sys
 import os
+import time
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from utils.log import setup_logger, log_info
@@ -33,10 +34,19 @@ def test_data_cleaning():
         "min_score": [680, 675, 670, 665]
     })
     
+    import tempfile
+    from unittest import mock
+    import data_processing.cleaner as cleaner
+    from data_processing.name_normalizer import NameNormalizationCache
+
     try:
-        # 测试名称标准化
-        cleaned_data = standardize_names(test_data.copy(), "school")
-        log_info(f"名称标准化结果: {cleaned_data['school'].tolist()}")
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            # 名称标准化缓存写到临时目录，不写入 data/cache
+            cache = NameNormalizationCache(os.path.join(tmp_dir, "names.json"))
+            with mock.patch.object(cleaner, "get_name_cache", return_value=cache):
+                # 测试名称标准化
+                cleaned_data = standardize_names(test_data.copy(), "school")
+                log_info(f"名称标准化结果: {cleaned_data['school'].tolist()}")
         
         # 测试省份名称清理
         cleaned_data = clean_province_names(cleaned_data)
@@ -47,6 +57,209 @@ def test_data_cleaning():
         log_info(f"数据清洗测试失败: {e}")
         return False
 
+def test_memoized_name_normalization():
+    """测试基于不同取值的名称标准化与持久化缓存"""
+    log_info("测试名称标准化缓存...")
+
+    import tempfile
+    from unittest import mock
+    import data_processing.cleaner as cleaner
+    import data_processing.name_normalizer as name_normalizer
+
+    names = ["北京大学(医学部)", "清华", " 复旦大学 ", None, "北大"] * 1000
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        cache_path = os.path.join(tmp_dir, "names.json")
+        cache = name_normalizer.NameNormalizationCache(cache_path)
+        with mock.patch.object(cleaner, "get_name_cache", return_value=cache), \
+                mock.patch.object(name_normalizer, "_normalize_values",
+                                  wraps=name_normalizer._normalize_values) as normalize:
+            df = cleaner.standardize_names(pd.DataFrame({"school": names}), "school")
+            assert normalize.call_count == 1 and len(normalize.call_args[0][0]) == 4  # 只计算不同取值
+            assert df["school"].isna().tolist()[:5] == [False, False, False, True, False]
+            assert df["school"].dropna().tolist()[:4] == ["北京大学", "清华大学", "复旦大学", "北京大学"]
+
+            # 已标记为标准化的列直接跳过
+            df.loc[0, "school"] = "北大"
+            cleaner.standardize_names(df, "school")
+            assert df.loc[0, "school"] == "北大"
+            assert df.copy().attrs["normalized_columns"] == ["school"]
+
+            # 缓存跨运行复用：新进程中已见过的名称无需再计算
+            reloaded = name_normalizer.NameNormalizationCache(cache_path)
+            assert len(reloaded) == 4
+            normalize.reset_mock()
+            assert reloaded.normalize(["清华", "川大"]) == ["清华大学", "四川大学"]
+            assert normalize.call_args[0][0] == ["川大"]
+
+        # 条目数有上限：超出后淘汰最久未使用的名称，重新加载时同样截断
+        bounded = name_normalizer.NameNormalizationCache(cache_path, max_entries=3)
+        assert len(bounded) == 3
+        bounded.normalize(["北大", "武大", "浙大"])
+        bounded.save()
+        assert set(name_normalizer.NameNormalizationCache(cache_path)._names) == {"北大", "武大", "浙大"}
+    return True
+
+def test_categorical_record_frames():
+    """测试院校/专业/省份列以共享字典的分类类型贯穿合并、验证与报告"""
+    log_info("测试分类类型记录表...")
+
+    import json
+    import tempfile
+    from unittest import mock
+    import data_processing.cleaner as cleaner
+    import data_processing.name_normalizer as name_normalizer
+    from data_processing.converter import generate_data_report, save_structured_data
+
+    rows = 20000
+    yangguang = pd.DataFrame({
+        "school": ["北京大学(医学部)", "清华大学", "复旦大学", "浙江大学"] * (rows // 4),
+        "major": ["计算机科学与技术", "临床医学"] * (rows // 2),
+        "province": ["北京市", "上海市", "广东省", "浙江省"] * (rows // 4),
+        "year": [2023] * rows,
+        "min_score": [680] * rows,
+    })
+    provincial = pd.DataFrame({
+        "school": ["清华大学", "南京大学"],
+        "province": ["江苏省", "江苏省"],
+        "year": [2023, 2023],
+        "min_score": [690, None],
+    })
+    object_bytes = yangguang.astype(object).memory_usage(deep=True).sum()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        cache = name_normalizer.NameNormalizationCache(os.path.join(tmp_dir, "names.json"))
+        with mock.patch.object(cleaner, "get_name_cache", return_value=cache):
+            merged = cleaner.merge_datasets(yangguang, provincial)
+        assert len(merged) == 6
+        for col in cleaner.CATEGORICAL_COLUMNS:
+            assert isinstance(merged[col].dtype, pd.CategoricalDtype), col
+        assert set(merged["school"].cat.categories) >= {"北京大学", "南京大学"}
+
+        # 省份清洗、缺失值标记后仍为分类类型
+        merged = cleaner.clean_province_names(merged)
+        merged = cleaner.handle_missing_values(merged)
+        assert isinstance(merged["province"].dtype, pd.CategoricalDtype)
+        assert merged["province"].iloc[-1] == "江苏"
+        assert isinstance(merged["major"].dtype, pd.CategoricalDtype)
+        assert merged["major"].iloc[-1] == "N/A"
+        assert cleaner.validate_data(merged)["duplicates"] == 0
+
+        # 分类列的内存占用远小于object列
+        categorical = yangguang.copy()
+        cleaner.to_shared_categoricals([categorical])
+        assert categorical.memory_usage(deep=True).sum() * 5 < object_bytes
+
+        # 报告只统计实际出现的取值，输出时还原为普通字符串
+        report_path = os.path.join(tmp_dir, "report.json")
+        generate_data_report(merged[merged["data_source"] == "省级考试院"], report_path)
+        with open(report_path, 'r', encoding='utf-8') as f:
+            stats = json.load(f)["categorical_stats"]
+        assert stats["school"] == {"清华大学": 1, "南京大学": 1}
+        output_path = os.path.join(tmp_dir, "merged.csv")
+        save_structured_data(merged, output_path, format="csv")
+        assert pd.read_csv(output_path)["province"].tolist()[-2:] == ["江苏", "江苏"]
+
+        # 清洗各表时保持共享字典：多个取值合并为同一取值后，各表的dtype仍一致，concat不退化为object
+        first = pd.DataFrame({"province": ["北京市", "北京", None], "school": ["北京大学(医学部)", "清华大学", "清华大学"]})
+        second = pd.DataFrame({"province": ["上海市"], "school": ["复旦大学"]})
+        cleaner.to_shared_categoricals([first, second])
+        with mock.patch.object(cleaner, "get_name_cache", return_value=cache):
+            first, second = [cleaner.standardize_names(cleaner.clean_province_names(df), "school")
+                             for df in (first, second)]
+        assert first["province"].dtype == second["province"].dtype
+        assert first["school"].dtype == second["school"].dtype
+        combined = pd.concat([first, second], ignore_index=True)
+        assert isinstance(combined["province"].dtype, pd.CategoricalDtype)
+        assert isinstance(combined["school"].dtype, pd.CategoricalDtype)
+        assert combined["province"].tolist()[:2] == ["北京", "北京"] and pd.isna(combined["province"][2])
+        assert combined["school"].tolist() == ["北京大学", "清华大学", "清华大学", "复旦大学"]
+
+        # 清洗流程开始时即转换为分类类型
+        import main
+        with mock.patch.object(cleaner, "get_name_cache", return_value=cache):
+            cleaned = main.clean_and_merge({"scores": yangguang.head(8).to_dict("records")},
+                                           provincial.to_dict("records"), None)
+        assert len(cleaned) == 6 and isinstance(cleaned["school"].dtype, pd.CategoricalDtype)
+    return True
+
+def test_typed_missing_values():
+    """测试typed缺失值模式：数值列为可空整数，"N/A"只在写出时填充"""
+    log_info("测试typed缺失值模式...")
+
+    import json
+    import tempfile
+    from data_processing.cleaner import handle_missing_values, validate_data
+    from data_processing.converter import save_structured_data
+
+    df = pd.DataFrame({
+        "school": ["北京大学", "清华大学", "复旦大学"],
+        "major": ["计算机", None, "临床医学"],
+        "province": ["北京", "北京", "上海"],
+        "year": [2023, 2023, 2023],
+        "min_score": ["680", "—", "900"],
+        "min_rank": [" 120 ", None, "第一"],
+        "plan_count": [5, 3, None],
+    })
+    df = handle_missing_values(df, strategy="typed")
+    assert str(df["min_score"].dtype) == "Int16" and str(df["min_rank"].dtype) == "Int32"
+    assert df["min_score"].isna().tolist() == [False, True, False]
+    assert df["min_score_status"].tolist() == ["ok", "missing", "ok"]
+    assert df["min_rank_status"].tolist() == ["ok", "missing", "invalid"]
+    assert df["plan_count"].tolist()[:2] == [5, 3]
+    assert (df == "N/A").sum().sum() == 0
+
+    results = validate_data(df)
+    assert results["invalid_scores"] == 1
+    assert results["unparsed_values"]["min_rank"] == 1
+    assert results["missing_values"]["min_score"] == 1
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        output_path = os.path.join(tmp_dir, "typed.json")
+        save_structured_data(df, output_path, format="json", na_rep="N/A")
+        with open(output_path, 'r', encoding='utf-8') as f:
+            records = json.load(f)
+    assert records[1]["min_score"] == "N/A" and records[1]["major"] == "N/A"
+    assert records[0]["min_rank"] == 120 and records[2]["min_rank_status"] == "invalid"
+    return True
+
+def test_numeric_string_parser():
+    """测试爬取数值字符串的向量化解析与状态码"""
+    log_info("测试数值字符串解析...")
+
+    from data_processing import numeric_parser
+    from data_processing.converter import create_summary_statistics
+
+    raw = pd.Series(["680", "680分", "—", "1,234", "680/675", None, "N/A", " 120 ", "第一", "６８０",
+                     "680.5", "99999", "--", "680"] * 100)
+    values, status = numeric_parser.parse_numeric_strings(raw, "Int16")
+    assert str(values.dtype) == "Int16" and status.dtype == "int8"
+    expected = [680, 680, None, 1234, 680, None, None, 120, None, 680, None, None, None, 680]
+    assert [None if pd.isna(value) else value for value in values[:14]] == expected
+    assert status[:14].tolist() == [
+        numeric_parser.PARSE_OK, numeric_parser.PARSE_CLEANED, numeric_parser.PARSE_MISSING,
+        numeric_parser.PARSE_CLEANED, numeric_parser.PARSE_MULTIPLE, numeric_parser.PARSE_MISSING,
+        numeric_parser.PARSE_MISSING, numeric_parser.PARSE_OK, numeric_parser.PARSE_INVALID,
+        numeric_parser.PARSE_CLEANED, numeric_parser.PARSE_INVALID, numeric_parser.PARSE_INVALID,
+        numeric_parser.PARSE_MISSING, numeric_parser.PARSE_OK,
+    ]
+    assert numeric_parser.status_labels(status)[:5].tolist() == ["ok", "cleaned", "missing", "cleaned", "multiple"]
+
+    # 已是数值类型的列：非整数值视为无法解析
+    values, status = numeric_parser.parse_numeric_strings(pd.Series([680.0, 680.5, None]), "Int32")
+    assert values.isna().tolist() == [False, True, True] and status.tolist() == [0, 4, 3]
+
+    # 个别超长取值（如误抓的整段页面文本）不进入定长数组，直接判为无法解析
+    raw = pd.Series([str(n) for n in range(1000)] + ["9" * 20000, "分数" * 10000, "700分"])
+    values, status = numeric_parser.parse_numeric_strings(raw, "Int32")
+    assert values[999] == 999 and values.isna().tolist()[-3:] == [True, True, False]
+    assert status.tolist()[-3:] == [numeric_parser.PARSE_INVALID, numeric_parser.PARSE_INVALID,
+                                    numeric_parser.PARSE_CLEANED]
+
+    # 摘要统计使用同一解析规则
+    summary = create_summary_statistics(pd.DataFrame({"min_score": ["680分", "N/A", "670"]}))
+    assert summary["score_statistics"]["min"] == 670 and summary["score_statistics"]["max"] == 680
+    return True
+
 def test_data_conversion():
     """测试数据转换功能"""
     log_info("测试数据转换功能...")
@@ -69,6 +282,46 @@ def test_data_conversion():
         log_info(f"数据转换测试失败: {e}")
         return False
 
+def test_bulk_standard_format():
+    """测试按列批量转换与分块生成器的输出与逐行转换一致"""
+    log_info("测试标准格式批量转换...")
+
+    import json
+    from data_processing.converter import iter_standard_records
+
+    data = pd.DataFrame({
+        "school": pd.Categorical(["北京大学", "清华大学", "复旦大学", "北京大学", "浙江大学"]),
+        "province": ["北京", "北京", "上海", None, "浙江"],
+        "year": [2023, 2023, 2024, 2024, 2022],
+        "min_score": pd.array([680, None, 670, 660, 650], dtype="Int16"),
+        "data_source": ["阳光高考"] * 5,
+    })
+    expected = [{
+        "school": row.get("school", ""),
+        "major": row.get("major", ""),
+        "province": row.get("province", ""),
+        "year": row.get("year", ""),
+        "min_score": row.get("min_score", ""),
+        "min_rank": row.get("min_rank", ""),
+        "plan_count": row.get("plan_count", ""),
+        "employment": row.get("employment", ""),
+        "missing_years": row.get("missing_years", []),
+        "data_source": row.get("data_source", []),
+    } for _, row in data.iterrows()]
+
+    records = convert_to_standard_format(data)
+    dump = lambda value: json.dumps(value, ensure_ascii=False, default=str)
+    assert dump(records) == dump(expected)
+    assert type(records[0]["year"]) is int and records[1]["min_score"] is pd.NA
+    # 列表默认值每条记录各自独立
+    records[0]["missing_years"].append(2021)
+    assert records[1]["missing_years"] == []
+
+    chunks = list(iter_standard_records(data, chunksize=2))
+    assert [len(chunk) for chunk in chunks] == [2, 2, 1]
+    assert dump([record for chunk in chunks for record in chunk]) == dump(expected)
+    return True
+
 def test_config():
     """测试配置加载"""
     log_info("测试配置加载...")
@@ -83,6 +336,942 @@ def test_config():
         log_info(f"配置加载失败: {e}")
         return False
 
+def test_concurrent_engine():
+    """测试并发爬取引擎"""
+    log_info("测试并发爬取引擎...")
+
+    import threading
+    import time
+    from crawlers.engine import run_concurrent
+
+    lock = threading.Lock()
+    state = {"running": 0, "peak": 0}
+
+    def fake_crawl(year, province):
+        with lock:
+            state["running"] += 1
+            state["peak"] = max(state["peak"], state["running"])
+        time.sleep(0.05)
+        with lock:
+            state["running"] -= 1
+        if province == "失败":
+            raise ValueError("模拟失败")
+        return [{"year": year, "province": province}]
+
+    tasks = [("example.com", fake_crawl, (year, province))
+             for year in [2022, 2023] for province in ["北京", "上海", "失败"]]
+    results = run_concurrent(tasks, concurrency=8, per_host=2)
+
+    assert len(results) == len(tasks)
+    assert results[0] == [{"year": 2022, "province": "北京"}]
+    assert results[2] is None
+    assert state["peak"] <= 2
+
+    # 排在繁忙主机后面的任务不占用全局名额，其他主机的任务可以立即开始
+    started = time.monotonic()
+    starts = {}
+
+    def timed_crawl(name):
+        starts[name] = time.monotonic() - started
+        time.sleep(0.1)
+
+    tasks = [("slow.example.com", timed_crawl, (f"slow{i}",)) for i in range(4)]
+    tasks.append(("fast.example.com", timed_crawl, ("fast",)))
+    run_concurrent(tasks, concurrency=2, per_host=1)
+    assert starts["fast"] < 0.05
+    log_info(f"并发任务峰值: {state['peak']}")
+    return True
+
+def test_fetcher_pools():
+    """测试HTTP抓取器连接池配置"""
+    log_info("测试HTTP抓取器连接池配置...")
+
+    from crawlers.fetcher import Fetcher
+
+    fetcher = Fetcher(pool_maxsize=6, host_pool_sizes={"gaokao.chsi.com.cn": 12}, retries=2)
+    default_adapter = fetcher.session.get_adapter("https://www.bjeea.cn/")
+    host_adapter = fetcher.session.get_adapter("https://gaokao.chsi.com.cn/sch/search.do")
+
+    assert default_adapter._pool_maxsize == 6
+    assert host_adapter._pool_maxsize == 12
+    assert host_adapter.max_retries.total == 2
+    fetcher.close()
+    return True
+
+def _school_page_html(start, total):
+    """构造院校库列表页HTML"""
+    rows = ""
+    for i in range(start, min(start + 20, total)):
+        rows += (f'<tr><td><a href="/sch/schoolInfo--schId-{i}.dhtml">院校{i}</a></td>'
+                 '<td>北京</td><td>教育部</td><td>综合</td><td>本科</td><td>4.5</td><td></td></tr>')
+    return f'<div>共 {total} 条</div><table class="ch-table"><tr><th>院校</th></tr>{rows}</table>'
+
+class _FakeResponse:
+    def __init__(self, text, status_code=200):
+        self.text = text
+        self.status_code = status_code
+        self.headers = {}
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise RuntimeError(f"HTTP {self.status_code}")
+
+def test_parallel_school_pages():
+    """测试院校库并发分页爬取"""
+    log_info("测试院校库并发分页爬取...")
+
+    import crawlers.yangguang as yangguang
+
+    class FakeFetcher:
+        def get(self, url, params=None, headers=None, **kwargs):
+            start = params["start"]
+            # 第二页重复返回首页内容，验证去重
+            page_start = 0 if start == 20 else start
+            return _FakeResponse(_school_page_html(page_start, 45))
+
+    import tempfile
+    import utils.checkpoint as checkpoint
+
+    original, original_dir = yangguang.get_fetcher, checkpoint.CHECKPOINT_DIR
+    with tempfile.TemporaryDirectory() as checkpoint_dir:
+        yangguang.get_fetcher = lambda: FakeFetcher()
+        checkpoint.CHECKPOINT_DIR = checkpoint_dir
+        try:
+            from unittest import mock
+            with mock.patch.object(yangguang, "run_concurrent", wraps=yangguang.run_concurrent) as engine:
+                schools = yangguang.crawl_schools(parallel=True, concurrency=6, resume=False)
+            # 单主机上限随 concurrency 设置，不被默认值截断
+            assert engine.call_args[0][1:] == (6, 6)
+        finally:
+            yangguang.get_fetcher = original
+            checkpoint.CHECKPOINT_DIR = original_dir
+
+    names = [school["院校名称"] for school in schools]
+    assert names == [f"院校{i}" for i in list(range(20)) + list(range(40, 45))]
+    return True
+
+def test_school_details_seen_set():
+    """测试院校详情页爬取与持久化的已抓取URL集合"""
+    log_info("测试院校详情页爬取...")
+
+    import tempfile
+    import crawlers.yangguang as yangguang
+    from utils.seen_set import SeenSet
+
+    requested = []
+
+    class FakeFetcher:
+        def get(self, url, params=None, headers=None, **kwargs):
+            requested.append(url)
+            school_id = url.split("schId-")[1].split(".")[0]
+            return _FakeResponse(f'<div class="sch-intro">简介{school_id}</div>'
+                                 f'<div class="sch-website"><a href="https://www{school_id}.edu.cn">官网</a></div>')
+
+    schools = yangguang.SCHOOL_SPEC.extract_all(
+        yangguang.make_soup(_school_page_html(0, 3), "schools").find_all("tr")[1:])
+    schools.append(dict(schools[0]))  # 跨分页重复的详情页URL
+
+    original = (yangguang.get_fetcher, yangguang.SCHOOL_DETAILS_PATH, yangguang.SCHOOL_DETAIL_SEEN_PATH)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        seen_path = os.path.join(tmp_dir, "school_details.seen")
+        yangguang.get_fetcher = lambda: FakeFetcher()
+        yangguang.SCHOOL_DETAILS_PATH = os.path.join(tmp_dir, "school_details.jsonl")
+        yangguang.SCHOOL_DETAIL_SEEN_PATH = seen_path
+        try:
+            first = yangguang.crawl_school_details(schools, concurrency=2, resume=True)
+            assert len(requested) == 3
+            assert first[1]["院校简介"] == "简介1" and first[1]["官方网址"] == "https://www1.edu.cn"
+            assert first[3]["院校简介"] == "简介0" and first[3]["院校名称"] == "院校0"
+            assert os.path.getsize(seen_path) == 3 * 8
+
+            requested.clear()
+            second = yangguang.crawl_school_details(schools, concurrency=2, resume=True)
+            assert requested == [] and second == first
+            assert schools[0].get("院校简介") is None  # 不修改传入的记录
+
+            seen = SeenSet(seen_path)
+            assert len(seen) == 3 and schools[2]["详情页"] in seen
+            assert seen.add("https://example.com/new") and not seen.add("https://example.com/new")
+        finally:
+            yangguang.get_fetcher, yangguang.SCHOOL_DETAILS_PATH, yangguang.SCHOOL_DETAIL_SEEN_PATH = original
+    return True
+
+def test_concurrent_majors():
+    """测试专业库分类页并发爬取与详情页去重"""
+    log_info("测试专业库并发爬取...")
+
+    import crawlers.yangguang as yangguang
+
+    requested = []
+
+    class FakeFetcher:
+        def get(self, url, params=None, headers=None, **kwargs):
+            requested.append(url)
+            if "zyfx=" in url:
+                code = url.split("zyfx=")[1]
+                if code == "qt":
+                    return _FakeResponse("", status_code=500)
+                # 同一专业出现在两个分类中，详情页只应请求一次
+                items = "".join(
+                    f'<div class="major-info-item" id="{major_code}"><a href="/zyk/zybk/detail/{major_code}">'
+                    f'<span class="major-name">专业{major_code}</span></a>'
+                    f'<p class="major-desc">摘要{major_code}</p><p class="major-career">就业</p></div>'
+                    for major_code in (f"{code}01", "080901")
+                )
+                return _FakeResponse(f"<html><body>{items}</body></html>")
+            major_code = url.rsplit("/", 1)[1]
+            return _FakeResponse(f'<html><body><div class="major-desc">完整简介{major_code}</div></body></html>')
+
+    original = yangguang.get_fetcher
+    yangguang.get_fetcher = lambda: FakeFetcher()
+    try:
+        listed = yangguang.crawl_majors(details=False, concurrency=3)
+        requested.clear()
+        detailed = yangguang.crawl_majors(details=True, concurrency=3)
+    finally:
+        yangguang.get_fetcher = original
+
+    assert len(listed) == 10  # 失败的分类被跳过
+    assert list(listed[0]) == ["name", "code", "category", "intro", "career"]
+    assert [major["category"] for major in listed[::2]] == ["工学", "理学", "文学", "经济学", "医学"]
+    assert listed[0]["intro"] == "摘要gx01"
+    assert sum(url.endswith("/zyk/zybk/detail/080901") for url in requested) == 1
+    assert detailed[0]["intro"] == "完整简介gx01" and detailed[0]["career"] == "就业"
+    assert all(major["intro"] == "完整简介080901" for major in detailed if major["code"] == "080901")
+    return True
+
+def test_province_adapters():
+    """测试省级考试院适配器并发运行、隔离与超时"""
+    log_info("测试省级考试院适配器...")
+
+    from crawlers.provincial import ProvinceAdapter, TableScoreAdapter, PROVINCE_ADAPTERS, crawl_provinces
+
+    assert set(PROVINCE_ADAPTERS) == {"北京", "上海", "广东", "浙江", "江苏", "山东", "河南", "四川", "湖北", "湖南"}
+
+    html = ("<html><head><title>2023年普通批投档线</title></head><body><table>"
+            "<tr><th>院校名称</th><th>专业</th><th>投档线</th><th>位次</th></tr>"
+            "<tr><td>北京大学</td><td>计算机</td><td>680</td><td>120</td></tr>"
+            "<tr><td></td><td>空行</td><td></td><td></td></tr></table></body></html>")
+
+    class StaticAdapter(TableScoreAdapter):
+        def fetch(self):
+            return html
+
+    class SlowAdapter(TableScoreAdapter):
+        def crawl(self):
+            time.sleep(2)
+            return [{"school": "不应返回"}]
+
+    class BrokenAdapter(TableScoreAdapter):
+        def fetch(self):
+            raise RuntimeError("模拟站点错误")
+
+    adapters = {
+        "北京": StaticAdapter("北京", "http://bj.example.com/"),
+        "上海": SlowAdapter("上海", "http://sh.example.com/", timeout=0.2),
+        "广东": BrokenAdapter("广东", "http://gd.example.com/"),
+        "浙江": StaticAdapter("浙江", "http://zj.example.com/"),
+    }
+    started = time.monotonic()
+    records = crawl_provinces(["上海", "北京", "广东", "浙江", "西藏"], workers=4, adapters=adapters)
+    assert time.monotonic() - started < 1.5  # 慢站点不阻塞其他省份
+    assert records == [
+        {"school": "北京大学", "major": "计算机", "min_score": "680", "min_rank": "120",
+         "plan_count": "", "year": 2023, "province": province}
+        for province in ("北京", "浙江")
+    ]
+
+    # 基类必须由子类实现 parse
+    try:
+        ProvinceAdapter("北京", "http://bj.example.com/")
+        assert False, "ProvinceAdapter 是抽象类"
+    except TypeError:
+        pass
+
+    # fetch 受总时限约束：持续缓慢返回数据的站点也会在 timeout 后中断
+    from unittest import mock
+    import crawlers.provincial as provincial
+
+    class TrickleResponse(_FakeResponse):
+        encoding = "utf-8"
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *args):
+            return False
+
+        def iter_content(self, chunk_size):
+            while True:
+                time.sleep(0.05)
+                yield b"<tr>"
+
+    class TrickleFetcher:
+        def get(self, url, stream=False, **kwargs):
+            assert stream
+            return TrickleResponse("")
+
+    with mock.patch.object(provincial, "get_fetcher", TrickleFetcher):
+        started = time.monotonic()
+        try:
+            TableScoreAdapter("上海", "http://sh.example.com/", timeout=0.2).fetch()
+            assert False, "应抛出 TimeoutError"
+        except TimeoutError:
+            pass
+        assert time.monotonic() - started < 1
+    return True
+
+def test_adaptive_rate_limiter():
+    """测试自适应限速器"""
+    log_info("测试自适应限速器...")
+
+    from crawlers.rate_limiter import AdaptiveRateLimiter
+
+    limiter = AdaptiveRateLimiter("example.com", initial=4.0, min_rate=0.5, max_rate=5.0,
+                                  burst=1, increase=0.5, decrease=0.5)
+    limiter.on_success()
+    assert limiter.rate == 4.5
+    limiter.on_success()
+    limiter.on_success()
+    assert limiter.rate == 5.0
+    limiter.on_throttle("HTTP 429")
+    assert limiter.rate == 2.5
+    for _ in range(5):
+        limiter.on_throttle("HTTP 503")
+    assert limiter.rate == 0.5
+
+    limiter = AdaptiveRateLimiter("example.com", initial=50.0, max_rate=50.0, burst=1)
+    started = time.monotonic()
+    for _ in range(4):
+        limiter.acquire()
+    assert time.monotonic() - started >= 0.05
+    return True
+
+def test_http_cache_revalidation():
+    """测试HTTP缓存的条件请求与LRU淘汰"""
+    log_info("测试HTTP缓存...")
+
+    import tempfile
+    import requests
+    from crawlers.fetcher import Fetcher
+    from crawlers.http_cache import HttpCache
+
+    def make_response(status_code, text="", headers=None):
+        resp = requests.Response()
+        resp.status_code = status_code
+        resp._content = text.encode("utf-8")
+        resp.encoding = "utf-8"
+        resp.headers.update(headers or {})
+        return resp
+
+    sent_headers = []
+
+    def fake_get(url, params=None, headers=None, **kwargs):
+        sent_headers.append(dict(headers or {}))
+        if headers and headers.get("If-None-Match") == '"v1"':
+            return make_response(304)
+        return make_response(200, "<html>院校</html>", {"ETag": '"v1"', "Content-Type": "text/html"})
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cache = HttpCache(cache_dir, max_bytes=1024 * 1024, default_ttl=0, ttl_rules=[(r"/zyk/", 3600)])
+        fetcher = Fetcher(cache=cache)
+        fetcher.session.get = fake_get
+
+        first = fetcher.get("https://example.com/sch/search.do", params={"start": 0})
+        second = fetcher.get("https://example.com/sch/search.do", params={"start": 0})
+        assert first.text == second.text == "<html>院校</html>"
+        assert sent_headers[1].get("If-None-Match") == '"v1"'
+        assert getattr(second, "from_cache", False)
+
+        fetcher.get("https://example.com/zyk/")
+        fetcher.get("https://example.com/zyk/")
+        assert len(sent_headers) == 3  # TTL内不发请求
+
+        small = HttpCache(cache_dir + "/small", max_bytes=40, default_ttl=3600)
+        small.store("https://example.com/a", make_response(200, "a" * 30))
+        small.store("https://example.com/b", make_response(200, "b" * 30))
+        assert small.lookup("https://example.com/a")[1] is None
+        assert small.lookup("https://example.com/b")[2] == "b" * 30
+        cache.index.flush()
+        small.index.flush()
+    return True
+
+def test_archive_reparse():
+    """测试响应归档与离线重新解析"""
+    log_info("测试响应归档与离线重新解析...")
+
+    import tempfile
+    import requests
+    from crawlers.fetcher import Fetcher
+    from crawlers.http_cache import HttpCache
+    from crawlers.archive import ResponseArchive, read_archived
+    from utils.io_tools import read_jsonl
+    import crawlers.yangguang as yangguang
+
+    score_html = ('<div class="score-item"><span class="school-name">北京大学</span>'
+                  '<span class="major-name">计算机</span><span class="min-score">680</span>'
+                  '<span class="min-rank">120</span><span class="plan-count">10</span></div>')
+
+    def fake_get(url, params=None, headers=None, **kwargs):
+        resp = requests.Response()
+        resp.status_code = 200
+        resp.url = HttpCache.full_url(url, params)
+        text = _school_page_html(params["start"], 25) if "/sch/" in url else score_html
+        resp._content = text.encode("gbk")
+        resp.encoding = "gbk"
+        resp.headers.update({"Content-Type": "text/html"})
+        return resp
+
+    with tempfile.TemporaryDirectory() as archive_dir:
+        fetcher = Fetcher(archive=ResponseArchive(archive_dir, max_segment_bytes=1200))
+        fetcher.session.get = fake_get
+        original = yangguang.get_fetcher
+        yangguang.get_fetcher = lambda: fetcher
+        try:
+            live_schools = [row for start in (0, 20) for row in yangguang._fetch_school_page(start)[1]]
+            yangguang._fetch_school_page(0)  # 重复归档同一URL，离线解析只取最新一条
+            live_scores = yangguang._fetch_scores(2023, "北京")
+        finally:
+            yangguang.get_fetcher = original
+
+        segments = [name for name in os.listdir(archive_dir) if name.endswith(".warc.gz")]
+        assert len(segments) > 1  # 超过段大小上限后切换段文件
+        first = next(read_jsonl(os.path.join(archive_dir, "index.jsonl")))
+        url, html = read_archived(archive_dir, first)
+        assert url.endswith("start=0") and "院校0" in html
+
+        results = yangguang.reparse_archived_pages(archive_dir, workers=2)
+        assert results["schools"] == live_schools
+        assert results["scores"] == live_scores
+        assert results["majors"] == []
+    return True
+
+def test_checkpoint_resume():
+    """测试分数线爬取的断点续爬"""
+    log_info("测试断点续爬...")
+
+    import tempfile
+    import crawlers.yangguang as yangguang
+    import utils.checkpoint as checkpoint
+
+    calls = []
+    failing = {("2023", "上海")}
+
+    def fake_fetch(year, province):
+        calls.append((year, province))
+        if (str(year), province) in failing:
+            raise RuntimeError("模拟网络错误")
+        return [{"year": year, "province": province}]
+
+    import utils.retry as retry
+
+    original_fetch, original_dir = yangguang._fetch_scores, checkpoint.CHECKPOINT_DIR
+    original_delay, original_queue = retry.UNIT_RETRY_BASE_DELAY, retry._dead_letters
+    with tempfile.TemporaryDirectory() as checkpoint_dir:
+        yangguang._fetch_scores = fake_fetch
+        checkpoint.CHECKPOINT_DIR = checkpoint_dir
+        retry.UNIT_RETRY_BASE_DELAY = 0
+        retry._dead_letters = retry.DeadLetterQueue(os.path.join(checkpoint_dir, "dead_letters.jsonl"))
+        try:
+            first = yangguang.crawl_scores_grid([2022, 2023], ["北京", "上海"], resume=True)
+            assert len(first) == 3
+            assert len(checkpoint.CheckpointStore("scores")) == 3
+
+            failing.clear()
+            calls.clear()
+            second = yangguang.crawl_scores_grid([2022, 2023], ["北京", "上海"], resume=True)
+            assert calls == [(2023, "上海")]
+            assert [(r["year"], r["province"]) for r in second] == [
+                (2022, "北京"), (2022, "上海"), (2023, "北京"), (2023, "上海")]
+            assert len(checkpoint.CheckpointStore("scores")) == 0  # 全部完成后清除
+        finally:
+            yangguang._fetch_scores = original_fetch
+            checkpoint.CHECKPOINT_DIR = original_dir
+            retry.UNIT_RETRY_BASE_DELAY = original_delay
+            retry._dead_letters = original_queue
+    return True
+
+def test_retry_and_dead_letters():
+    """测试指数退避重试与死信队列重放"""
+    log_info("测试重试与死信队列...")
+
+    import tempfile
+    from utils.retry import retry_call, DeadLetterQueue
+
+    attempts = []
+
+    def flaky(value):
+        attempts.append(value)
+        if len(attempts) < 3:
+            raise RuntimeError("模拟失败")
+        return value * 2
+
+    assert retry_call(flaky, 21, attempts=3, base_delay=0) == 42
+    assert len(attempts) == 3
+
+    attempts.clear()
+    try:
+        retry_call(flaky, 1, attempts=2, base_delay=0)
+        assert False, "应抛出最后一次的异常"
+    except RuntimeError:
+        pass
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        queue = DeadLetterQueue(os.path.join(tmp_dir, "dead_letters.jsonl"))
+        queue.push("scores", {"year": 2023, "province": "北京"}, "超时")
+        queue.push("scores", {"year": 2023, "province": "北京"}, "再次超时")
+        queue.push("unknown", {"id": 1}, "错误")
+        assert len(queue.peek()) == 2
+
+        replayed = []
+        succeeded, failed = queue.replay({"scores": replayed.append})
+        assert (succeeded, failed) == (1, 1)
+        assert replayed == [{"year": 2023, "province": "北京"}]
+        assert [record["kind"] for record in queue.peek()] == ["unknown"]
+
+        # 单元在之后的正常运行中成功：删除其失败记录，不再重放
+        queue.push("scores", {"year": 2024, "province": "上海"}, "超时")
+        queue.resolve("scores", {"province": "上海", "year": 2024})
+        queue.resolve("scores", {"year": 2025, "province": "上海"})
+        assert [record["kind"] for record in queue.peek()] == ["unknown"]
+
+    # 请求异常已由下层重试，单元级不再重试
+    import requests
+    calls = []
+
+    def server_error():
+        calls.append(1)
+        raise requests.HTTPError("500 Server Error")
+
+    try:
+        retry_call(server_error, attempts=3, base_delay=0)
+        assert False, "应抛出请求异常"
+    except requests.HTTPError:
+        pass
+    assert len(calls) == 1
+    return True
+
+def test_proxy_rotation():
+    """测试代理池健康度评分与轮换"""
+    log_info("测试代理池轮换...")
+
+    from crawlers.rotation import ProxyPool, UserAgentPool
+
+    pool = ProxyPool(["http://fast:8080", "http://slow:8080", "http://dead:8080"],
+                     alpha=0.5, max_failure_rate=0.6, cooldown=60)
+    for _ in range(5):
+        pool.report("http://fast:8080", True, 0.1)
+        pool.report("http://slow:8080", True, 2.0)
+    pool.report("http://dead:8080", False)
+    pool.report("http://dead:8080", False)
+
+    chosen = [pool.choose() for _ in range(200)]
+    assert "http://dead:8080" not in chosen  # 冷却中
+    assert chosen.count("http://fast:8080") > chosen.count("http://slow:8080")
+    assert pool.summary()["http://dead:8080"]["requests"] == 2
+    assert ProxyPool([]).choose() is None
+
+    ua_pool = UserAgentPool()
+    assert ua_pool.random() and ua_pool.random()
+    return True
+
+def test_parsing_backends():
+    """测试HTML解析后端只解析目标子树且结果一致"""
+    log_info("测试HTML解析后端...")
+
+    from crawlers.parsing import make_soup
+    from crawlers.yangguang import _parse_school_rows
+
+    html = "<ul><li>导航</li></ul>" + _school_page_html(0, 3) + "<footer>页脚</footer>"
+    results = {}
+    for backend in ["html.parser", "strainer", "lxml"]:
+        soup = make_soup(html, "schools", backend)
+        results[backend] = _parse_school_rows(soup)
+        if backend != "html.parser":
+            assert soup.find("footer") is None
+    assert results["strainer"] == results["lxml"] == results["html.parser"]
+    assert len(results["lxml"]) == 3
+    return True
+
+def test_extraction_specs():
+    """测试声明式字段提取规则"""
+    log_info("测试声明式字段提取...")
+
+    from bs4 import BeautifulSoup
+    from crawlers.yangguang import SCORE_SPEC, MAJOR_SPEC
+
+    html = ('<div class="score-item"><span class="school-name"> 北京大学 </span>'
+            '<span class="min-score">680</span><span class="min-rank">120</span></div>'
+            '<div class="major-info-item" id="080901"><span class="major-name">计算机科学与技术</span></div>')
+    soup = BeautifulSoup(html, "html.parser")
+
+    scores = SCORE_SPEC.extract_all(soup.select(".score-item"), {"year": 2023, "province": "北京"})
+    assert scores == [{"school": "北京大学", "major": "", "min_score": "680", "min_rank": "120",
+                       "plan_count": "", "year": 2023, "province": "北京"}]
+
+    majors = MAJOR_SPEC.extract_all(soup.select(".major-info-item"), {"category": "工学"})
+    assert list(majors[0].items()) == [("name", "计算机科学与技术"), ("code", "080901"),
+                                       ("category", "工学"), ("intro", ""), ("career", "")]
+    return True
+
+def test_streaming_download_dedupe():
+    """测试流式下载与内容哈希去重"""
+    log_info("测试流式下载去重...")
+
+    import hashlib
+    import tempfile
+    from crawlers.downloader import ContentStore
+
+    content = b"%PDF-1.4 " + b"x" * 200000
+    requested = []
+    conditional = []
+
+    class StreamResponse(_FakeResponse):
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *args):
+            return False
+
+        def iter_content(self, chunk_size):
+            for i in range(0, len(content), chunk_size):
+                yield content[i:i + chunk_size]
+
+    class FakeFetcher:
+        def get(self, url, stream=False, headers=None, **kwargs):
+            assert stream
+            requested.append(url)
+            if headers and headers.get("If-None-Match") == '"v1"' and content.startswith(b"%PDF-1.4"):
+                conditional.append(url)
+                return StreamResponse("", status_code=304)
+            resp = StreamResponse("")
+            resp.headers = {"ETag": '"v1"'}
+            return resp
+
+    with tempfile.TemporaryDirectory() as download_dir:
+        store = ContentStore(download_dir)
+        path, digest, is_new = store.download(FakeFetcher(), "https://example.com/a.pdf", suffix=".pdf")
+        assert digest == hashlib.sha256(content).hexdigest()
+        assert path == os.path.join(download_dir, f"{digest}.pdf") and is_new
+
+        path2, _, is_new2 = store.download(FakeFetcher(), "https://example.com/b.pdf", suffix=".pdf")
+        assert path2 == path and not is_new2
+
+        ContentStore(download_dir).download(FakeFetcher(), "https://example.com/a.pdf", suffix=".pdf")
+        assert requested == ["https://example.com/a.pdf", "https://example.com/b.pdf"]
+        assert sorted(os.listdir(download_dir)) == sorted([f"{digest}.pdf", "index.json"])
+
+        # 校验有效期过后发起条件请求：304沿用已有文件，同一URL重新发布的内容重新下载
+        expired = ContentStore(download_dir, revalidate_after=0)
+        assert expired.download(FakeFetcher(), "https://example.com/a.pdf", suffix=".pdf") == (path, digest, False)
+        assert conditional == ["https://example.com/a.pdf"]
+        content = b"%PDF-1.5 " + b"y" * 1000
+        path3, digest3, is_new3 = expired.download(FakeFetcher(), "https://example.com/a.pdf", suffix=".pdf")
+        assert is_new3 and digest3 == hashlib.sha256(content).hexdigest() and path3 != path
+    return True
+
+def test_dataset_mirror_loader():
+    """测试第三方数据集分块加载、本地镜像与解析缓存"""
+    log_info("测试第三方数据集加载...")
+
+    import tempfile
+    from unittest import mock
+    import crawlers.provincial as provincial
+    from crawlers.dataset_mirror import DatasetMirror
+    from data_processing.dataset_loader import read_dataset
+
+    state = {"content": ("院校名称,专业名称,年份,最低分,最低位次,备注\n"
+                         "北京大学,计算机,2023,680,120,无关列\n"
+                         "清华大学,软件工程,2023,—,,\n"
+                         "复旦大学,数学,2022,650,900,\n").encode("utf-8"),
+             "etag": '"v1"'}
+    requested = []
+
+    class StreamResponse(_FakeResponse):
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *args):
+            return False
+
+        def iter_content(self, chunk_size):
+            for i in range(0, len(state["content"]), chunk_size):
+                yield state["content"][i:i + chunk_size]
+
+    class FakeFetcher:
+        def get(self, url, headers=None, stream=False, **kwargs):
+            requested.append(dict(headers or {}))
+            if (headers or {}).get("If-None-Match") == state["etag"]:
+                return StreamResponse("", status_code=304)
+            resp = StreamResponse("")
+            resp.headers = {"ETag": state["etag"]}
+            return resp
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        csv_path = os.path.join(tmp_dir, "scores.csv")
+        with open(csv_path, 'wb') as f:
+            f.write(state["content"])
+        df = read_dataset(csv_path, chunksize=2)
+        assert list(df.columns) == ["school", "major", "year", "min_score", "min_rank"]
+        assert str(df["year"].dtype) == "Int16" and str(df["min_rank"].dtype) == "Int32"
+        assert df["min_score"].isna().tolist() == [False, True, False]
+        assert df["min_rank"].tolist()[0] == 120
+
+        # 非整数、超出Int16范围、带单位的数值：记为缺失或清洗后解析，不中断整个加载
+        dirty_path = os.path.join(tmp_dir, "dirty.csv")
+        with open(dirty_path, 'w', encoding='utf-8') as f:
+            f.write("院校名称,年份,最低分,最低位次\n"
+                    "北京大学,99999,680.5,1234.5\n"
+                    "清华大学,2023,690,\"1,200\"\n")
+        dirty = read_dataset(dirty_path, chunksize=1)
+        assert str(dirty["year"].dtype) == "Int16" and str(dirty["min_rank"].dtype) == "Int32"
+        assert dirty["year"].isna().tolist() == [True, False]
+        assert dirty["min_rank"].isna().tolist()[0] and dirty["min_rank"].tolist()[1] == 1200
+        assert dirty["min_score"].tolist()[0] == 680.5
+
+        url = "https://raw.githubusercontent.com/example/gaokao-data/main/scores.csv"
+        mirror = DatasetMirror(os.path.join(tmp_dir, "mirror"))
+        with mock.patch.object(provincial, "get_dataset_mirror", return_value=mirror), \
+                mock.patch.object(provincial, "get_fetcher", return_value=FakeFetcher()), \
+                mock.patch.object(provincial, "read_dataset", wraps=read_dataset) as reader:
+            first = provincial.load_github_dataset(url)
+            second = provincial.load_github_dataset(url)  # 304：不重新下载也不重新解析
+            assert requested[1].get("If-None-Match") == '"v1"'
+            state["etag"] = '"v2"'  # ETag变化但内容相同：内容哈希一致，仍不重新解析
+            third = provincial.load_github_dataset(url)
+            assert reader.call_count == 1
+            state["content"] += "浙江大学,物理,2023,670,300,\n".encode("utf-8")
+            state["etag"] = '"v3"'
+            fourth = provincial.load_github_dataset(url)
+            assert reader.call_count == 2
+        assert first.equals(second) and first.equals(third)
+        assert len(fourth) == 4 and fourth["school"].iloc[-1] == "浙江大学"
+    return True
+
+def _make_pdf(page_texts):
+    """构造包含若干页ASCII文本的最小PDF"""
+    count = len(page_texts)
+    kids = " ".join(f"{4 + 2 * i} 0 R" for i in range(count))
+    objects = [
+        "<< /Type /Catalog /Pages 2 0 R >>",
+        f"<< /Type /Pages /Kids [{kids}] /Count {count} >>",
+        "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    for i, text in enumerate(page_texts):
+        stream = f"BT /F1 12 Tf 72 720 Td ({text}) Tj ET"
+        objects.append(f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+                       f"/Resources << /Font << /F1 3 0 R >> >> /Contents {5 + 2 * i} 0 R >>")
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream")
+    data = b"%PDF-1.4\n"
+    offsets = []
+    for i, obj in enumerate(objects):
+        offsets.append(len(data))
+        data += f"{i + 1} 0 obj\n{obj}\nendobj\n".encode()
+    xref = len(data)
+    data += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    data += "".join(f"{offset:010d} 00000 n \n" for offset in offsets).encode()
+    data += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    return data
+
+def test_concurrent_admission_rules():
+    """测试按院校库ID并发爬取招生章程并流式落盘"""
+    log_info("测试招生章程并发爬取...")
+
+    import json
+    import tempfile
+    import crawlers.yangguang as yangguang
+    import utils.retry as retry
+
+    schools = [
+        {"详情页": "https://gaokao.chsi.com.cn/sch/schoolInfo--schId-101.dhtml"},
+        {"详情页": "https://gaokao.chsi.com.cn/zsgs/zhangcheng/listVerifedZszc.do?schoolid=102"},
+        {"详情页": "https://gaokao.chsi.com.cn/sch/schoolInfo--schId-101.dhtml"},
+        {"详情页": "", "院校名称": "无详情页"},
+        {"详情页": "https://gaokao.chsi.com.cn/sch/schoolInfo--schId-103.dhtml"},
+    ]
+    school_ids = yangguang.school_ids_from_schools(schools)
+    assert school_ids == [101, 102, 103]
+
+    calls = []
+    failing = {102}
+
+    def fake_source(school_id):
+        calls.append(school_id)
+        if school_id in failing:
+            raise RuntimeError("模拟网络错误")
+        if school_id == 101:
+            return "pdf", f"/tmp/{school_id}.pdf"
+        return "html", {"body_check": f"院校{school_id}"} if school_id != 103 else {}
+
+    extracted = []
+    pdf_failing = {"/tmp/101.pdf"}
+
+    def fake_batch(pdf_paths, workers=None):
+        extracted.append(list(pdf_paths))
+        # 提取超时或出错的PDF结果为 {}
+        return {path: {} if path in pdf_failing else {"body_check": "院校101"} for path in pdf_paths}
+
+    import utils.checkpoint as checkpoint
+    from unittest import mock
+    original_delay, original_queue = retry.UNIT_RETRY_BASE_DELAY, retry._dead_letters
+    with tempfile.TemporaryDirectory() as tmp_dir, \
+            mock.patch.object(yangguang, "_fetch_admission_source", fake_source), \
+            mock.patch.object(yangguang, "batch_pdf_to_text", fake_batch), \
+            mock.patch.object(checkpoint, "CHECKPOINT_DIR", os.path.join(tmp_dir, "checkpoints")):
+        output_path = os.path.join(tmp_dir, "admission_rules.jsonl")
+        retry.UNIT_RETRY_BASE_DELAY = 0
+        retry._dead_letters = retry.DeadLetterQueue(os.path.join(tmp_dir, "dead_letters.jsonl"))
+        try:
+            first = yangguang.crawl_admission_rules_concurrent(school_ids, output_path, workers=2, resume=True)
+            assert first == []
+            # PDF在线程中只下载，统一交给批量提取
+            assert extracted == [["/tmp/101.pdf"]]
+            # PDF提取失败的院校与请求失败的院校一样：不写入输出、不标记完成，进入死信队列
+            with open(output_path, 'r', encoding='utf-8') as f:
+                assert sorted(json.loads(line)["school_id"] for line in f) == [103]
+            assert sorted(item["payload"]["school_id"] for item in retry._dead_letters.peek()) == [101, 102]
+
+            failing.clear()
+            pdf_failing.clear()
+            calls.clear()
+            second = yangguang.crawl_admission_rules_concurrent(school_ids, output_path, workers=2, resume=True)
+            assert sorted(calls) == [101, 102]
+            assert retry._dead_letters.peek() == []
+            assert [item["school_id"] for item in second] == [101, 102]
+            with open(output_path, 'r', encoding='utf-8') as f:
+                assert sorted(json.loads(line)["school_id"] for line in f) == [101, 102, 103]
+
+            # 上一轮全部完成后断点已清除：再次运行重新爬取全部院校，输出文件重写
+            calls.clear()
+            yangguang.crawl_admission_rules_concurrent(school_ids, output_path, workers=2, resume=True)
+            assert sorted(calls) == [101, 102, 103]
+            with open(output_path, 'r', encoding='utf-8') as f:
+                assert len(f.readlines()) == 3
+        finally:
+            retry.UNIT_RETRY_BASE_DELAY = original_delay
+            retry._dead_letters = original_queue
+    return True
+
+def test_batch_pdf_extraction():
+    """测试多进程批量PDF提取"""
+    log_info("测试批量PDF提取...")
+
+    import tempfile
+    from data_processing.converter import pdf_to_text, extract_pdf_text
+    import time
+    from concurrent.futures import ProcessPoolExecutor
+    from data_processing.pdf_batch import batch_pdf_to_text, _page_ranges, _shutdown
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        large = os.path.join(tmp_dir, "large.pdf")
+        small = os.path.join(tmp_dir, "small.pdf")
+        broken = os.path.join(tmp_dir, "broken.pdf")
+        with open(large, 'wb') as f:
+            f.write(_make_pdf([f"page {i}" for i in range(5)]))
+        with open(small, 'wb') as f:
+            f.write(_make_pdf(["single page"]))
+        with open(broken, 'wb') as f:
+            f.write(b"not a pdf")
+
+        assert _page_ranges(5, 2) == [(0, 2), (2, 4), (4, 5)]
+        assert extract_pdf_text(large, (1, 3)) == "page 1\npage 2\n"
+
+        import data_processing.text_cache as text_cache
+        original_dir = text_cache.PDF_TEXT_CACHE_DIR
+        text_cache.PDF_TEXT_CACHE_DIR = os.path.join(tmp_dir, "cache")
+        try:
+            results = batch_pdf_to_text([large, small, broken, None], workers=2, timeout=60, pages_per_chunk=2)
+            assert set(results) == {large, small, broken}
+            assert results[large] == pdf_to_text(large)
+            assert results[broken] == {}
+        finally:
+            text_cache.get_pdf_text_cache(1).index.flush()
+            text_cache.PDF_TEXT_CACHE_DIR = original_dir
+
+    # 卡住的工作进程被终止，关闭进程池不会等待其结束
+    executor = ProcessPoolExecutor(max_workers=1)
+    executor.submit(time.sleep, 30)
+    time.sleep(0.5)
+    started = time.monotonic()
+    _shutdown(executor, terminate=True)
+    assert time.monotonic() - started < 5
+    return True
+
+def test_pdf_text_cache():
+    """测试PDF提取结果缓存：命中、版本失效与LRU淘汰"""
+    log_info("测试PDF提取缓存...")
+
+    import tempfile
+    from unittest import mock
+    import data_processing.converter as converter
+    from data_processing.text_cache import PdfTextCache
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        pdf_path = os.path.join(tmp_dir, "a.pdf")
+        with open(pdf_path, 'wb') as f:
+            f.write(_make_pdf(["admission charter"]))
+        cache_dir = os.path.join(tmp_dir, "cache")
+
+        cache = PdfTextCache(1, cache_dir)
+        with mock.patch.object(converter, "get_pdf_text_cache", return_value=cache), \
+                mock.patch.object(converter, "extract_pdf_text", wraps=converter.extract_pdf_text) as extract:
+            first = converter.pdf_to_text(pdf_path)
+            second = converter.pdf_to_text(pdf_path)
+        assert first == second
+        assert extract.call_count == 1
+        assert cache.get(pdf_path)["text"].startswith("admission charter")
+        cache.index.flush()
+
+        # 提取逻辑版本变化后旧条目全部失效
+        upgraded = PdfTextCache(2, cache_dir)
+        assert upgraded.get(pdf_path) is None and len(upgraded.index) == 0
+
+        # 超出容量时淘汰最久未访问的条目
+        other_path = os.path.join(tmp_dir, "b.pdf")
+        with open(other_path, 'wb') as f:
+            f.write(_make_pdf(["another charter"]))
+        small = PdfTextCache(1, os.path.join(tmp_dir, "small"), max_bytes=150)
+        small.put(pdf_path, "x" * 100, {})
+        small.put(other_path, "y" * 100, {})
+        assert small.get(pdf_path) is None
+        assert small.get(other_path)["text"] == "y" * 100
+        upgraded.index.flush()
+        small.index.flush()
+    return True
+
+def test_single_pass_rule_extraction():
+    """测试单次扫描的多关键词规则提取"""
+    log_info("测试单次扫描规则提取...")
+
+    import random
+    from data_processing.converter import extract_rules, RULE_CATEGORIES
+
+    random.seed(7)
+    vocabulary = ["体检", "身体", "健康", "单科", "数学", "录取", "投档", "特殊", "要求", "说明", "附则"]
+    lines = [f"第{i}行" + "".join(random.sample(vocabulary, 2)) if random.random() < 0.3 else f"第{i}行 其他内容"
+             for i in range(200)]
+    text = "\n".join(lines)
+    rules = extract_rules(text)
+
+    for category, (triggers, keywords) in RULE_CATEGORIES.items():
+        if triggers is not None and not any(trigger in text for trigger in triggers):
+            assert rules[category] == ""
+            continue
+        # 参照实现：原有的逐行扫描+上下文窗口，去掉重复行
+        expected = set()
+        for i, line in enumerate(lines):
+            if any(keyword in line for keyword in keywords):
+                expected.update(range(max(0, i - 3), min(len(lines), i + 4)))
+        assert rules[category] == "\n".join(lines[i] for i in sorted(expected))
+
+    # 互为前缀（政策/政策性）或起始位置不同而重叠（体检/检查）的关键词都能命中
+    from data_processing.converter import extract_section, _compile_keywords, _scan_keyword_lines
+    text = "一、政策性加分\n二、其他\n三、体检查验"
+    _, hits = _scan_keyword_lines(text, _compile_keywords(["政策", "政策性", "体检", "检查"]))
+    assert hits == {"政策": {0}, "政策性": {0}, "体检": {2}, "检查": {2}}
+    assert extract_section(text, ["政策"], context_lines=0) == "一、政策性加分"
+    return True
+
 def main():
     """运行所有测试"""
     setup_logger()
@@ -92,7 +1281,32 @@ def main():
         ("配置加载", test_config),
         ("User-Agent生成", test_user_agent),
         ("数据清洗", test_data_cleaning),
-        ("数据转换", test_data_conversion)
+        ("名称标准化缓存", test_memoized_name_normalization),
+        ("数据转换", test_data_conversion),
+        ("并发爬取引擎", test_concurrent_engine),
+        ("HTTP抓取器", test_fetcher_pools),
+        ("院校库并发分页", test_parallel_school_pages),
+        ("院校详情页爬取", test_school_details_seen_set),
+        ("专业库并发爬取", test_concurrent_majors),
+        ("省级考试院适配器", test_province_adapters),
+        ("自适应限速器", test_adaptive_rate_limiter),
+        ("HTTP缓存", test_http_cache_revalidation),
+        ("响应归档与离线解析", test_archive_reparse),
+        ("断点续爬", test_checkpoint_resume),
+        ("重试与死信队列", test_retry_and_dead_letters),
+        ("代理池轮换", test_proxy_rotation),
+        ("HTML解析后端", test_parsing_backends),
+        ("声明式字段提取", test_extraction_specs),
+        ("流式下载去重", test_streaming_download_dedupe),
+        ("第三方数据集加载", test_dataset_mirror_loader),
+        ("招生章程并发爬取", test_concurrent_admission_rules),
+        ("批量PDF提取", test_batch_pdf_extraction),
+        ("PDF提取缓存", test_pdf_text_cache),
+        ("单次扫描规则提取", test_single_pass_rule_extraction),
+        ("分类类型记录表", test_categorical_record_frames),
+        ("typed缺失值模式", test_typed_missing_values),
+        ("数值字符串解析", test_numeric_string_parser),
+        ("标准格式批量转换", test_bulk_standard_format)
     ]
     
     passed = 0
@@ -100,7 +1314,12 @@ def main():
     
     for test_name, test_func in tests:
         log_info(f"运行测试: {test_name}")
-        if test_func():
+        try:
+            result = test_func()
+        except AssertionError as e:
+            log_info(f"断言失败: {e}")
+            result = False
+        if result:
             log_info(f"✓ {test_name} 测试通过")
             passed += 1
         else:
@@ -0,0 +1,63 @@
+# utils/checkpoint.py
+import json
+import os
+import threading
+from utils.io_tools import ensure_dir
+from utils.log import log_info
+from config import CHECKPOINT_DIR
+
+class CheckpointStore:
+    """
+    断点续爬记录（追加写入的JSONL文件）
+    每完成一个爬取单元（分页偏移、年份/省份任务等）立即落盘其结果，
+    下次以续爬模式运行时直接复用已完成单元，只爬取剩余部分
+    """
+
+    def __init__(self, name, resume=True, checkpoint_dir=None):
+        self.name = name
+        self.path = os.path.join(checkpoint_dir or CHECKPOINT_DIR, f"{name}.jsonl")
+        self._lock = threading.Lock()
+        self._done = {}
+        if resume:
+            self._load()
+            if self._done:
+                log_info(f"[断点续爬] {name}: 已完成 {len(self._done)} 个单元，将跳过")
+        else:
+            self.clear()
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue  # 崩溃时可能留下不完整的最后一行
+                self._done[record["unit"]] = record.get("result")
+
+    def __len__(self):
+        return len(self._done)
+
+    def is_done(self, unit):
+        return str(unit) in self._done
+
+    def get(self, unit, default=None):
+        return self._done.get(str(unit), default)
+
+    def mark_done(self, unit, result=None):
+        """记录单元已完成及其结果"""
+        unit = str(unit)
+        line = json.dumps({"unit": unit, "result": result}, ensure_ascii=False)
+        with self._lock:
+            ensure_dir(self.path)
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(line + "\n")
+            self._done[unit] = result
+
+    def clear(self):
+        """整个任务完成后清除记录，下次从头爬取"""
+        with self._lock:
+            self._done = {}
+            if os.path.exists(self.path):
+                os.remove(self.path)
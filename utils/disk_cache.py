@@ -0,0 +1,105 @@
+# utils/disk_cache.py
+import atexit
+import json
+import os
+import threading
+import time
+from utils.io_tools import ensure_dir
+
+class DiskLRUIndex:
+    """
+    磁盘缓存索引（JSON文件）
+    记录每个缓存条目的元数据与大小，按最近访问时间淘汰超出容量的条目
+    """
+
+    def __init__(self, index_path, max_bytes, on_evict=None, flush_every=50):
+        self.index_path = index_path
+        self.max_bytes = max_bytes
+        self.on_evict = on_evict
+        self.flush_every = flush_every
+        self._lock = threading.RLock()
+        self._pending = 0
+        self._entries = self._load()
+        self._total_bytes = sum(entry.get("size", 0) for entry in self._entries.values())
+        atexit.register(self.flush)
+
+    def _load(self):
+        if os.path.exists(self.index_path):
+            try:
+                with open(self.index_path, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+            except (OSError, ValueError):
+                pass
+        return {}
+
+    def __len__(self):
+        return len(self._entries)
+
+    def keys(self):
+        """当前全部条目的键（快照）"""
+        with self._lock:
+            return list(self._entries)
+
+    @property
+    def total_bytes(self):
+        return self._total_bytes
+
+    def get(self, key):
+        """读取条目元数据并更新访问时间，不存在时返回None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry["last_access"] = time.time()
+                self._mark_dirty()
+            return entry
+
+    def put(self, key, entry):
+        """写入或替换条目，写入后按容量淘汰最久未访问的条目"""
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._total_bytes -= old.get("size", 0)
+            entry["last_access"] = time.time()
+            self._entries[key] = entry
+            self._total_bytes += entry.get("size", 0)
+            self._evict(keep=key)
+            self._mark_dirty()
+
+    def remove(self, key):
+        """删除条目（不触发on_evict回调）"""
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                self._total_bytes -= entry.get("size", 0)
+                self._mark_dirty()
+            return entry
+
+    def _evict(self, keep=None):
+        if self._total_bytes <= self.max_bytes:
+            return
+        for key, entry in sorted(self._entries.items(), key=lambda item: item[1].get("last_access", 0)):
+            if self._total_bytes <= self.max_bytes:
+                break
+            if key == keep:
+                continue
+            del self._entries[key]
+            self._total_bytes -= entry.get("size", 0)
+            if self.on_evict:
+                self.on_evict(key, entry)
+
+    def _mark_dirty(self):
+        self._pending += 1
+        if self._pending >= self.flush_every:
+            self.flush()
+
+    def flush(self):
+        """将索引写回磁盘（先写临时文件再替换，避免中途崩溃损坏索引）"""
+        with self._lock:
+            if not self._pending:
+                return
+            ensure_dir(self.index_path)
+            tmp_path = f"{self.index_path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._entries, f, ensure_ascii=False)
+            os.replace(tmp_path, self.index_path)
+            self._pending = 0
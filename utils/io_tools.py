@@ -1,4 +1,6 @@
 # utils/io_tools.py
+import hashlib
+import json
 import os
 
 def ensure_dir(path):
@@ -30,4 +32,34 @@ def save_interim_data(data, path):
     # 假设data是DataFrame
     # data.to_csv(path, index=False)
     print(f"中间数据已保存到: {path}")
-    pass 
\ No newline at end of file
+    pass 
+
+def file_sha256(path, chunk_size=1024 * 1024):
+    """
+    分块计算文件的SHA-256
+    """
+    sha256 = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            sha256.update(chunk)
+    return sha256.hexdigest()
+
+def read_jsonl(path):
+    """
+    逐行读取JSONL文件，跳过无法解析的行（崩溃时可能留下不完整的最后一行）
+    文件不存在时不产生任何记录
+    """
+    if not os.path.exists(path):
+        return
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                yield json.loads(line)
+            except ValueError:
+                continue
+
+def append_jsonl(path, record):
+    """向JSONL文件追加一条记录"""
+    ensure_dir(path)
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write(json.dumps(record, ensure_ascii=False) + "\n")
@@ -0,0 +1,145 @@
+# utils/retry.py
+import json
+import os
+import random
+import threading
+import time
+from datetime import datetime
+import requests
+from utils.io_tools import ensure_dir
+from utils.log import log_info, log_error
+from config import (
+    UNIT_RETRY_ATTEMPTS,
+    UNIT_RETRY_BASE_DELAY,
+    UNIT_RETRY_MAX_DELAY,
+    DEAD_LETTER_PATH,
+)
+
+# 单元级重试不处理的异常：连接/读取错误已由urllib3重试，429/5xx已由Fetcher重试，
+# 此时抛出的请求异常说明下层重试已用尽，再整体重试只会成倍增加请求数
+NON_RETRYABLE_ERRORS = (requests.RequestException,)
+
+def retry_call(func, *args, attempts=None, base_delay=None, max_delay=None, description=None):
+    """
+    以指数退避重试执行func(*args)
+    第n次失败后等待 min(max_delay, base_delay * 2^(n-1)) 秒（带随机抖动），
+    全部尝试失败后抛出最后一次的异常；NON_RETRYABLE_ERRORS 中的异常直接抛出
+    """
+    attempts = attempts or UNIT_RETRY_ATTEMPTS
+    base_delay = UNIT_RETRY_BASE_DELAY if base_delay is None else base_delay
+    max_delay = UNIT_RETRY_MAX_DELAY if max_delay is None else max_delay
+    description = description or f"{func.__name__}{args}"
+
+    for attempt in range(1, attempts + 1):
+        try:
+            return func(*args)
+        except Exception as e:
+            if attempt >= attempts or isinstance(e, NON_RETRYABLE_ERRORS):
+                raise
+            delay = min(max_delay, base_delay * 2 ** (attempt - 1)) * random.uniform(0.5, 1.0)
+            log_info(f"{description} 第 {attempt} 次失败: {str(e)}，{delay:.1f} 秒后重试")
+            time.sleep(delay)
+
+class DeadLetterQueue:
+    """
+    死信队列（追加写入的JSONL文件）
+    记录重试后仍失败的爬取单元：类型 + 参数 + 错误信息，供之后重放
+    """
+
+    def __init__(self, path=None):
+        self.path = path or DEAD_LETTER_PATH
+        self._lock = threading.Lock()
+        self._keys = None  # 队列中单元的键，首次 resolve 时从文件加载
+
+    @staticmethod
+    def _key(kind, payload):
+        return kind, json.dumps(payload, sort_keys=True)
+
+    def push(self, kind, payload, error):
+        """记录一个失败单元"""
+        record = {
+            "kind": kind,
+            "payload": payload,
+            "error": str(error),
+            "failed_at": datetime.now().isoformat(timespec="seconds"),
+        }
+        with self._lock:
+            ensure_dir(self.path)
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            if self._keys is not None:
+                self._keys.add(self._key(kind, payload))
+        log_error(f"[死信队列] {kind} {payload} 重试后仍失败，已记录: {str(error)}")
+
+    def peek(self):
+        """读取全部失败单元（同一单元只保留最新一条）"""
+        if not os.path.exists(self.path):
+            return []
+        records = {}
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                records[self._key(record["kind"], record["payload"])] = record
+        return list(records.values())
+
+    def resolve(self, kind, payload):
+        """
+        单元已成功：删除队列中该单元的失败记录
+        避免之后重放时用过期结果覆盖正常运行已写入的数据
+        """
+        key = self._key(kind, payload)
+        with self._lock:
+            if self._keys is None:
+                self._keys = {self._key(record["kind"], record["payload"]) for record in self.peek()}
+            if key not in self._keys:
+                return
+            records = [record for record in self.peek() if self._key(record["kind"], record["payload"]) != key]
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                for record in records:
+                    f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            os.replace(tmp_path, self.path)
+            self._keys.discard(key)
+        log_info(f"[死信队列] {kind} {payload} 已成功，移除失败记录")
+
+    def drain(self):
+        """取出全部失败单元并清空队列"""
+        with self._lock:
+            records = self.peek()
+            if os.path.exists(self.path):
+                os.remove(self.path)
+            self._keys = set()
+        return records
+
+    def replay(self, handlers):
+        """
+        重放死信队列：handlers 为 {kind: func(payload)}
+        重放仍失败的单元重新入队，返回 (成功数, 失败数)
+        """
+        records = self.drain()
+        log_info(f"[死信队列] 开始重放 {len(records)} 个失败单元")
+        succeeded = failed = 0
+        for record in records:
+            handler = handlers.get(record["kind"])
+            if handler is None:
+                log_error(f"[死信队列] 未知的单元类型: {record['kind']}")
+                self.push(record["kind"], record["payload"], record["error"])
+                failed += 1
+                continue
+            try:
+                retry_call(handler, record["payload"], description=f"重放 {record['kind']} {record['payload']}")
+                succeeded += 1
+            except Exception as e:
+                self.push(record["kind"], record["payload"], e)
+                failed += 1
+        log_info(f"[死信队列] 重放完成: 成功 {succeeded} 个，失败 {failed} 个")
+        return succeeded, failed
+
+_dead_letters = DeadLetterQueue()
+
+def get_dead_letter_queue():
+    """获取全局死信队列"""
+    return _dead_letters
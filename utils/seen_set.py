@@ -0,0 +1,59 @@
+# utils/seen_set.py
+import hashlib
+import os
+import threading
+from utils.io_tools import ensure_dir
+
+DIGEST_SIZE = 8  # 每个键只保存8字节摘要（数千至数百万URL下冲突概率可忽略）
+
+class SeenSet:
+    """
+    持久化的已处理键集合（如已抓取的URL）
+    磁盘上是追加写入的定长二进制摘要文件，内存中只保存整数摘要，
+    不保存原始字符串；重复运行时加载文件即可恢复
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._digests = self._load()
+
+    def _load(self):
+        digests = set()
+        if not os.path.exists(self.path):
+            return digests
+        with open(self.path, 'rb') as f:
+            data = f.read()
+        usable = len(data) - len(data) % DIGEST_SIZE  # 崩溃时可能留下不完整的最后一条
+        for offset in range(0, usable, DIGEST_SIZE):
+            digests.add(int.from_bytes(data[offset:offset + DIGEST_SIZE], "big"))
+        return digests
+
+    @staticmethod
+    def _digest(key):
+        return hashlib.blake2b(key.encode("utf-8"), digest_size=DIGEST_SIZE).digest()
+
+    def __contains__(self, key):
+        return int.from_bytes(self._digest(key), "big") in self._digests
+
+    def __len__(self):
+        return len(self._digests)
+
+    def add(self, key):
+        """加入键并立即落盘，键已存在时返回False"""
+        digest = self._digest(key)
+        value = int.from_bytes(digest, "big")
+        with self._lock:
+            if value in self._digests:
+                return False
+            ensure_dir(self.path)
+            with open(self.path, 'ab') as f:
+                f.write(digest)
+            self._digests.add(value)
+            return True
+
+    def clear(self):
+        with self._lock:
+            self._digests = set()
+            if os.path.exists(self.path):
+                os.remove(self.path)